@@ -0,0 +1,75 @@
+import pytest
+from befunge import analysis, befunge_grid
+from befunge.streams import BufferSink
+
+STORE = ["567+5*21p21g.@", "              "]
+
+
+def analyze(source, legacy_put=True, eof="push"):
+    grid = befunge_grid.BefungeGrid(legacy_put=legacy_put, eof=eof)
+    grid.set_grid("s", source)
+    return analysis.analyze(grid)
+
+
+def test_program_without_put_is_static():
+    result = analyze(['"!olleH">:#,_@', "    @         "])
+    assert not result.put_reachable
+    assert result.is_static
+    assert (1, 4) not in result.cells
+
+
+@pytest.mark.parametrize("source,writable,static", [
+    (STORE, {(0, 0), (0, 1)}, False),
+    (["0v", "@p"], None, False),
+    (["?@", "@@"], set(), True)])
+def test_legacy_put_targets(source, writable, static):
+    result = analyze(source)
+    assert result.writable == writable
+    assert result.is_static == static
+
+
+def test_put_into_data_cells_is_static():
+    result = analyze(STORE, legacy_put=False)
+    assert result.put_reachable
+    assert result.writable == {(1, 2)}
+    assert result.is_static
+
+
+def test_reflecting_input_reaches_both_ways():
+    result = analyze(["~@"], eof="reflect")
+    assert (0, 1, "<", False) in result.states
+
+
+def test_block_engine_skips_write_checks_for_static_program():
+    grid = befunge_grid.BefungeGrid(legacy_put=False, output=BufferSink())
+    grid.set_grid("s", STORE)
+    grid.run(engine="block")
+    assert grid.block_cache.static
+    assert not grid.write_hooks
+    assert grid.output.getvalue() == "65 "
+    assert analysis.for_grid(grid) is analysis.for_grid(grid)
+
+
+@pytest.mark.parametrize("source,legacy_put,stack_mode", [
+    (["p668223", "^:@@7::", "7 1_<\\:"], True, "list"),
+    (["p2>g 05", "$_9$/|:"], False, "int64")])
+def test_put_of_entry_state_can_write_anywhere(source, legacy_put,
+                                               stack_mode):
+    assert analyze(source, legacy_put).writable is None
+    results = []
+    for engine in ("classic", "block"):
+        grid = befunge_grid.BefungeGrid(legacy_put=legacy_put,
+                                        output=BufferSink(),
+                                        stack_mode=stack_mode)
+        grid.set_grid("s", source)
+        grid.run(engine=engine, max_steps=3000)
+        results.append((grid.output.getvalue(), list(grid.stack),
+                        list(grid.grid), grid.steps))
+    assert results[0] == results[1]
+
+
+def test_put_targets_of_every_path():
+    result = analyze(["?  v ", "   3 ", "   1 ", ">21p@", "   @ "],
+                     legacy_put=False)
+    assert result.writable == {(1, 2), (1, 3)}
+    assert not result.is_static
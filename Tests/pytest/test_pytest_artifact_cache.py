@@ -0,0 +1,71 @@
+import os
+from befunge import artifact_cache, batch, befunge_grid
+from befunge.streams import BufferSink
+
+HELLO = ['"!olleH">:#,_@']
+SELF_MODIFYING = ["v          <", '>5. "@"42p ^']
+
+
+def load(cache, source):
+    grid = befunge_grid.BefungeGrid(output=BufferSink())
+    warm = cache.load(grid, "s", source)
+    return grid, warm
+
+
+def test_warm_load_skips_preprocessing(tmp_path):
+    cache = artifact_cache.ArtifactCache(tmp_path)
+    grid, warm = load(cache, HELLO)
+    assert not warm
+    assert grid.run(engine="block")
+    cache.store(grid)
+    grid, warm = load(cache, HELLO)
+    assert warm
+    assert grid.grid == HELLO
+    assert grid.analysis[1].is_static
+    assert grid.block_cache.preloaded
+    assert grid.run(engine="block")
+    assert grid.output.getvalue() == "Hello!"
+
+
+def test_preloaded_blocks_of_self_modifying_program(tmp_path):
+    cache = artifact_cache.ArtifactCache(tmp_path)
+    for _ in range(2):
+        grid, _ = load(cache, SELF_MODIFYING)
+        grid.run(engine="block")
+        cache.store(grid)
+        assert grid.output.getvalue() == "5 5 "
+
+
+def test_key_depends_on_options(tmp_path):
+    cache = artifact_cache.ArtifactCache(tmp_path)
+    load(cache, HELLO)
+    grid = befunge_grid.BefungeGrid(legacy_put=False, output=BufferSink())
+    assert not cache.load(grid, "s", HELLO)
+    assert len(list(tmp_path.glob("*.bfc"))) == 2
+
+
+def test_torn_artifact_is_ignored(tmp_path):
+    cache = artifact_cache.ArtifactCache(tmp_path)
+    grid, _ = load(cache, HELLO)
+    cache.path(grid.artifact[1]).write_bytes(b"\x80garbage")
+    grid, warm = load(cache, HELLO)
+    assert not warm
+    assert grid.run()
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    cache = artifact_cache.ArtifactCache(tmp_path, max_entries=2)
+    first, _ = load(cache, ["1@"])
+    os.utime(cache.path(first.artifact[1]), (0, 0))
+    load(cache, ["2@"])
+    load(cache, ["3@"])
+    assert not cache.path(first.artifact[1]).exists()
+    assert len(list(tmp_path.glob("*.bfc"))) == 2
+
+
+def test_batch_uses_cache(tmp_path):
+    job = batch.Job("hello", HELLO)
+    for _ in range(2):
+        result = batch.run_job(job, cache_dir=tmp_path)
+        assert (result.reason, result.output) == ("halted", "Hello!")
+    assert len(list(tmp_path.glob("*.bfc"))) == 1
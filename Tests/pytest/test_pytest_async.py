@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from befunge import befunge_grid, exceptions, streams
+from befunge.interactive_befunge_grid import IABefungeGrid
+
+ADDER = ["&&+.@"]
+ECHO = ["~:1+!#@_,"]
+COUNTDOWN = ['"d">1\\-:v ', "   ^    _@"]
+
+
+def make_grid(source, reader, target, engine_grid=befunge_grid.BefungeGrid):
+    grid = engine_grid(output=streams.AsyncSink(target),
+                       input_source=streams.AsyncSource(reader))
+    grid.set_grid("s", source)
+    return grid
+
+
+def test_run_async_awaits_queue_input():
+    async def session():
+        reader = asyncio.Queue()
+        writer = asyncio.Queue()
+        grid = make_grid(ADDER, reader, writer)
+        task = asyncio.ensure_future(grid.run_async())
+        await asyncio.sleep(0)
+        assert not task.done()
+        await reader.put("1")
+        await reader.put("2\n3\n")
+        assert await task
+        return await writer.get()
+
+    assert asyncio.run(session()) == "15 "
+
+
+def test_run_async_stream_reader_and_writer_callback():
+    async def session():
+        reader = asyncio.StreamReader()
+        reader.feed_data("héllo".encode("utf-8")[:2])
+        output = []
+        grid = make_grid(ECHO, reader, output.append)
+        task = asyncio.ensure_future(grid.run_async(engine="table"))
+        await asyncio.sleep(0)
+        reader.feed_data("héllo".encode("utf-8")[2:])
+        reader.feed_eof()
+        await task
+        return "".join(output)
+
+    assert asyncio.run(session()) == "héllo"
+
+
+def test_many_sessions_share_event_loop():
+    async def session():
+        grid = make_grid(COUNTDOWN, asyncio.Queue(), [].append)
+        await grid.run_async(engine="table", yield_every=100)
+        return grid.steps
+
+    async def sessions():
+        return await asyncio.gather(*(session()
+                                      for number in range(100)))
+
+    reference = befunge_grid.BefungeGrid()
+    reference.set_grid("s", COUNTDOWN)
+    reference.run()
+    assert set(asyncio.run(sessions())) == {reference.steps}
+
+
+def test_run_async_max_steps_pauses():
+    async def session():
+        grid = make_grid(["1:+v", "^  <"], asyncio.Queue(), [].append)
+        assert not await grid.run_async(max_steps=5, yield_every=2)
+        assert grid.steps == 5 and grid.paused
+        return await grid.run_async(max_steps=3)
+
+    assert not asyncio.run(session())
+
+
+def test_ia_grid_run_async(monkeypatch):
+    rows = iter(["&.@", ""])
+    monkeypatch.setattr("builtins.input", lambda: next(rows))
+
+    async def session():
+        reader = asyncio.Queue()
+        output = []
+        grid = IABefungeGrid(output=streams.AsyncSink(output.append),
+                             input_source=streams.AsyncSource(reader))
+        task = asyncio.ensure_future(grid.run_async())
+        await asyncio.sleep(0)
+        await reader.put("42\n")
+        await task
+        return "".join(output)
+
+    assert asyncio.run(session()) == "42 "
+
+
+def test_async_source_read_int_is_atomic():
+    source = streams.AsyncSource()
+    source.feed("-1")
+    with pytest.raises(exceptions.InputIsNotReadyError):
+        source.read_int()
+    source.feed("2 7")
+    assert source.read_int() == -12
+    with pytest.raises(exceptions.InputIsNotReadyError):
+        source.read_int()
+    source.close()
+    assert (source.read_int(), source.read_int()) == (7, None)
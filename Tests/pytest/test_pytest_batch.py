@@ -0,0 +1,89 @@
+import json
+import os
+import time
+import pytest
+from befunge import batch, befunge_grid
+
+
+@pytest.mark.parametrize("engine", ["classic", "table", "block"])
+def test_run_in_slices_is_same_as_full_run(engine):
+    full = befunge_grid.BefungeGrid()
+    full.set_grid("s", ['"(":*>1\\-:#v_@', "     ^     <  "])
+    assert full.run(engine=engine)
+    sliced = befunge_grid.BefungeGrid()
+    sliced.set_grid("s", ['"(":*>1\\-:#v_@', "     ^     <  "])
+    while not sliced.run(engine=engine, max_steps=1000):
+        assert sliced.steps % 1000 == 0
+    assert (sliced.stack, sliced.steps) == (full.stack, full.steps)
+
+
+@pytest.mark.parametrize("program,reason",
+                         [(["1.2.@"], "halted"),
+                          (["1Z"], "invalid_operand"),
+                          ([">v", "^<"], "step_limit"),
+                          (["|"], "error")])
+def test_run_job_reasons(program, reason):
+    result = batch.run_job(batch.Job("job", program), max_steps=5000)
+    assert result.reason == reason
+    assert result.steps <= 5000
+
+
+def test_run_job_timeout():
+    result = batch.run_job(batch.Job("job", [">v", "^<"]), timeout=0.05)
+    assert result.reason == "timeout"
+
+
+def test_run_job_with_input():
+    result = batch.run_job(batch.Job("cat", "Scripts/cat.txt", b"hi\n"))
+    assert result.to_dict()["output"] == "hi\n"
+
+
+def test_run_batch_from_manifest(tmp_path):
+    (tmp_path / "echo.bf").write_text("&.@")
+    (tmp_path / "jobs.json").write_text(json.dumps(
+        [{"name": "one", "program": "echo.bf", "input": "1"},
+         {"name": "two", "program": "echo.bf", "input": "2"}]))
+    jobs = batch.load_jobs(tmp_path / "jobs.json")
+    results = {result.name: result.output
+               for result in batch.run_batch(jobs, workers=2)}
+    assert results == {"one": "1 ", "two": "2 "}
+
+
+def test_load_jobs_from_directory(tmp_path):
+    (tmp_path / "a.bf").write_text("~,@")
+    (tmp_path / "a.in").write_text("x")
+    (tmp_path / "notes.md").write_text("not a program")
+    jobs = batch.load_jobs(tmp_path)
+    assert [(job.name, job.input_data) for job in jobs] == [("a.bf", b"x")]
+
+
+original_run_job = batch.run_job
+
+
+def misbehaving_run_job(job, *args):
+    if job.name == "crash":
+        os._exit(1)
+    if job.name == "hang":
+        time.sleep(30)
+    return original_run_job(job, *args)
+
+
+def test_run_batch_recovers_from_crashed_worker(monkeypatch):
+    monkeypatch.setattr(batch, "run_job", misbehaving_run_job)
+    jobs = [batch.Job("crash", ["@"]), batch.Job("ok", ["1.@"])]
+    results = {result.name: result
+               for result in batch.run_batch(jobs, workers=2)}
+    assert results["crash"].reason == "error"
+    assert results["ok"].output == "1 "
+
+
+def test_run_batch_hard_timeout(monkeypatch):
+    monkeypatch.setattr(batch, "run_job", misbehaving_run_job)
+    monkeypatch.setattr(batch, "HARD_TIMEOUT_GRACE", 0.2)
+    jobs = [batch.Job("hang", ["@"]), batch.Job("ok", ["1.@"])]
+    start = time.monotonic()
+    results = {result.name: result
+               for result in batch.run_batch(jobs, workers=1, timeout=0.1)}
+    assert time.monotonic() - start < 10
+    assert results["hang"].reason == "timeout"
+    assert results["ok"].reason == "halted"
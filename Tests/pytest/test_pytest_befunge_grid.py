@@ -183,3 +183,17 @@ def test_random_moving():
     grid.set_grid("s", string_list)
     grid.run()
     assert (grid.x == 0 and grid.y == 1) or (grid.x == 1 and grid.y == 0)
+
+
+def test_next_cell_tables_wrap():
+    right, down, left, up = befunge_grid.next_cell_tables(2, 3)
+    assert (right[2], down[4], left[3], up[1]) == \
+        ((0, 0), (0, 1), (1, 2), (1, 1))
+
+
+def test_move_direction_property():
+    grid = befunge_grid.BefungeGrid()
+    grid.move_direction = "^"
+    assert grid.direction == befunge_grid.UP
+    grid.direction = befunge_grid.LEFT
+    assert grid.move_direction == "<"
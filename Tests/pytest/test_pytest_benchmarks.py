@@ -0,0 +1,34 @@
+import pytest
+from benchmarks import compare, corpus, runner, startup
+
+
+def report(ips):
+    return {"results": [{"workload": "loop", "engine": "table",
+                         "instructions_per_second": ips}]}
+
+
+@pytest.mark.parametrize("current,regressed", [(95, False), (80, True)])
+def test_compare_flags_regression(current, regressed):
+    rows, regressions = compare.compare(report(100), report(current), 0.1)
+    assert len(rows) == 1
+    assert bool(regressions) == regressed
+
+
+@pytest.mark.parametrize("workload", corpus.WORKLOADS,
+                         ids=lambda workload: workload.name)
+def test_workload_engines_execute_same_steps(workload):
+    steps = {runner.run_workload(workload, engine, 2000).steps
+             for engine in runner.ENGINES}
+    assert steps == {2000}
+
+
+def test_run_suite_report():
+    suite = runner.run_suite(["table"], 500, 1, corpus.WORKLOADS[:1])
+    result = suite["results"][0]
+    assert result["steps"] == 500
+    assert result["instructions_per_second"] > 0
+    assert result["peak_memory"] > 0
+
+
+def test_plain_run_has_no_heavy_imports():
+    assert startup.heavy_imports() == []
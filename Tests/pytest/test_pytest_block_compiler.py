@@ -0,0 +1,72 @@
+import pytest
+from befunge import befunge_grid, block_compiler
+from befunge.streams import BufferSink
+
+PROGRAMS = [["123@"],
+            ['"qwerty"@'],
+            ["23-26/49%1!0!12`21`@"],
+            ["+-*/%!`:\\$1:2\\1$@"],
+            ["#@v", "  @"],
+            ["1|", " @", " @"],
+            ["0v ", "@_@"],
+            ["67+5*11p@"],
+            ["21g@", "  A "],
+            ['"!olleH">:#,_@'],
+            ["v          <", '>5. "@"42p ^']]
+
+
+def run_engine(string_list, engine, capfd):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", list(string_list))
+    grid.run(engine=engine)
+    out, err = capfd.readouterr()
+    return grid.stack, grid.grid, grid.y, grid.x, out
+
+
+@pytest.mark.parametrize("test_input", PROGRAMS)
+def test_block_engine_is_same_as_classic(test_input, capfd):
+    assert run_engine(test_input, "block", capfd) == \
+        run_engine(test_input, "classic", capfd)
+
+
+def test_self_modifying_block(capfd):
+    result = run_engine(["v          <", '>5. "@"42p ^'], "block", capfd)
+    assert result[4] == "5 5 "
+
+
+def error_state(string_list, engine):
+    grid = befunge_grid.BefungeGrid(output=BufferSink())
+    grid.set_grid("s", list(string_list))
+    with pytest.raises(IndexError):
+        grid.run(engine=engine)
+    return grid.y, grid.x, grid.direction, grid.string_mode, grid.steps
+
+
+@pytest.mark.parametrize("test_input", [
+    ["$."], ["<<*60v,"], ["9 .<^/5", "6_p>#$7", "|>6$p5#"]])
+def test_error_in_block_leaves_classic_state(test_input):
+    assert error_state(test_input, "block") == \
+        error_state(test_input, "classic")
+
+
+def test_discover_ends_before_branch():
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ['1"ab"v', "@    _"])
+    block = block_compiler.discover(grid, 0, 0, ">", False)
+    assert [op[1] for op in block.ops] == [1, 97, 98]
+    assert block.end == (1, 5, "v", False)
+
+
+def test_discover_terminator_has_no_block():
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["?@"])
+    assert block_compiler.discover(grid, 0, 0, ">", False) is None
+
+
+def test_invalidate_block():
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["12+@"])
+    cache = block_compiler.BlockCache(grid)
+    assert cache.lookup((0, 0, ">", False)) is not None
+    cache.invalidate(0, 1)
+    assert (0, 0, ">", False) not in cache.blocks
@@ -0,0 +1,70 @@
+import pytest
+from befunge import befunge_grid, exceptions
+
+PROGRAMS = [["123@"],
+            ['"qwerty"@'],
+            ["23-26/49%1!0!12`21`@"],
+            ["+-*/%!`:\\$1:2\\1$@"],
+            ["03/00%@"],
+            ["#@v", "  @"],
+            ["1|", " @", " @"],
+            ["0v ", "@_@"],
+            ["67+5*11p@"],
+            ["21g@", "  A "],
+            ["p@"],
+            ['"!olleH">:#,_@'],
+            ["91+9*.@"]]
+
+
+def run_engine(string_list, engine, capfd):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", list(string_list))
+    grid.run(engine=engine)
+    out, err = capfd.readouterr()
+    return grid.stack, grid.grid, grid.y, grid.x, out
+
+
+@pytest.mark.parametrize("test_input", PROGRAMS)
+def test_table_engine_is_same_as_classic(test_input, capfd):
+    assert run_engine(test_input, "table", capfd) == \
+        run_engine(test_input, "classic", capfd)
+
+
+def test_table_engine_invalid_operand(capfd):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["1Z"])
+    grid.run(engine="table")
+    out, err = capfd.readouterr()
+    assert out == "Invalid operand [ Z ] at 1 row, 2 column\n"
+
+
+def test_table_engine_debug_mode(capfd):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["@"])
+    grid.run(True, engine="table")
+    out, err = capfd.readouterr()
+    assert out == "evaluate command [ @ ]"\
+                  " at Y: 1 X: 1, string mode: False, stack: [  ]\n"
+
+
+def test_table_engine_not_enough_elements_in_stack_error():
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["|"])
+    with pytest.raises(exceptions.NotEnoughElementsInStackError):
+        grid.run(engine="table")
+
+
+def test_unknown_engine_error():
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["@"])
+    with pytest.raises(exceptions.UnknownEngineError):
+        grid.run(engine="nonexistent")
+
+
+def test_table_engine_pauses_in_string_mode(capfd):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ['"ab",,@'])
+    assert not grid.run(engine="table", max_steps=2)
+    assert grid.string_mode and grid.steps == 2
+    assert grid.run(engine="table")
+    assert capfd.readouterr()[0] == "ba"
@@ -0,0 +1,70 @@
+import pytest
+from befunge import befunge_grid, exceptions, funge_space
+from befunge.streams import BufferSink
+
+PROGRAMS = [['v', '>"A"99*0p v', "", "  @       <" + " " * 150 + "#"],
+            ["<  @"],
+            ['"A"050-p@'],
+            ["v", "", "", "@"],
+            ['"!olleH">:#,_@']]
+
+
+def run_space(source, engine):
+    grid = befunge_grid.BefungeGrid(output=BufferSink(), legacy_put=False,
+                                    funge98=True)
+    grid.set_grid("s", source)
+    assert grid.run(engine=engine, max_steps=1000)
+    return grid
+
+
+@pytest.mark.parametrize("test_input", PROGRAMS)
+def test_space_table_engine_is_same_as_classic(test_input):
+    table = run_space(test_input, "table")
+    classic = run_space(test_input, "classic")
+    assert (table.stack, table.y, table.x, table.steps,
+            table.output.getvalue()) == \
+        (classic.stack, classic.y, classic.x, classic.steps,
+         classic.output.getvalue())
+    assert table.grid == classic.grid
+
+
+def test_large_ragged_code():
+    grid = run_space(PROGRAMS[0], "table")
+    assert (grid.code_height, grid.code_width) == (4, 162)
+    assert grid.grid.char(0, 81) == "A"
+    assert (grid.y, grid.x) == (3, 2)
+
+
+def test_put_outside_of_code_grows_box():
+    grid = run_space(PROGRAMS[2], "classic")
+    assert (grid.grid.min_y, grid.code_height) == (-5, 6)
+    assert grid.grid.char(-5, 0) == "A"
+    assert grid.grid[-5] == "A        "
+
+
+def test_pages_are_allocated_lazily():
+    space = funge_space.FungeSpace(["@"])
+    space.put(10 ** 6, -10 ** 6, ord(" "))
+    assert len(space.pages) == 1
+    assert space.cell(5000, 5000) == ord(" ")
+    space.put(10 ** 6, -10 ** 6, ord("x"))
+    assert len(space.pages) == 2
+    assert space.get(10 ** 6, -10 ** 6) == ord("x")
+    assert space.height == 10 ** 6 + 1
+
+
+def test_default_mode_keeps_bounds():
+    grid = befunge_grid.BefungeGrid()
+    with pytest.raises(exceptions.CodeFileIsOutOfBoundsError):
+        grid.set_grid("s", ["@" * 100])
+
+
+def test_space_rejects_playfield_tools():
+    grid = befunge_grid.BefungeGrid(funge98=True)
+    grid.set_grid("s", ["@"])
+    with pytest.raises(exceptions.FungeSpaceIsNotSupportedError):
+        grid.run(profile=True)
+    with pytest.raises(exceptions.FungeSpaceIsNotSupportedError):
+        grid.run(detect_loops=True)
+    with pytest.raises(exceptions.FungeSpaceIsNotSupportedError):
+        grid.run(trace=True)
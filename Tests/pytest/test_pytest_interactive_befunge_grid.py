@@ -1,6 +1,8 @@
+import asyncio
 import pytest
 from io import StringIO
-from befunge import interactive_befunge_grid
+from befunge import befunge_grid, interactive_befunge_grid
+from befunge.exceptions import CodeFileIsNotRectangleError
 
 
 def test_grid_from_user_input_one_row(monkeypatch):
@@ -15,3 +17,65 @@ def test_grid_many_rows(monkeypatch):
     monkeypatch.setattr('sys.stdin', StringIO("123v\n @4<\n"))
     grid.run()
     assert grid.stack == [1, 2, 3, 4]
+
+
+def test_resume_paused_run(monkeypatch):
+    grid = interactive_befunge_grid.IABefungeGrid()
+    monkeypatch.setattr('sys.stdin', StringIO("v@\n>^\n\n"))
+    assert not grid.run(max_steps=3)
+    assert grid.run()
+    assert (grid.y, grid.x) == (0, 1)
+
+
+class CountingRows:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.reads = 0
+
+    def read_row(self):
+        self.reads += 1
+        return self.rows.pop(0) if self.rows else ""
+
+
+def test_rows_from_iterator():
+    grid = interactive_befunge_grid.IABefungeGrid(
+        rows=iter([b"123v\n", b" @4<\n"]))
+    assert grid.run()
+    assert grid.stack == [1, 2, 3, 4]
+
+
+def test_received_row_is_not_read_again():
+    rows = CountingRows(["v@", ">^", "  "])
+    grid = interactive_befunge_grid.IABefungeGrid(rows=rows)
+    assert grid.run()
+    assert rows.reads == 2
+    assert not grid.grid_complete
+
+
+def test_row_width_is_validated():
+    grid = interactive_befunge_grid.IABefungeGrid(rows=["12v", "1234"])
+    with pytest.raises(CodeFileIsNotRectangleError):
+        grid.run()
+
+
+def test_async_stream_rows():
+    async def session():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"12v\n")
+        grid = interactive_befunge_grid.IABefungeGrid(rows=reader)
+        task = asyncio.ensure_future(grid.run_async(yield_every=1))
+        await asyncio.sleep(0.01)
+        assert not task.done()
+        reader.feed_data(b"@3<\n")
+        reader.feed_eof()
+        return await task, grid.stack
+
+    assert asyncio.run(session()) == (True, [1, 2, 3])
+
+
+def test_next_cells_grow_with_rows():
+    grid = interactive_befunge_grid.IABefungeGrid(rows=["abc"] * 4)
+    for height in range(1, 5):
+        grid.make_grid()
+        assert [tuple(table) for table in grid.next_cells] == \
+            list(befunge_grid.next_cell_tables(height, 3))
@@ -21,7 +21,7 @@ def test_grid_is_not_rectangle_error(monkeypatch):
 def test_complete_grid_alteration_run_error(monkeypatch):
     with pytest.raises(interactive_exceptions.CompleteIAGridAlterationError):
         grid = interactive_befunge_grid.IABefungeGrid()
-        monkeypatch.setattr('sys.stdin', StringIO(">>v@\n<<<^\n\n"))
+        monkeypatch.setattr('sys.stdin', StringIO("^\n@\n\n"))
         grid.run()
         monkeypatch.setattr('sys.stdin', StringIO("123@\n"))
         grid.run()
@@ -30,7 +30,7 @@ def test_complete_grid_alteration_run_error(monkeypatch):
 def test_complete_grid_alteration_make_error(monkeypatch):
     with pytest.raises(interactive_exceptions.CompleteIAGridAlterationError):
         grid = interactive_befunge_grid.IABefungeGrid()
-        monkeypatch.setattr('sys.stdin', StringIO(">>v@\n<<<^\n\n"))
+        monkeypatch.setattr('sys.stdin', StringIO("^\n@\n\n"))
         grid.run()
         monkeypatch.setattr('sys.stdin', StringIO("123@\n"))
         grid.make_grid()
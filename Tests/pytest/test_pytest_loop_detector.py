@@ -0,0 +1,71 @@
+import pytest
+from befunge import batch, befunge_grid, exceptions, loop_detector
+
+COUNTDOWN = ['"(":*>1\\-:#v_@', "     ^     <  "]
+
+
+def test_detect_infinite_loop():
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", [">v", "^<"])
+    with pytest.raises(exceptions.InfiniteLoopError) as error:
+        grid.run(detect_loops=True)
+    assert error.value.cycle_length == 4
+    assert (error.value.y, error.value.x) == (0, 1)
+
+
+def test_detect_loop_in_resumed_run():
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["1v   ", " >$1v", "    <"])
+    assert not grid.run(max_steps=3, detect_loops=True)
+    with pytest.raises(exceptions.InfiniteLoopError):
+        grid.run(detect_loops=True)
+
+
+def test_stopping_program_is_not_detected():
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", COUNTDOWN)
+    assert grid.run(detect_loops=True)
+    reference = befunge_grid.BefungeGrid()
+    reference.set_grid("s", COUNTDOWN)
+    reference.run()
+    assert (grid.stack, grid.steps) == (reference.stack, reference.steps)
+
+
+def test_output_resets_detector(capfd):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", [">0,v", "^  <"])
+    assert not grid.run(max_steps=100, detect_loops=True)
+
+
+def test_bounded_cache():
+    detector = loop_detector.LoopDetector(cache_size=2)
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", [">1v", "^ <"])
+    assert not grid.run(max_steps=100, detect_loops=detector)
+    assert len(detector.states) <= 2
+
+
+def test_deep_stack_is_not_copied():
+    detector = loop_detector.LoopDetector()
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["1"])
+    assert not grid.run(max_steps=2000, detect_loops=detector)
+    assert detector.candidate is None
+    assert all(isinstance(key, int) for key in detector.states)
+
+
+def test_same_fingerprint_is_confirmed(monkeypatch):
+    monkeypatch.setattr(loop_detector, "FINGERPRINT_DEPTH", 0)
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", COUNTDOWN)
+    assert grid.run(detect_loops=True)
+    with pytest.raises(exceptions.InfiniteLoopError) as error:
+        grid.set_grid("s", ["1>$v", " ^ <"])
+        grid.run(detect_loops=True)
+    assert error.value.cycle_length == 6
+
+
+def test_batch_reports_infinite_loop():
+    result = batch.run_job(batch.Job("loop", ["1>$v", " ^ <"]),
+                           detect_loops=True)
+    assert result.reason == "infinite_loop"
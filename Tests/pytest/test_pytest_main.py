@@ -0,0 +1,41 @@
+import pytest
+from io import StringIO
+import befunge
+from befunge import exceptions
+from befunge.__main__ import main, parse_args
+
+HELLO = "Scripts/hello_world.txt"
+
+
+def test_run_file(capsys):
+    assert main([HELLO]) == 0
+    assert capsys.readouterr().out == "Hello World!"
+
+
+def test_run_stdin(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", StringIO('"!ih",,,@\n'))
+    assert main(["-", "--engine", "block", "--seed", "1"]) == 0
+    assert capsys.readouterr().out == "hi!"
+
+
+def test_limit_is_reported(capsys):
+    assert main(["Scripts/loop.txt", "--max-steps", "100"]) == 1
+    assert "StepQuotaExceededError" in capsys.readouterr().err
+
+
+def test_profile_heat_map(capsys):
+    assert main([HELLO, "--profile"]) == 0
+    assert "@" in capsys.readouterr().err
+
+
+def test_single_file_options():
+    options = parse_args([HELLO])
+    assert (options.source, options.engine, options.max_steps) == \
+        (HELLO, "classic", None)
+    assert parse_args(["--stack-mode", "int32"]).source == "-"
+
+
+def test_lazy_package_exceptions():
+    assert befunge.QuotaExceededError is exceptions.QuotaExceededError
+    with pytest.raises(AttributeError):
+        befunge.NoSuchError
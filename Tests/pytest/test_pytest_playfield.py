@@ -0,0 +1,52 @@
+import pytest
+from befunge import befunge_grid, playfield
+
+
+def test_playfield_rows():
+    field = playfield.Playfield(["ab", "cd"])
+    assert field == ["ab", "cd"]
+    assert field[1] == "cd"
+    assert field[-1] == "cd"
+    assert len(field) == 2
+
+
+def test_playfield_put_and_get():
+    field = playfield.Playfield(["ab", "cd"])
+    assert field.put(1, 0, 65) == 2
+    assert field.get(1, 0) == 65
+    assert field.get(-1, -1) == ord("d")
+    assert field[1] == "Ad"
+
+
+@pytest.mark.parametrize("y,x", [(2, 0), (0, 2), (-3, 0)])
+def test_playfield_index_out_of_range(y, x):
+    field = playfield.Playfield(["ab", "cd"])
+    with pytest.raises(IndexError):
+        field.get(y, x)
+
+
+def test_playfield_put_invalid_value():
+    field = playfield.Playfield(["ab"])
+    with pytest.raises(ValueError):
+        field.put(0, 0, -1)
+
+
+def test_put_command_zero_based():
+    grid = befunge_grid.BefungeGrid(legacy_put=False)
+    grid.set_grid("s", ["67+5*10p@"])
+    grid.run()
+    assert grid.grid[0][1] == "A"
+
+
+def test_put_and_get_command_zero_based():
+    grid = befunge_grid.BefungeGrid(legacy_put=False)
+    grid.set_grid("s", ["67+5*31p31g@", "            "])
+    grid.run()
+    assert grid.stack == [65]
+
+
+def test_put_command_zero_based_out_of_bounds():
+    grid = befunge_grid.BefungeGrid(legacy_put=False)
+    grid.set_grid("s", ["199p@"])
+    grid.run()
+    assert grid.grid == ["199p@"]
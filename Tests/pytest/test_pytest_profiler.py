@@ -0,0 +1,57 @@
+import json
+from io import StringIO
+import pytest
+from befunge import befunge_grid, interactive_befunge_grid, profiler
+
+
+def test_profile_counters():
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ['"ab"v', "@   >"])
+    assert grid.run(profile=True)
+    profile = grid.profile
+    assert profile.steps == grid.steps == 6
+    assert profile.string_pushes == 2
+    assert profile.opcodes[ord('"')] == 2
+    assert profile.direction_changes == 2
+    assert profile.wraps == 1
+    assert profile.cell_count(0, 1) == 1
+    assert profile.cell_count(1, 0) == 1
+
+
+def test_profile_accumulates_over_runs():
+    profile = profiler.Profile()
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", [">v", "^<"])
+    grid.run(max_steps=10, profile=profile)
+    grid.run(max_steps=10, profile=profile)
+    assert profile.steps == 20
+    assert profile.hot_cells(1) == [(5, 0, 0)]
+
+
+def test_profile_json_and_heat_map():
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["1:v", "@_<"])
+    grid.run(profile=True)
+    data = json.loads(grid.profile.to_json())
+    assert data["opcodes"]["_"] == 1
+    assert grid.profile.heat_map() == "1:v | @@@\n@_< | @@@"
+
+
+def test_profile_of_wide_interactive_grid(monkeypatch):
+    row = ">" * 90 + "v"
+    monkeypatch.setattr("sys.stdin", StringIO(f"{row}\n{'@' * 91}\n\n"))
+    grid = interactive_befunge_grid.IABefungeGrid()
+    assert grid.run(profile=True)
+    assert grid.profile.cell_count(0, 90) == 1
+    assert grid.profile.cell_count(1, 90) == 1
+    assert grid.profile.hot_cells(1) == [(1, 0, 0)]
+
+
+def test_profile_rejects_grid_of_other_width():
+    profile = profiler.Profile()
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["@"])
+    grid.run(profile=profile)
+    grid.set_grid("s", ["@ "])
+    with pytest.raises(ValueError):
+        grid.run(profile=profile)
@@ -0,0 +1,82 @@
+import time
+import pytest
+from befunge import befunge_grid, streams
+from befunge.exceptions import *
+from befunge.quotas import Quotas
+
+COUNTDOWN = ['"d">1\\-:v ', "   ^    _@"]
+DOUBLING = ["1>:+v", " ^  <"]
+SQUARING = ["2v  ", " >:*"]
+
+
+def make_grid(source):
+    grid = befunge_grid.BefungeGrid(output=streams.BufferSink())
+    grid.set_grid("s", source)
+    return grid
+
+
+@pytest.mark.parametrize("engine", ["classic", "table", "block"])
+def test_run_within_quotas(engine):
+    reference = make_grid(COUNTDOWN)
+    reference.run(engine=engine)
+    grid = make_grid(COUNTDOWN)
+    quotas = Quotas(max_steps=10000, max_stack=10, max_output=0,
+                    max_int=100, time_limit=10, check_every=7)
+    assert grid.run(engine=engine, quotas=quotas)
+    assert (grid.steps, grid.stack) == (reference.steps, reference.stack)
+
+
+@pytest.mark.parametrize("engine", ["classic", "table", "block"])
+def test_step_quota_is_exact(engine):
+    grid = make_grid(["1:+v", "^  <"])
+    with pytest.raises(StepQuotaExceededError):
+        grid.run(engine=engine, quotas=Quotas(max_steps=1000))
+    assert grid.steps == 1000
+    assert grid.paused
+
+
+@pytest.mark.parametrize("source, quotas, error", [
+    (["1"], Quotas(max_stack=100, check_every=64), StackQuotaExceededError),
+    (["1."], Quotas(max_output=50, check_every=64), OutputQuotaExceededError),
+    (DOUBLING, Quotas(max_int=10 ** 6, check_every=64),
+     IntegerQuotaExceededError),
+    ([">v", "^<"], Quotas(time_limit=0.01), TimeQuotaExceededError),
+])
+def test_quota_errors(source, quotas, error):
+    grid = make_grid(source)
+    with pytest.raises(error) as error_info:
+        grid.run(engine="table", quotas=quotas)
+    assert isinstance(error_info.value, QuotaExceededError)
+
+
+def test_max_steps_pauses_before_quota():
+    grid = make_grid(DOUBLING)
+    assert not grid.run(max_steps=100, quotas=Quotas(max_steps=1000))
+    assert grid.steps == 100
+
+
+def test_continue_with_larger_quota():
+    grid = make_grid(COUNTDOWN)
+    with pytest.raises(StepQuotaExceededError):
+        grid.run(quotas=Quotas(max_steps=10))
+    assert grid.run(quotas=Quotas(max_steps=10000))
+    assert grid.stack == [0]
+
+
+@pytest.mark.parametrize("engine", ["classic", "table", "block"])
+def test_integer_quota_stops_the_command(engine):
+    grid = make_grid(SQUARING)
+    with pytest.raises(IntegerQuotaExceededError):
+        grid.run(engine=engine, quotas=Quotas(max_int=1000, time_limit=1))
+    assert (grid.steps, grid.y, grid.x, grid.stack) == (16, 1, 3, [])
+    assert not grid.paused
+    assert type(grid.stack) is list
+
+
+@pytest.mark.parametrize("engine", ["classic", "table", "block"])
+def test_time_quota_stops_growing_numbers(engine):
+    grid = make_grid(SQUARING)
+    start = time.monotonic()
+    with pytest.raises(TimeQuotaExceededError):
+        grid.run(engine=engine, quotas=Quotas(time_limit=0.2))
+    assert time.monotonic() - start < 5
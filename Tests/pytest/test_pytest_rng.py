@@ -0,0 +1,68 @@
+import pytest
+import befunge
+from befunge import befunge_grid, rng, trace
+from befunge.streams import BufferSink
+
+WALK = ["?1?", "2?3", "?4?"]
+
+
+def walk(engine, seed, max_steps=2000, **kwargs):
+    grid = befunge_grid.BefungeGrid(output=BufferSink(), seed=seed)
+    grid.set_grid("s", WALK)
+    grid.run(engine=engine, max_steps=max_steps, **kwargs)
+    return grid
+
+
+@pytest.mark.parametrize("engine", ["classic", "table", "block"])
+def test_seed_repeats_run(engine):
+    assert walk(engine, 7).stack == walk("classic", 7).stack
+    assert walk(engine, 7).stack != walk(engine, 8).stack
+
+
+def test_restore_after_draws():
+    generator = rng.DirectionRandom(5)
+    directions = [generator.direction() for _ in range(3000)]
+    for draws in (0, 1, rng.BATCH_DRAWS, 2500):
+        restored = rng.DirectionRandom.restore(5, draws)
+        assert [restored.direction() for _ in range(100)] == \
+            directions[draws:draws + 100]
+
+
+def test_directions_are_uniform():
+    generator = rng.DirectionRandom(1)
+    counts = {direction: 0 for direction in ">v<^"}
+    for _ in range(40000):
+        counts[generator.direction()] += 1
+    assert all(9000 < count < 11000 for count in counts.values())
+
+
+def test_snapshot_keeps_generator():
+    reference = walk("table", 3, 1500)
+    grid = walk("table", 3, 700)
+    restored = befunge_grid.BefungeGrid(output=BufferSink())
+    restored.restore(grid.snapshot())
+    restored.run(engine="table", max_steps=800)
+    assert restored.stack == reference.stack
+
+
+def test_trace_records_seed_and_draws():
+    grid = walk("table", 11, 50, trace=True)
+    data = grid.trace.dumps()
+    assert trace.read_header(data)[0] == 11
+    draws = [(record[6], record[7]) for record in trace.read_records(data)
+             if record[3] == ord("?")]
+    generator = rng.DirectionRandom(11)
+    assert draws == [(number, generator.index())
+                     for number in range(len(draws))]
+
+
+def test_transpiled_module_repeats_seeded_run(capfd):
+    for seed in range(20):
+        grid = befunge_grid.BefungeGrid(output=BufferSink(), seed=seed)
+        grid.set_grid("s", ["?1.@", "2   ", ".   ", "@   "])
+        grid.run()
+        namespace = {"__name__": "generated"}
+        exec(befunge.compile(grid), namespace)
+        namespace["main"]()
+        out, err = capfd.readouterr()
+        assert out == grid.output.getvalue()
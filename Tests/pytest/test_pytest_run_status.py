@@ -0,0 +1,65 @@
+import pytest
+from befunge import befunge_grid, streams
+from befunge.befunge_grid import RunStatus
+from befunge.interactive_befunge_grid import IABefungeGrid
+
+COUNTDOWN = ['"d">1\\-:v ', "   ^    _@"]
+
+
+def make_grid(source, input_source=None):
+    grid = befunge_grid.BefungeGrid(output=streams.BufferSink(),
+                                    input_source=input_source)
+    grid.set_grid("s", source)
+    return grid
+
+
+@pytest.mark.parametrize("engine", ["classic", "table", "block"])
+def test_round_robin_is_same_as_full_run(engine):
+    reference = make_grid(COUNTDOWN)
+    reference.run(engine=engine)
+    grids = [make_grid(COUNTDOWN) for _ in range(3)]
+    statuses = [None] * 3
+    while any(status is None or status.status != RunStatus.HALTED
+              for status in statuses):
+        for number, grid in enumerate(grids):
+            statuses[number] = grid.run_for(37, engine)
+            assert statuses[number].steps <= 37
+    for grid in grids:
+        assert (grid.steps, grid.stack) == (reference.steps, reference.stack)
+
+
+def test_needs_input_resumes():
+    source = streams.AsyncSource()
+    grid = make_grid(["&&+.@"], source)
+    assert grid.run_for(100) == RunStatus(RunStatus.NEEDS_INPUT, 0)
+    source.feed("4\n")
+    assert grid.run_for(100) == RunStatus(RunStatus.NEEDS_INPUT, 1)
+    source.feed("5\n")
+    assert grid.run_for(100) == RunStatus(RunStatus.HALTED, 3)
+    assert grid.output.getvalue() == "9 "
+
+
+def test_budget_exhausted_and_step():
+    grid = make_grid(["1:+v", "^  <"])
+    assert grid.run_for(10).status == RunStatus.BUDGET_EXHAUSTED
+    assert grid.step() == RunStatus(RunStatus.BUDGET_EXHAUSTED, 1)
+    assert grid.steps == 11
+
+
+@pytest.mark.parametrize("source,error",
+                         [(["1Z"], "Invalid operand [ Z ] at 1 row, "
+                                   "2 column"),
+                          (["|"], "NotEnoughElementsInStackError")])
+def test_error_status(source, error):
+    status = make_grid(source).run_for(10, "table")
+    assert status.status == RunStatus.ERROR
+    assert status.error.startswith(error)
+
+
+def test_ia_grid_run_for(monkeypatch):
+    rows = iter(["12+@", ""])
+    monkeypatch.setattr("builtins.input", lambda: next(rows))
+    grid = IABefungeGrid(output=streams.BufferSink())
+    assert grid.run_for(2).status == RunStatus.BUDGET_EXHAUSTED
+    assert grid.run_for(2) == RunStatus(RunStatus.HALTED, 1)
+    assert grid.stack == [3]
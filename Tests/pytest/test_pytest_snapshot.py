@@ -0,0 +1,100 @@
+import pytest
+from befunge import batch, befunge_grid, exceptions, snapshot
+from befunge.streams import BufferSink, BytesSource
+
+COUNTDOWN = ['"(":*>1\\-:#v_@', "     ^     <  "]
+
+
+def make_grid(source, input_data=""):
+    grid = befunge_grid.BefungeGrid(output=BufferSink(),
+                                    input_source=BytesSource(input_data))
+    grid.set_grid("s", source)
+    return grid
+
+
+def test_restored_run_is_same_as_full_run():
+    reference = make_grid(COUNTDOWN)
+    reference.run()
+    grid = make_grid(COUNTDOWN)
+    grid.run(max_steps=500)
+    data = grid.snapshot()
+    restored = befunge_grid.BefungeGrid(output=BufferSink())
+    restored.restore(data)
+    assert restored.run()
+    assert (restored.stack, restored.steps, restored.y, restored.x) == \
+        (reference.stack, reference.steps, reference.y, reference.x)
+
+
+def test_snapshot_keeps_state():
+    grid = make_grid(['"a"v', "  ~<"], "xyz")
+    grid.stack = [-300, 2 ** 70]
+    grid.run(max_steps=7)
+    data = grid.snapshot()
+    restored = befunge_grid.BefungeGrid(input_source=BytesSource("xyz"))
+    restored.restore(data)
+    assert restored.grid == grid.grid
+    assert restored.stack == grid.stack
+    assert (restored.y, restored.x, restored.move_direction,
+            restored.string_mode, restored.paused) == \
+        (grid.y, grid.x, grid.move_direction, grid.string_mode, True)
+    assert restored.input_source.read_char() == ord("y")
+
+
+def test_snapshot_of_wide_cells():
+    grid = make_grid(["88*:*8*8*00p@"])
+    grid.legacy_put = False
+    grid.run()
+    restored = befunge_grid.BefungeGrid()
+    restored.restore(grid.snapshot())
+    assert restored.grid.cell(0, 0) == 8 ** 6
+
+
+def test_varints():
+    data = bytearray()
+    for value in (0, 127, 128, 2 ** 64):
+        snapshot.write_varint(data, value)
+    position = 0
+    for value in (0, 127, 128, 2 ** 64):
+        read, position = snapshot.read_varint(data, position)
+        assert read == value
+    assert [snapshot.unzigzag(snapshot.zigzag(value))
+            for value in (0, -1, 1, -2 ** 40)] == [0, -1, 1, -2 ** 40]
+
+
+def test_wrong_snapshot():
+    grid = befunge_grid.BefungeGrid()
+    with pytest.raises(exceptions.WrongSnapshotError):
+        grid.restore(b"nothing")
+    with pytest.raises(exceptions.WrongSnapshotError):
+        grid.restore(make_grid(["@"]).snapshot()[:-2])
+    data = bytearray(make_grid(["@"]).snapshot())
+    data[7] = 1
+    with pytest.raises(exceptions.WrongSnapshotError):
+        grid.restore(bytes(data))
+
+
+def test_funge98_grid_has_no_snapshot():
+    grid = befunge_grid.BefungeGrid(funge98=True)
+    grid.set_grid("s", ["@"])
+    with pytest.raises(exceptions.WrongSnapshotError):
+        grid.snapshot()
+    with pytest.raises(exceptions.WrongSnapshotError):
+        grid.restore(make_grid(["@"]).snapshot())
+
+
+def test_batch_continues_from_checkpoint(tmp_path):
+    program = ['"(":*>1\\-:#v_@', "     ^     <. "]
+    job = batch.Job("countdown", program)
+    first = batch.run_job(job, max_steps=4000, checkpoint_dir=tmp_path,
+                          checkpoint_every=3000)
+    assert first.reason == "step_limit"
+    grid = befunge_grid.BefungeGrid(output=BufferSink())
+    grid.set_grid("s", program)
+    grid.run(max_steps=3000)
+    grid.output.write("saved ")
+    batch.save_checkpoint(grid, tmp_path / "countdown.checkpoint")
+    result = batch.run_job(job, checkpoint_dir=tmp_path)
+    assert result.reason == "halted"
+    assert result.output.startswith("saved ")
+    assert result.steps == batch.run_job(job).steps
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,102 @@
+import pytest
+from io import BytesIO
+from befunge import befunge_grid, exceptions, streams
+
+
+def test_buffer_sink():
+    sink = streams.BufferSink()
+    grid = befunge_grid.BefungeGrid(output=sink)
+    grid.set_grid("s", ['"!iH">:#,_1.@'])
+    grid.run()
+    assert sink.getvalue() == "Hi!1 "
+
+
+def test_stream_sink_binary_flush_size():
+    stream = BytesIO()
+    sink = streams.StreamSink(stream, flush_size=2)
+    sink.write("a")
+    assert stream.getvalue() == b""
+    sink.write("é")
+    assert stream.getvalue() == "aé".encode("utf-8")
+
+
+def test_callback_sink_flush_at_end():
+    chunks = []
+    grid = befunge_grid.BefungeGrid(output=streams.CallbackSink(chunks.append))
+    grid.set_grid("s", ["1.2.3.@"])
+    grid.run(engine="block")
+    assert chunks == ["1 2 3 "]
+
+
+def test_flush_on_error():
+    sink = streams.BufferSink()
+    grid = befunge_grid.BefungeGrid(output=sink)
+    grid.set_grid("s", ["1.|"])
+    with pytest.raises(exceptions.NotEnoughElementsInStackError):
+        grid.run()
+    assert sink.chunks == ["1 "]
+
+
+def test_debug_output_interleaving(capfd):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["1.@"])
+    grid.run(True)
+    out, err = capfd.readouterr()
+    assert out.split("\n")[2] == "1 evaluate command [ @ ]"\
+                                 " at Y: 1 X: 3, string mode: False," \
+                                 " stack: [  ]"
+
+
+def test_cat_program_from_bytes_source():
+    sink = streams.BufferSink()
+    grid = befunge_grid.BefungeGrid(
+        output=sink, input_source=streams.BytesSource(b"abc\nde\n"))
+    grid.set_grid("f", "Scripts/cat.txt")
+    grid.run()
+    assert sink.getvalue() == "abc\nde\n"
+
+
+def test_file_source_small_chunks():
+    source = streams.FileSource(BytesIO("жё\n".encode("utf-8")),
+                                chunk_size=1)
+    assert [source.read_char() for _ in range(4)] == \
+        [ord("ж"), ord("ё"), ord("\n"), None]
+
+
+def test_iterator_source_numbers():
+    source = streams.IteratorSource(["12 -", "3\n4"])
+    assert [source.read_int() for _ in range(4)] == [12, -3, 4, None]
+
+
+def test_console_source_reads_whole_line(monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda: "ab")
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["~~~@"])
+    grid.run()
+    assert grid.stack == [97, 98, 10]
+
+
+@pytest.mark.parametrize("eof,expected", [("push", [-1]), ("reflect", [])])
+def test_end_of_input(eof, expected):
+    grid = befunge_grid.BefungeGrid(input_source=streams.BytesSource(""),
+                                    eof=eof)
+    grid.set_grid("s", ["&@@"])
+    grid.run()
+    assert grid.stack == expected
+    assert grid.x == (1 if eof == "push" else 2)
+
+
+def test_wrong_eof_mode_error():
+    with pytest.raises(exceptions.WrongEofModeError):
+        befunge_grid.BefungeGrid(eof="z")
+
+
+@pytest.mark.parametrize("data,expected",
+                         [("abc", [None]),
+                          ("12abc", [12, None]),
+                          ("-", [None]),
+                          ("x-5 - 7", [-5, 7, None]),
+                          ("a1b2", [1, 2, None])])
+def test_read_int_skips_non_digits(data, expected):
+    source = streams.BytesSource(data)
+    assert [source.read_int() for _ in expected] == expected
@@ -0,0 +1,53 @@
+import pytest
+from befunge import befunge_grid, trace
+from befunge.streams import BufferSink
+
+PROGRAMS = [['"!olleH">:#,_@'],
+            ["+-*/%!`:\\$1:2\\1$@"],
+            ["67+5*11p@"],
+            ["21g@", "  A "],
+            ["1|", " @", " @"]]
+
+
+def make_grid(source):
+    grid = befunge_grid.BefungeGrid(output=BufferSink())
+    grid.set_grid("s", source)
+    return grid
+
+
+@pytest.mark.parametrize("test_input", PROGRAMS)
+def test_rendered_trace_is_same_as_debug(test_input, capfd):
+    make_grid(test_input).run(debug=True)
+    out, err = capfd.readouterr()
+    grid = make_grid(test_input)
+    grid.run(trace=True)
+    assert list(trace.render(grid.trace.dumps())) == out.splitlines()
+
+
+def test_ring_buffer_keeps_last_records():
+    grid = make_grid(["1>:v", " ^ <"])
+    grid.run(max_steps=100, trace=trace.TraceRecorder(capacity=8))
+    data = grid.trace.dumps()
+    records = list(trace.read_records(data))
+    assert [record[0] for record in records] == list(range(92, 100))
+    assert list(trace.render(data, None))[0].endswith("stack: [ ... ]")
+
+
+def test_trace_file_and_decoder(tmp_path, capfd):
+    path = tmp_path / "hello.trace"
+    grid = make_grid(["2 3+.@"])
+    with open(path, "wb") as file:
+        grid.run(trace=trace.TraceRecorder(file=file))
+    data = path.read_bytes()
+    assert len(data) == trace.read_header(data)[1] + 6 * trace.RECORD.size
+    assert trace.main([str(path)]) == 0
+    out, err = capfd.readouterr()
+    assert out.splitlines()[4] == "evaluate command [ . ] at Y: 1 X: 5," \
+                                  " string mode: False, stack: [ 5 ]"
+
+
+def test_big_values_are_unknown():
+    grid = make_grid(["9:*:*:*:*:*:*.@"])
+    grid.run(trace=True)
+    lines = list(trace.render(grid.trace.dumps()))
+    assert lines[-2].endswith("stack: [ ? ]")
@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+from io import StringIO
+import pytest
+import befunge
+from befunge import befunge_grid, exceptions, transpiler
+from befunge.streams import BufferSink, BytesSource
+
+INPUT = "12 -5\nab\n"
+PROGRAMS = [["123...@"],
+            ['"!olleH">:#,_@'],
+            ["23-26/49%1!0!12`21`....@"],
+            ["0v ", "@_@"],
+            ["v          <", '>5. "@"42p ^'],
+            ["&&+.@"],
+            ["~:1+!#@_,"],
+            ["21g.@", "  A  "],
+            ["x"],
+            ['"(":*>1\\-:#v_@', "     ^     <  "]]
+
+
+def run_module(source, monkeypatch, capfd):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", source)
+    namespace = {"__name__": "generated"}
+    exec(befunge.compile(grid), namespace)
+    monkeypatch.setattr("sys.stdin", StringIO(INPUT))
+    namespace["main"]()
+    out, err = capfd.readouterr()
+    return out, namespace["stack"]
+
+
+@pytest.mark.parametrize("test_input", PROGRAMS)
+def test_module_is_same_as_grid(test_input, monkeypatch, capfd):
+    grid = befunge_grid.BefungeGrid(output=BufferSink(),
+                                    input_source=BytesSource(INPUT))
+    grid.set_grid("s", test_input)
+    grid.run()
+    assert run_module(test_input, monkeypatch, capfd) == \
+        (grid.output.getvalue(), grid.stack)
+
+
+def test_static_program_has_no_fallback():
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ['"!olleH">:#,_@'])
+    assert "interpret(" not in transpiler.transpile(grid).split(
+        "OPERATIONS =")[1]
+    grid.set_grid("s", ["v          <", '>5. "@"42p ^'])
+    assert "return interpret(" in transpiler.transpile(grid)
+
+
+def test_branch_on_empty_stack_raises(monkeypatch, capfd):
+    error = exceptions.NotEnoughElementsInStackError
+    with pytest.raises(error) as module_error:
+        run_module(["|@"], monkeypatch, capfd)
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", ["|@"])
+    with pytest.raises(error) as grid_error:
+        grid.run()
+    assert str(module_error.value) == str(grid_error.value)
+
+
+def test_transpiler_cli(tmp_path):
+    module = tmp_path / "hello.py"
+    assert transpiler.main(["Scripts/hello_world.txt", "-o",
+                            str(module)]) == 0
+    result = subprocess.run([sys.executable, str(module)],
+                            capture_output=True, text=True, timeout=60,
+                            env={**os.environ, "PYTHONPATH": os.getcwd()})
+    grid = befunge_grid.BefungeGrid(output=BufferSink())
+    grid.set_grid("f", "Scripts/hello_world.txt")
+    grid.run()
+    assert result.stdout == grid.output.getvalue()
@@ -0,0 +1,77 @@
+import pytest
+from befunge import befunge_grid, streams
+from befunge.exceptions import WrongStackModeError
+from befunge.typed_stack import TypedStack
+
+POWER = ["99*:*:*:*:*.@"]
+
+
+def run(source, engine="classic", **options):
+    grid = befunge_grid.BefungeGrid(output=streams.BufferSink(), **options)
+    grid.set_grid("s", source)
+    grid.run(engine=engine)
+    return grid
+
+
+@pytest.mark.parametrize("engine", ["classic", "table", "block"])
+@pytest.mark.parametrize("mode, text", [
+    ("list", "3433683820292512484657849089281 "),
+    ("int32", "2038349057 "),
+    ("int64", "8733086111712066817 "),
+])
+def test_wrap_around(engine, mode, text):
+    assert run(POWER, engine, stack_mode=mode).output.getvalue() == text
+
+
+@pytest.mark.parametrize("engine", ["classic", "table", "block"])
+def test_implicit_zeros(engine):
+    assert run(["5+.@"], engine, stack_mode="int32").output.getvalue() \
+        == "5 "
+    assert run(["5\\@"], engine, stack_mode="int32").stack == [5, 0]
+    assert run([".@"], engine, stack_mode="int64").output.getvalue() \
+        == "0 "
+    assert run(["|@", "@ "], engine, stack_mode="int64").y == 1
+
+
+def test_capacity_grows():
+    stack = TypedStack(32, capacity=2)
+    stack.extend(range(10))
+    assert len(stack) == 10
+    assert stack.pop() == 9
+    del stack[-3:]
+    assert stack == [0, 1, 2, 3, 4, 5]
+    assert stack[-1] == 5
+    stack.append(2 ** 31)
+    assert stack[-1] == -2 ** 31
+    stack.clear()
+    assert stack.pop() == 0
+    with pytest.raises(IndexError):
+        stack[-1]
+
+
+def test_slices_are_same_as_list():
+    stack = TypedStack(64, capacity=16, values=range(10))
+    del stack[-4:]
+    values = list(range(6))
+    for index in (slice(None), slice(-3, None), slice(2, 20),
+                  slice(None, None, -1), slice(4, None, -2), slice(-1, 0)):
+        assert stack[index] == values[index]
+    assert TypedStack(64)[::-1] == []
+
+
+def test_snapshot_keeps_stack_mode():
+    grid = befunge_grid.BefungeGrid(output=streams.BufferSink(),
+                                    stack_mode="int32")
+    grid.set_grid("s", ["123@"])
+    grid.run(max_steps=2)
+    restored = befunge_grid.BefungeGrid(output=streams.BufferSink(),
+                                        stack_mode="int32")
+    restored.restore(grid.snapshot())
+    assert isinstance(restored.stack, TypedStack)
+    assert restored.run()
+    assert restored.stack == [1, 2, 3]
+
+
+def test_wrong_stack_mode():
+    with pytest.raises(WrongStackModeError):
+        befunge_grid.BefungeGrid(stack_mode="int16")
@@ -0,0 +1,65 @@
+import pytest
+from befunge import befunge_grid, vectorized
+from befunge.streams import BufferSink, BytesSource
+
+numpy = pytest.importorskip("numpy")
+
+PROGRAMS = [(["&:*.@"], ["3", "-4", "99999999999", "x"]),
+            (["&>:1\\-:v", " ^   _$@"], ["5", "0", "-3"]),
+            (["&&\\-.&&/.&&%.@"], ["1 2 3 0 -7 2", "", "-9 4 7 -2 0 0"]),
+            (["&:v", "@,_"], ["65", "0", "1114112", "-1"]),
+            (["&&g.@", "xyz  "], ["0 1", "-1 -1", "5 5", "1 -2"]),
+            (["&&&p00g.10g.@"], ["66 1 1", "70 9 9", "2000000 1 1", "1"]),
+            (["~:1+!#@_,"], ["hello", "", "wörld"]),
+            (["&1+:*:*:*:*:*:*.@"], ["1", "3", "100"]),
+            (['"abc"&3-!#@_q'], ["3", "4"]),
+            (["&|", " ."], ["0", "1"]),
+            (["&&&&:\\!`$.@"], ["1 2 3 4", "", "9"])]
+
+
+def run_separately(source, input_data, max_steps):
+    grid = befunge_grid.BefungeGrid(output=BufferSink(),
+                                    input_source=BytesSource(input_data))
+    grid.set_grid("s", source)
+    error = None
+    try:
+        if grid.run(engine="table", max_steps=max_steps):
+            reason = "halted" if grid.grid.char(grid.y, grid.x) == "@" \
+                else "invalid_operand"
+        else:
+            reason = "step_limit"
+    except Exception as error_object:
+        reason = "error"
+        error = f"{type(error_object).__name__}: {error_object}"
+    return reason, grid.output.getvalue(), grid.stack, grid.steps, error
+
+
+@pytest.mark.parametrize("source,inputs", PROGRAMS)
+@pytest.mark.parametrize("max_steps", [1, 7, 1000])
+def test_lockstep_is_same_as_separate_runs(source, inputs, max_steps):
+    results = vectorized.run_many(source, inputs, max_steps)
+    assert [(result.reason, result.output, result.stack, result.steps,
+             result.error) for result in results] == \
+        [run_separately(source, data, max_steps) for data in inputs]
+
+
+def test_results_are_in_input_order():
+    results = vectorized.run_many(["&.@"], [str(value)
+                                            for value in range(100)])
+    assert [result.output for result in results] == \
+        [f"{value} " for value in range(100)]
+    assert [result.name for result in results] == \
+        [str(value) for value in range(100)]
+
+
+def test_seeded_random_walks_are_same_as_separate_runs():
+    walk = ["&?1?", "+2?3", "??4?"]
+    inputs = [str(value) for value in range(20)]
+    results = vectorized.run_many(walk, inputs, 300, seeds=range(20))
+    for seed, (result, data) in enumerate(zip(results, inputs)):
+        grid = befunge_grid.BefungeGrid(output=BufferSink(),
+                                        input_source=BytesSource(data),
+                                        seed=seed)
+        grid.set_grid("s", walk)
+        grid.run(engine="table", max_steps=300)
+        assert (result.stack, result.steps) == (grid.stack, grid.steps)
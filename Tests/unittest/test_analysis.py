@@ -0,0 +1,70 @@
+import unittest
+from befunge import analysis, befunge_grid
+from befunge.streams import BufferSink
+
+STORE = ["567+5*21p21g.@", "              "]
+
+
+def analyze(source, legacy_put=True, eof="push"):
+    grid = befunge_grid.BefungeGrid(legacy_put=legacy_put, eof=eof)
+    grid.set_grid("s", source)
+    return analysis.analyze(grid)
+
+
+class TestAnalysis(unittest.TestCase):
+    def test_program_without_put_is_static(self):
+        result = analyze(['"!olleH">:#,_@', "    @         "])
+        self.assertFalse(result.put_reachable)
+        self.assertTrue(result.is_static)
+        self.assertNotIn((1, 4), result.cells)
+
+    def test_legacy_put_targets(self):
+        for source, writable, static in [
+                (STORE, {(0, 0), (0, 1)}, False),
+                (["0v", "@p"], None, False),
+                (["?@", "@@"], set(), True)]:
+            with self.subTest(source=source):
+                result = analyze(source)
+                self.assertEqual(result.writable, writable)
+                self.assertEqual(result.is_static, static)
+
+    def test_put_into_data_cells_is_static(self):
+        result = analyze(STORE, legacy_put=False)
+        self.assertEqual(result.writable, {(1, 2)})
+        self.assertTrue(result.is_static)
+
+    def test_reflecting_input_reaches_both_ways(self):
+        result = analyze(["~@"], eof="reflect")
+        self.assertIn((0, 1, "<", False), result.states)
+
+    def test_block_engine_skips_write_checks_for_static_program(self):
+        grid = befunge_grid.BefungeGrid(legacy_put=False,
+                                        output=BufferSink())
+        grid.set_grid("s", STORE)
+        grid.run(engine="block")
+        self.assertTrue(grid.block_cache.static)
+        self.assertFalse(grid.write_hooks)
+        self.assertEqual(grid.output.getvalue(), "65 ")
+
+    def test_put_targets_of_every_path(self):
+        result = analyze(["?  v ", "   3 ", "   1 ", ">21p@", "   @ "],
+                         legacy_put=False)
+        self.assertEqual(result.writable, {(1, 2), (1, 3)})
+        self.assertFalse(result.is_static)
+
+    def test_put_of_entry_state_can_write_anywhere(self):
+        for source, legacy_put, stack_mode in [
+                (["p668223", "^:@@7::", "7 1_<\\:"], True, "list"),
+                (["p2>g 05", "$_9$/|:"], False, "int64")]:
+            with self.subTest(source=source):
+                self.assertIsNone(analyze(source, legacy_put).writable)
+                results = []
+                for engine in ("classic", "block"):
+                    grid = befunge_grid.BefungeGrid(
+                        legacy_put=legacy_put, output=BufferSink(),
+                        stack_mode=stack_mode)
+                    grid.set_grid("s", source)
+                    grid.run(engine=engine, max_steps=3000)
+                    results.append((grid.output.getvalue(), list(grid.stack),
+                                    list(grid.grid), grid.steps))
+                self.assertEqual(results[0], results[1])
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from befunge import artifact_cache, batch, befunge_grid
+from befunge.streams import BufferSink
+
+HELLO = ['"!olleH">:#,_@']
+SELF_MODIFYING = ["v          <", '>5. "@"42p ^']
+
+
+def load(cache, source):
+    grid = befunge_grid.BefungeGrid(output=BufferSink())
+    warm = cache.load(grid, "s", source)
+    return grid, warm
+
+
+class TestArtifactCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_warm_load_skips_preprocessing(self):
+        cache = artifact_cache.ArtifactCache(self.path)
+        grid, warm = load(cache, HELLO)
+        self.assertFalse(warm)
+        grid.run(engine="block")
+        cache.store(grid)
+        grid, warm = load(cache, HELLO)
+        self.assertTrue(warm)
+        self.assertTrue(grid.block_cache.preloaded)
+        self.assertTrue(grid.run(engine="block"))
+        self.assertEqual(grid.output.getvalue(), "Hello!")
+
+    def test_preloaded_blocks_of_self_modifying_program(self):
+        cache = artifact_cache.ArtifactCache(self.path)
+        for _ in range(2):
+            grid, _ = load(cache, SELF_MODIFYING)
+            grid.run(engine="block")
+            cache.store(grid)
+            self.assertEqual(grid.output.getvalue(), "5 5 ")
+
+    def test_torn_artifact_is_ignored(self):
+        cache = artifact_cache.ArtifactCache(self.path)
+        grid, _ = load(cache, HELLO)
+        cache.path(grid.artifact[1]).write_bytes(b"\x80garbage")
+        grid, warm = load(cache, HELLO)
+        self.assertFalse(warm)
+        self.assertTrue(grid.run())
+
+    def test_least_recently_used_is_evicted(self):
+        cache = artifact_cache.ArtifactCache(self.path, max_entries=2)
+        first, _ = load(cache, ["1@"])
+        os.utime(cache.path(first.artifact[1]), (0, 0))
+        load(cache, ["2@"])
+        load(cache, ["3@"])
+        self.assertFalse(cache.path(first.artifact[1]).exists())
+
+    def test_batch_uses_cache(self):
+        job = batch.Job("hello", HELLO)
+        for _ in range(2):
+            result = batch.run_job(job, cache_dir=self.path)
+            self.assertEqual(result.output, "Hello!")
+        self.assertEqual(len(list(self.path.glob("*.bfc"))), 1)
@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+from befunge import befunge_grid, exceptions, streams
+
+ADDER = ["&&+.@"]
+ECHO = ["~:1+!#@_,"]
+COUNTDOWN = ['"d">1\\-:v ', "   ^    _@"]
+
+
+def make_grid(source, reader, target):
+    grid = befunge_grid.BefungeGrid(output=streams.AsyncSink(target),
+                                    input_source=streams.AsyncSource(reader))
+    grid.set_grid("s", source)
+    return grid
+
+
+class TestAsync(unittest.TestCase):
+    def test_run_async_awaits_queue_input(self):
+        async def session():
+            reader = asyncio.Queue()
+            writer = asyncio.Queue()
+            grid = make_grid(ADDER, reader, writer)
+            task = asyncio.ensure_future(grid.run_async())
+            await asyncio.sleep(0)
+            self.assertFalse(task.done())
+            await reader.put("1")
+            await reader.put("2\n3\n")
+            self.assertTrue(await task)
+            return await writer.get()
+
+        self.assertEqual(asyncio.run(session()), "15 ")
+
+    def test_run_async_stream_reader(self):
+        async def session():
+            reader = asyncio.StreamReader()
+            output = []
+            grid = make_grid(ECHO, reader, output.append)
+            task = asyncio.ensure_future(grid.run_async(engine="table"))
+            await asyncio.sleep(0)
+            reader.feed_data("héllo".encode("utf-8"))
+            reader.feed_eof()
+            await task
+            return "".join(output)
+
+        self.assertEqual(asyncio.run(session()), "héllo")
+
+    def test_many_sessions_share_event_loop(self):
+        async def session():
+            grid = make_grid(COUNTDOWN, asyncio.Queue(), [].append)
+            await grid.run_async(engine="table", yield_every=100)
+            return grid.steps
+
+        async def sessions():
+            return await asyncio.gather(*(session()
+                                          for number in range(100)))
+
+        self.assertEqual(len(set(asyncio.run(sessions()))), 1)
+
+    def test_async_source_read_int_is_atomic(self):
+        source = streams.AsyncSource()
+        source.feed("-1")
+        with self.assertRaises(exceptions.InputIsNotReadyError):
+            source.read_int()
+        source.feed("2 7")
+        self.assertEqual(source.read_int(), -12)
+        source.close()
+        self.assertEqual((source.read_int(), source.read_int()), (7, None))
@@ -0,0 +1,79 @@
+import json
+import os
+import time
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from befunge import batch, befunge_grid
+
+
+class TestBatch(unittest.TestCase):
+    def test_run_in_slices_is_same_as_full_run(self):
+        program = ['"(":*>1\\-:#v_@', "     ^     <  "]
+        for engine in ["classic", "table", "block"]:
+            with self.subTest(engine=engine):
+                full = befunge_grid.BefungeGrid()
+                full.set_grid("s", list(program))
+                full.run(engine=engine)
+                sliced = befunge_grid.BefungeGrid()
+                sliced.set_grid("s", list(program))
+                while not sliced.run(engine=engine, max_steps=1000):
+                    pass
+                self.assertEqual((sliced.stack, sliced.steps),
+                                 (full.stack, full.steps))
+
+    def test_run_job_reasons(self):
+        test_cases = [(["1.2.@"], 5000, "halted"),
+                      (["1Z"], 5000, "invalid_operand"),
+                      ([">v", "^<"], 5000, "step_limit"),
+                      (["|"], 5000, "error")]
+        for program, max_steps, reason in test_cases:
+            with self.subTest(program=program):
+                result = batch.run_job(batch.Job("job", program), max_steps)
+                self.assertEqual(result.reason, reason)
+
+    def test_run_job_timeout(self):
+        result = batch.run_job(batch.Job("job", [">v", "^<"]), timeout=0.05)
+        self.assertEqual(result.reason, "timeout")
+
+    def test_run_batch_from_manifest(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory)
+            (path / "echo.bf").write_text("&.@")
+            (path / "jobs.json").write_text(json.dumps(
+                [{"name": "one", "program": "echo.bf", "input": "1"},
+                 {"name": "two", "program": "echo.bf", "input": "2"}]))
+            jobs = batch.load_jobs(path / "jobs.json")
+            results = {result.name: result.output
+                       for result in batch.run_batch(jobs, workers=2)}
+        self.assertEqual(results, {"one": "1 ", "two": "2 "})
+
+
+original_run_job = batch.run_job
+
+
+def misbehaving_run_job(job, *args):
+    if job.name == "crash":
+        os._exit(1)
+    if job.name == "hang":
+        time.sleep(30)
+    return original_run_job(job, *args)
+
+
+class TestBatchWorkerFailures(unittest.TestCase):
+    @patch("befunge.batch.run_job", misbehaving_run_job)
+    def test_run_batch_recovers_from_crashed_worker(self):
+        jobs = [batch.Job("crash", ["@"]), batch.Job("ok", ["1.@"])]
+        results = {result.name: result
+                   for result in batch.run_batch(jobs, workers=2)}
+        self.assertEqual(results["crash"].reason, "error")
+        self.assertEqual(results["ok"].output, "1 ")
+
+    @patch("befunge.batch.HARD_TIMEOUT_GRACE", 0.2)
+    @patch("befunge.batch.run_job", misbehaving_run_job)
+    def test_run_batch_hard_timeout(self):
+        jobs = [batch.Job("hang", ["@"]), batch.Job("ok", ["1.@"])]
+        results = {result.name: result.reason for result in
+                   batch.run_batch(jobs, workers=1, timeout=0.1)}
+        self.assertEqual(results, {"hang": "timeout", "ok": "halted"})
@@ -188,3 +188,15 @@ class TestBefungeGrid(unittest.TestCase):
         grid.set_grid("s", string_list)
         grid.run()
         assert (grid.x == 0 and grid.y == 1) or (grid.x == 1 and grid.y == 0)
+
+    def test_next_cell_tables_wrap(self):
+        right, down, left, up = befunge_grid.next_cell_tables(2, 3)
+        self.assertEqual((right[2], down[4], left[3], up[1]),
+                         ((0, 0), (0, 1), (1, 2), (1, 1)))
+
+    def test_move_direction_property(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.move_direction = "^"
+        self.assertEqual(grid.direction, befunge_grid.UP)
+        grid.direction = befunge_grid.LEFT
+        self.assertEqual(grid.move_direction, "<")
@@ -0,0 +1,26 @@
+import unittest
+from benchmarks import compare, corpus, runner, startup
+
+
+def report(ips):
+    return {"results": [{"workload": "loop", "engine": "table",
+                         "instructions_per_second": ips}]}
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_compare_flags_regression(self):
+        for current, regressed in [(95, False), (80, True)]:
+            with self.subTest(current=current):
+                rows, regressions = compare.compare(report(100),
+                                                    report(current), 0.1)
+                self.assertEqual(bool(regressions), regressed)
+
+    def test_workload_engines_execute_same_steps(self):
+        for workload in corpus.WORKLOADS:
+            with self.subTest(workload=workload.name):
+                steps = {runner.run_workload(workload, engine, 2000).steps
+                         for engine in runner.ENGINES}
+                self.assertEqual(steps, {2000})
+
+    def test_plain_run_has_no_heavy_imports(self):
+        self.assertEqual(startup.heavy_imports(), [])
@@ -0,0 +1,67 @@
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from befunge import befunge_grid, block_compiler
+from befunge.streams import BufferSink
+
+PROGRAMS = [["123@"],
+            ['"qwerty"@'],
+            ["23-26/49%1!0!12`21`@"],
+            ["+-*/%!`:\\$1:2\\1$@"],
+            ["#@v", "  @"],
+            ["1|", " @", " @"],
+            ["0v ", "@_@"],
+            ["67+5*11p@"],
+            ["21g@", "  A "],
+            ['"!olleH">:#,_@'],
+            ["v          <", '>5. "@"42p ^']]
+
+
+def run_engine(string_list, engine):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", list(string_list))
+    with patch("sys.stdout", new_callable=StringIO) as out:
+        grid.run(engine=engine)
+    return grid.stack, grid.grid, grid.y, grid.x, out.getvalue()
+
+
+def error_state(test, string_list, engine):
+    grid = befunge_grid.BefungeGrid(output=BufferSink())
+    grid.set_grid("s", list(string_list))
+    with test.assertRaises(IndexError):
+        grid.run(engine=engine)
+    return grid.y, grid.x, grid.direction, grid.string_mode, grid.steps
+
+
+class TestBlockCompiler(unittest.TestCase):
+    def test_block_engine_is_same_as_classic(self):
+        for test_input in PROGRAMS:
+            with self.subTest(test_input=test_input):
+                self.assertEqual(run_engine(test_input, "block"),
+                                 run_engine(test_input, "classic"))
+
+    def test_self_modifying_block(self):
+        result = run_engine(["v          <", '>5. "@"42p ^'], "block")
+        self.assertEqual(result[4], "5 5 ")
+
+    def test_error_in_block_leaves_classic_state(self):
+        for test_input in [["$."], ["<<*60v,"],
+                           ["9 .<^/5", "6_p>#$7", "|>6$p5#"]]:
+            with self.subTest(test_input=test_input):
+                self.assertEqual(error_state(self, test_input, "block"),
+                                 error_state(self, test_input, "classic"))
+
+    def test_discover_ends_before_branch(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ['1"ab"v', "@    _"])
+        block = block_compiler.discover(grid, 0, 0, ">", False)
+        self.assertEqual([op[1] for op in block.ops], [1, 97, 98])
+        self.assertEqual(block.end, (1, 5, "v", False))
+
+    def test_invalidate_block(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ["12+@"])
+        cache = block_compiler.BlockCache(grid)
+        self.assertIsNotNone(cache.lookup((0, 0, ">", False)))
+        cache.invalidate(0, 1)
+        self.assertNotIn((0, 0, ">", False), cache.blocks)
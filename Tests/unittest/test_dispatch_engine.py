@@ -0,0 +1,64 @@
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from befunge import befunge_grid, exceptions
+
+PROGRAMS = [["123@"],
+            ['"qwerty"@'],
+            ["23-26/49%1!0!12`21`@"],
+            ["+-*/%!`:\\$1:2\\1$@"],
+            ["03/00%@"],
+            ["#@v", "  @"],
+            ["1|", " @", " @"],
+            ["0v ", "@_@"],
+            ["67+5*11p@"],
+            ["21g@", "  A "],
+            ["p@"],
+            ['"!olleH">:#,_@'],
+            ["91+9*.@"]]
+
+
+def run_engine(string_list, engine):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", list(string_list))
+    with patch("sys.stdout", new_callable=StringIO) as out:
+        grid.run(engine=engine)
+    return grid.stack, grid.grid, grid.y, grid.x, out.getvalue()
+
+
+class TestDispatchEngine(unittest.TestCase):
+    def test_table_engine_is_same_as_classic(self):
+        for test_input in PROGRAMS:
+            with self.subTest(test_input=test_input):
+                self.assertEqual(run_engine(test_input, "table"),
+                                 run_engine(test_input, "classic"))
+
+    def test_table_engine_invalid_operand(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ["1Z"])
+        with patch("sys.stdout", new_callable=StringIO) as out:
+            grid.run(engine="table")
+        self.assertEqual("Invalid operand [ Z ] at 1 row, 2 column\n",
+                         out.getvalue())
+
+    def test_table_engine_not_enough_elements_in_stack_error(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ["|"])
+        with self.assertRaises(exceptions.NotEnoughElementsInStackError):
+            grid.run(engine="table")
+
+    def test_unknown_engine_error(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ["@"])
+        with self.assertRaises(exceptions.UnknownEngineError):
+            grid.run(engine="nonexistent")
+
+    def test_table_engine_pauses_in_string_mode(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ['"ab",,@'])
+        with patch("sys.stdout", new_callable=StringIO) as out:
+            self.assertFalse(grid.run(engine="table", max_steps=2))
+            self.assertTrue(grid.string_mode)
+            self.assertEqual(grid.steps, 2)
+            self.assertTrue(grid.run(engine="table"))
+        self.assertEqual(out.getvalue(), "ba")
@@ -0,0 +1,63 @@
+import unittest
+from befunge import befunge_grid, exceptions, funge_space
+from befunge.streams import BufferSink
+
+PROGRAMS = [['v', '>"A"99*0p v', "", "  @       <" + " " * 150 + "#"],
+            ["<  @"],
+            ['"A"050-p@'],
+            ["v", "", "", "@"],
+            ['"!olleH">:#,_@']]
+
+
+def run_space(source, engine):
+    grid = befunge_grid.BefungeGrid(output=BufferSink(), legacy_put=False,
+                                    funge98=True)
+    grid.set_grid("s", source)
+    grid.run(engine=engine, max_steps=1000)
+    return grid
+
+
+class TestFungeSpace(unittest.TestCase):
+    def test_space_table_engine_is_same_as_classic(self):
+        for program in PROGRAMS:
+            with self.subTest(program=program):
+                table = run_space(program, "table")
+                classic = run_space(program, "classic")
+                self.assertEqual((table.stack, table.y, table.x, table.steps,
+                                  table.output.getvalue()),
+                                 (classic.stack, classic.y, classic.x,
+                                  classic.steps, classic.output.getvalue()))
+                self.assertEqual(table.grid, classic.grid)
+
+    def test_large_ragged_code(self):
+        grid = run_space(PROGRAMS[0], "table")
+        self.assertEqual((grid.code_height, grid.code_width), (4, 162))
+        self.assertEqual(grid.grid.char(0, 81), "A")
+
+    def test_put_outside_of_code_grows_box(self):
+        grid = run_space(PROGRAMS[2], "classic")
+        self.assertEqual((grid.grid.min_y, grid.code_height), (-5, 6))
+        self.assertEqual(grid.grid.char(-5, 0), "A")
+
+    def test_pages_are_allocated_lazily(self):
+        space = funge_space.FungeSpace(["@"])
+        space.put(10 ** 6, -10 ** 6, ord(" "))
+        self.assertEqual(len(space.pages), 1)
+        space.put(10 ** 6, -10 ** 6, ord("x"))
+        self.assertEqual(len(space.pages), 2)
+        self.assertEqual(space.get(10 ** 6, -10 ** 6), ord("x"))
+
+    def test_default_mode_keeps_bounds(self):
+        grid = befunge_grid.BefungeGrid()
+        with self.assertRaises(exceptions.CodeFileIsOutOfBoundsError):
+            grid.set_grid("s", ["@" * 100])
+
+    def test_space_rejects_playfield_tools(self):
+        grid = befunge_grid.BefungeGrid(funge98=True)
+        grid.set_grid("s", ["@"])
+        with self.assertRaises(exceptions.FungeSpaceIsNotSupportedError):
+            grid.run(profile=True)
+        with self.assertRaises(exceptions.FungeSpaceIsNotSupportedError):
+            grid.run(detect_loops=True)
+        with self.assertRaises(exceptions.FungeSpaceIsNotSupportedError):
+            grid.run(trace=True)
@@ -1,8 +1,20 @@
+import asyncio
 import unittest
 
 from io import StringIO
 from unittest.mock import patch
-from befunge import interactive_befunge_grid
+from befunge import befunge_grid, interactive_befunge_grid
+from befunge.exceptions import CodeFileIsNotRectangleError
+
+
+class CountingRows:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.reads = 0
+
+    def read_row(self):
+        self.reads += 1
+        return self.rows.pop(0) if self.rows else ""
 
 
 class TestIABefungeGrid(unittest.TestCase):
@@ -17,3 +29,49 @@ class TestIABefungeGrid(unittest.TestCase):
         grid = interactive_befunge_grid.IABefungeGrid()
         grid.run()
         assert grid.stack == [1, 2, 3, 4]
+
+    @patch('sys.stdin', StringIO("v@\n>^\n\n"))
+    def test_resume_paused_run(self):
+        grid = interactive_befunge_grid.IABefungeGrid()
+        self.assertFalse(grid.run(max_steps=3))
+        self.assertTrue(grid.run())
+        self.assertEqual((grid.y, grid.x), (0, 1))
+
+    def test_rows_from_iterator(self):
+        grid = interactive_befunge_grid.IABefungeGrid(
+            rows=iter([b"123v\n", b" @4<\n"]))
+        self.assertTrue(grid.run())
+        self.assertEqual(grid.stack, [1, 2, 3, 4])
+
+    def test_received_row_is_not_read_again(self):
+        rows = CountingRows(["v@", ">^", "  "])
+        grid = interactive_befunge_grid.IABefungeGrid(rows=rows)
+        self.assertTrue(grid.run())
+        self.assertEqual(rows.reads, 2)
+        self.assertFalse(grid.grid_complete)
+
+    def test_row_width_is_validated(self):
+        grid = interactive_befunge_grid.IABefungeGrid(rows=["12v", "1234"])
+        with self.assertRaises(CodeFileIsNotRectangleError):
+            grid.run()
+
+    def test_async_stream_rows(self):
+        async def session():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b"12v\n")
+            grid = interactive_befunge_grid.IABefungeGrid(rows=reader)
+            task = asyncio.ensure_future(grid.run_async(yield_every=1))
+            await asyncio.sleep(0.01)
+            self.assertFalse(task.done())
+            reader.feed_data(b"@3<\n")
+            reader.feed_eof()
+            return await task, grid.stack
+
+        self.assertEqual(asyncio.run(session()), (True, [1, 2, 3]))
+
+    def test_next_cells_grow_with_rows(self):
+        grid = interactive_befunge_grid.IABefungeGrid(rows=["abc"] * 4)
+        for height in range(1, 5):
+            grid.make_grid()
+            self.assertEqual([tuple(table) for table in grid.next_cells],
+                             list(befunge_grid.next_cell_tables(height, 3)))
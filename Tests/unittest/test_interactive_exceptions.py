@@ -24,7 +24,7 @@ class TestIAExceptions(unittest.TestCase):
                 interactive_exceptions.CompleteIAGridAlterationError
         ):
             grid = interactive_befunge_grid.IABefungeGrid()
-            with patch('sys.stdin', new=StringIO(">>v@\n<<<^\n\n")):
+            with patch('sys.stdin', new=StringIO("^\n@\n\n")):
                 grid.run()
             with patch('sys.stdin', new=StringIO("123@\n")):
                 grid.run()
@@ -34,7 +34,7 @@ class TestIAExceptions(unittest.TestCase):
                 interactive_exceptions.CompleteIAGridAlterationError
         ):
             grid = interactive_befunge_grid.IABefungeGrid()
-            with patch('sys.stdin', new=StringIO(">>v@\n<<<^\n\n")):
+            with patch('sys.stdin', new=StringIO("^\n@\n\n")):
                 grid.run()
             with patch('sys.stdin', new=StringIO("123@\n")):
                 grid.make_grid()
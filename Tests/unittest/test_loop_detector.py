@@ -0,0 +1,62 @@
+import unittest
+from unittest import mock
+from befunge import batch, befunge_grid, exceptions, loop_detector
+
+COUNTDOWN = ['"(":*>1\\-:#v_@', "     ^     <  "]
+
+
+class TestLoopDetector(unittest.TestCase):
+    def test_detect_infinite_loop(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", [">v", "^<"])
+        with self.assertRaises(exceptions.InfiniteLoopError) as error:
+            grid.run(detect_loops=True)
+        self.assertEqual(error.exception.cycle_length, 4)
+        self.assertEqual((error.exception.y, error.exception.x), (0, 1))
+
+    def test_detect_loop_in_resumed_run(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ["1v   ", " >$1v", "    <"])
+        self.assertFalse(grid.run(max_steps=3, detect_loops=True))
+        with self.assertRaises(exceptions.InfiniteLoopError):
+            grid.run(detect_loops=True)
+
+    def test_stopping_program_is_not_detected(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", COUNTDOWN)
+        self.assertTrue(grid.run(detect_loops=True))
+        reference = befunge_grid.BefungeGrid()
+        reference.set_grid("s", COUNTDOWN)
+        reference.run()
+        self.assertEqual((grid.stack, grid.steps),
+                         (reference.stack, reference.steps))
+
+    def test_bounded_cache(self):
+        detector = loop_detector.LoopDetector(cache_size=2)
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", [">1v", "^ <"])
+        self.assertFalse(grid.run(max_steps=100, detect_loops=detector))
+        self.assertLessEqual(len(detector.states), 2)
+
+    def test_deep_stack_is_not_copied(self):
+        detector = loop_detector.LoopDetector()
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ["1"])
+        self.assertFalse(grid.run(max_steps=2000, detect_loops=detector))
+        self.assertIsNone(detector.candidate)
+        self.assertTrue(all(isinstance(key, int) for key in detector.states))
+
+    @mock.patch.object(loop_detector, "FINGERPRINT_DEPTH", 0)
+    def test_same_fingerprint_is_confirmed(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", COUNTDOWN)
+        self.assertTrue(grid.run(detect_loops=True))
+        with self.assertRaises(exceptions.InfiniteLoopError) as error:
+            grid.set_grid("s", ["1>$v", " ^ <"])
+            grid.run(detect_loops=True)
+        self.assertEqual(error.exception.cycle_length, 6)
+
+    def test_batch_reports_infinite_loop(self):
+        result = batch.run_job(batch.Job("loop", ["1>$v", " ^ <"]),
+                               detect_loops=True)
+        self.assertEqual(result.reason, "infinite_loop")
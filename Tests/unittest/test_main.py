@@ -0,0 +1,44 @@
+import unittest
+from io import StringIO
+from unittest.mock import patch
+import befunge
+from befunge import exceptions
+from befunge.__main__ import main, parse_args
+
+HELLO = "Scripts/hello_world.txt"
+
+
+class TestMain(unittest.TestCase):
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_run_file(self, stdout):
+        self.assertEqual(main([HELLO]), 0)
+        self.assertEqual(stdout.getvalue(), "Hello World!")
+
+    @patch("sys.stdout", new_callable=StringIO)
+    @patch("sys.stdin", StringIO('"!ih",,,@\n'))
+    def test_run_stdin(self, stdout):
+        self.assertEqual(main(["-", "--engine", "block", "--seed", "1"]), 0)
+        self.assertEqual(stdout.getvalue(), "hi!")
+
+    @patch("sys.stderr", new_callable=StringIO)
+    def test_limit_is_reported(self, stderr):
+        self.assertEqual(main(["Scripts/loop.txt", "--max-steps", "100"]), 1)
+        self.assertIn("StepQuotaExceededError", stderr.getvalue())
+
+    @patch("sys.stdout", new_callable=StringIO)
+    @patch("sys.stderr", new_callable=StringIO)
+    def test_profile_heat_map(self, stderr, stdout):
+        self.assertEqual(main([HELLO, "--profile"]), 0)
+        self.assertIn("@", stderr.getvalue())
+
+    def test_single_file_options(self):
+        options = parse_args([HELLO])
+        self.assertEqual((options.source, options.engine, options.max_steps),
+                         (HELLO, "classic", None))
+        self.assertEqual(parse_args(["--stack-mode", "int32"]).source, "-")
+
+    def test_lazy_package_exceptions(self):
+        self.assertIs(befunge.QuotaExceededError,
+                      exceptions.QuotaExceededError)
+        with self.assertRaises(AttributeError):
+            befunge.NoSuchError
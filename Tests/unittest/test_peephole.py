@@ -0,0 +1,54 @@
+import contextlib
+import io
+import unittest
+from befunge import befunge_grid, block_compiler, peephole
+
+PROGRAMS = [['"!dlroW olleH",,,,,,,,,,,,55+,@'],
+            ["9:*.25*,@"],
+            ["12\\..3!.0!.@"],
+            ["91-.90/.90%.19`.@"],
+            ["123$$$$1.@"],
+            ["5$$$4:.@"],
+            ["1-1.@"],
+            ["55+5*,1234p@"]]
+
+
+def run_engine(string_list, engine):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", list(string_list))
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        grid.run(engine=engine)
+    return grid.stack, grid.grid, grid.y, grid.x, grid.steps, out.getvalue()
+
+
+def ops_of(row):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", [row])
+    return [op[:2] for op in peephole.optimize(
+        block_compiler.discover(grid, 0, 0, ">", False).ops)]
+
+
+class TestPeephole(unittest.TestCase):
+    def test_optimized_blocks_are_same_as_classic(self):
+        for program in PROGRAMS:
+            with self.subTest(program=program):
+                self.assertEqual(run_engine(program, "block"),
+                                 run_engine(program, "classic"))
+
+    def test_string_run_is_one_extend(self):
+        self.assertEqual(ops_of('"abc":@'), [("extend", (97, 98, 99, 99))])
+
+    def test_constant_output_is_one_write(self):
+        self.assertEqual(ops_of('"ih",,55+,9:*.@'), [("write", "hi\n81 ")])
+
+    def test_drops_are_fused(self):
+        self.assertEqual(ops_of("$$$1+@"),
+                         [("drop", 3), ("push", 1), ("op", "+")])
+
+    def test_invalid_character_is_not_folded(self):
+        self.assertEqual(ops_of("10-,@"), [("push", -1), ("op", ",")])
+
+    def test_fold_stays_in_32_bits(self):
+        self.assertEqual(ops_of("99*:*:*:*@"),
+                         [("extend", (43046721, 43046721)), ("op", "*")])
@@ -0,0 +1,36 @@
+import unittest
+from befunge import befunge_grid, playfield
+
+
+class TestPlayfield(unittest.TestCase):
+    def test_playfield_rows(self):
+        field = playfield.Playfield(["ab", "cd"])
+        self.assertEqual(field, ["ab", "cd"])
+        self.assertEqual(field[1], "cd")
+        self.assertEqual(field[-1], "cd")
+        self.assertEqual(len(field), 2)
+
+    def test_playfield_put_and_get(self):
+        field = playfield.Playfield(["ab", "cd"])
+        self.assertEqual(field.put(1, 0, 65), 2)
+        self.assertEqual(field.get(1, 0), 65)
+        self.assertEqual(field[1], "Ad")
+
+    def test_playfield_index_out_of_range(self):
+        field = playfield.Playfield(["ab", "cd"])
+        for y, x in [(2, 0), (0, 2), (-3, 0)]:
+            with self.subTest(y=y, x=x):
+                with self.assertRaises(IndexError):
+                    field.get(y, x)
+
+    def test_put_command_zero_based(self):
+        grid = befunge_grid.BefungeGrid(legacy_put=False)
+        grid.set_grid("s", ["67+5*10p@"])
+        grid.run()
+        self.assertEqual(grid.grid[0][1], "A")
+
+    def test_put_and_get_command_zero_based(self):
+        grid = befunge_grid.BefungeGrid(legacy_put=False)
+        grid.set_grid("s", ["67+5*31p31g@", "            "])
+        grid.run()
+        self.assertEqual(grid.stack, [65])
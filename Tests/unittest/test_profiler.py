@@ -0,0 +1,51 @@
+import json
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from befunge import befunge_grid, interactive_befunge_grid, profiler
+
+
+class TestProfiler(unittest.TestCase):
+    def test_profile_counters(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ['"ab"v', "@   >"])
+        grid.run(profile=True)
+        profile = grid.profile
+        self.assertEqual(profile.steps, 6)
+        self.assertEqual(profile.string_pushes, 2)
+        self.assertEqual(profile.direction_changes, 2)
+        self.assertEqual(profile.wraps, 1)
+
+    def test_profile_accumulates_over_runs(self):
+        profile = profiler.Profile()
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", [">v", "^<"])
+        grid.run(max_steps=10, profile=profile)
+        grid.run(max_steps=10, profile=profile)
+        self.assertEqual(profile.steps, 20)
+        self.assertEqual(profile.hot_cells(1), [(5, 0, 0)])
+
+    def test_profile_json_and_heat_map(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ["1:v", "@_<"])
+        grid.run(profile=True)
+        self.assertEqual(json.loads(grid.profile.to_json())["opcodes"]["_"],
+                         1)
+        self.assertEqual(grid.profile.heat_map(), "1:v | @@@\n@_< | @@@")
+
+    def test_profile_of_wide_interactive_grid(self):
+        row = ">" * 90 + "v"
+        grid = interactive_befunge_grid.IABefungeGrid()
+        with patch("sys.stdin", StringIO(f"{row}\n{'@' * 91}\n\n")):
+            self.assertTrue(grid.run(profile=True))
+        self.assertEqual(grid.profile.cell_count(0, 90), 1)
+        self.assertEqual(grid.profile.cell_count(1, 90), 1)
+
+    def test_profile_rejects_grid_of_other_width(self):
+        profile = profiler.Profile()
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ["@"])
+        grid.run(profile=profile)
+        grid.set_grid("s", ["@ "])
+        with self.assertRaises(ValueError):
+            grid.run(profile=profile)
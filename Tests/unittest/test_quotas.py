@@ -0,0 +1,90 @@
+import time
+import unittest
+from befunge import befunge_grid, streams
+from befunge.exceptions import *
+from befunge.quotas import Quotas
+
+COUNTDOWN = ['"d">1\\-:v ', "   ^    _@"]
+DOUBLING = ["1>:+v", " ^  <"]
+SQUARING = ["2v  ", " >:*"]
+
+
+def make_grid(source):
+    grid = befunge_grid.BefungeGrid(output=streams.BufferSink())
+    grid.set_grid("s", source)
+    return grid
+
+
+class TestQuotas(unittest.TestCase):
+    def test_run_within_quotas(self):
+        for engine in ("classic", "table", "block"):
+            with self.subTest(engine=engine):
+                reference = make_grid(COUNTDOWN)
+                reference.run(engine=engine)
+                grid = make_grid(COUNTDOWN)
+                quotas = Quotas(max_steps=10000, max_stack=10, max_output=0,
+                                max_int=100, time_limit=10, check_every=7)
+                self.assertTrue(grid.run(engine=engine, quotas=quotas))
+                self.assertEqual((grid.steps, grid.stack),
+                                 (reference.steps, reference.stack))
+
+    def test_step_quota_is_exact(self):
+        for engine in ("classic", "table", "block"):
+            with self.subTest(engine=engine):
+                grid = make_grid(["1:+v", "^  <"])
+                with self.assertRaises(StepQuotaExceededError):
+                    grid.run(engine=engine, quotas=Quotas(max_steps=1000))
+                self.assertEqual(grid.steps, 1000)
+                self.assertTrue(grid.paused)
+
+    def test_quota_errors(self):
+        cases = [
+            (["1"], Quotas(max_stack=100, check_every=64),
+             StackQuotaExceededError),
+            (["1."], Quotas(max_output=50, check_every=64),
+             OutputQuotaExceededError),
+            (DOUBLING, Quotas(max_int=10 ** 6, check_every=64),
+             IntegerQuotaExceededError),
+            ([">v", "^<"], Quotas(time_limit=0.01), TimeQuotaExceededError),
+        ]
+        for source, quotas, error in cases:
+            with self.subTest(error=error.__name__):
+                grid = make_grid(source)
+                with self.assertRaises(error) as context:
+                    grid.run(engine="table", quotas=quotas)
+                self.assertIsInstance(context.exception, QuotaExceededError)
+
+    def test_max_steps_pauses_before_quota(self):
+        grid = make_grid(DOUBLING)
+        self.assertFalse(grid.run(max_steps=100,
+                                  quotas=Quotas(max_steps=1000)))
+        self.assertEqual(grid.steps, 100)
+
+    def test_continue_with_larger_quota(self):
+        grid = make_grid(COUNTDOWN)
+        with self.assertRaises(StepQuotaExceededError):
+            grid.run(quotas=Quotas(max_steps=10))
+        self.assertTrue(grid.run(quotas=Quotas(max_steps=10000)))
+        self.assertEqual(grid.stack, [0])
+
+
+    def test_integer_quota_stops_the_command(self):
+        for engine in ("classic", "table", "block"):
+            with self.subTest(engine=engine):
+                grid = make_grid(SQUARING)
+                with self.assertRaises(IntegerQuotaExceededError):
+                    grid.run(engine=engine,
+                             quotas=Quotas(max_int=1000, time_limit=1))
+                self.assertEqual((grid.steps, grid.y, grid.x, grid.stack),
+                                 (16, 1, 3, []))
+                self.assertFalse(grid.paused)
+                self.assertIs(type(grid.stack), list)
+
+    def test_time_quota_stops_growing_numbers(self):
+        for engine in ("classic", "table", "block"):
+            with self.subTest(engine=engine):
+                grid = make_grid(SQUARING)
+                start = time.monotonic()
+                with self.assertRaises(TimeQuotaExceededError):
+                    grid.run(engine=engine, quotas=Quotas(time_limit=0.2))
+                self.assertLess(time.monotonic() - start, 5)
@@ -0,0 +1,42 @@
+import unittest
+from befunge import befunge_grid, rng, trace
+from befunge.streams import BufferSink
+
+WALK = ["?1?", "2?3", "?4?"]
+
+
+def walk(engine, seed, max_steps=2000, **kwargs):
+    grid = befunge_grid.BefungeGrid(output=BufferSink(), seed=seed)
+    grid.set_grid("s", WALK)
+    grid.run(engine=engine, max_steps=max_steps, **kwargs)
+    return grid
+
+
+class TestRng(unittest.TestCase):
+    def test_seed_repeats_run(self):
+        for engine in ("classic", "table", "block"):
+            with self.subTest(engine=engine):
+                self.assertEqual(walk(engine, 7).stack,
+                                 walk("classic", 7).stack)
+                self.assertNotEqual(walk(engine, 7).stack,
+                                    walk(engine, 8).stack)
+
+    def test_restore_after_draws(self):
+        generator = rng.DirectionRandom(5)
+        directions = [generator.direction() for _ in range(3000)]
+        for draws in (0, rng.BATCH_DRAWS, 2500):
+            restored = rng.DirectionRandom.restore(5, draws)
+            self.assertEqual([restored.direction() for _ in range(100)],
+                             directions[draws:draws + 100])
+
+    def test_snapshot_keeps_generator(self):
+        reference = walk("table", 3, 1500)
+        grid = walk("table", 3, 700)
+        restored = befunge_grid.BefungeGrid(output=BufferSink())
+        restored.restore(grid.snapshot())
+        restored.run(engine="table", max_steps=800)
+        self.assertEqual(restored.stack, reference.stack)
+
+    def test_trace_records_seed(self):
+        grid = walk("table", 11, 50, trace=True)
+        self.assertEqual(trace.read_header(grid.trace.dumps())[0], 11)
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch
+from befunge import befunge_grid, streams
+from befunge.befunge_grid import RunStatus
+from befunge.interactive_befunge_grid import IABefungeGrid
+
+COUNTDOWN = ['"d">1\\-:v ', "   ^    _@"]
+
+
+def make_grid(source, input_source=None):
+    grid = befunge_grid.BefungeGrid(output=streams.BufferSink(),
+                                    input_source=input_source)
+    grid.set_grid("s", source)
+    return grid
+
+
+class TestRunStatus(unittest.TestCase):
+    def test_round_robin_is_same_as_full_run(self):
+        for engine in ("classic", "table", "block"):
+            with self.subTest(engine=engine):
+                reference = make_grid(COUNTDOWN)
+                reference.run(engine=engine)
+                grids = [make_grid(COUNTDOWN) for _ in range(3)]
+                running = list(grids)
+                while running:
+                    running = [grid for grid in running
+                               if grid.run_for(37, engine).status !=
+                               RunStatus.HALTED]
+                for grid in grids:
+                    self.assertEqual((grid.steps, grid.stack),
+                                     (reference.steps, reference.stack))
+
+    def test_needs_input_resumes(self):
+        source = streams.AsyncSource()
+        grid = make_grid(["&&+.@"], source)
+        self.assertEqual(grid.run_for(100),
+                         RunStatus(RunStatus.NEEDS_INPUT, 0))
+        source.feed("4\n5\n")
+        self.assertEqual(grid.run_for(100), RunStatus(RunStatus.HALTED, 4))
+        self.assertEqual(grid.output.getvalue(), "9 ")
+
+    def test_budget_exhausted_and_step(self):
+        grid = make_grid(["1:+v", "^  <"])
+        self.assertEqual(grid.run_for(10).status,
+                         RunStatus.BUDGET_EXHAUSTED)
+        self.assertEqual(grid.step(),
+                         RunStatus(RunStatus.BUDGET_EXHAUSTED, 1))
+
+    def test_error_status(self):
+        status = make_grid(["1Z"]).run_for(10)
+        self.assertEqual(status.status, RunStatus.ERROR)
+        self.assertEqual(status.error, "Invalid operand [ Z ] at 1 row, "
+                                       "2 column")
+        status = make_grid(["|"]).run_for(10)
+        self.assertTrue(
+            status.error.startswith("NotEnoughElementsInStackError"))
+
+    @patch("builtins.input", side_effect=["12+@", ""])
+    def test_ia_grid_run_for(self, _):
+        grid = IABefungeGrid(output=streams.BufferSink())
+        self.assertEqual(grid.run_for(2).status, RunStatus.BUDGET_EXHAUSTED)
+        self.assertEqual(grid.run_for(2), RunStatus(RunStatus.HALTED, 1))
@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from pathlib import Path
+from befunge import batch, befunge_grid, exceptions, snapshot
+from befunge.streams import BufferSink, BytesSource
+
+COUNTDOWN = ['"(":*>1\\-:#v_@', "     ^     <  "]
+
+
+def make_grid(source, input_data=""):
+    grid = befunge_grid.BefungeGrid(output=BufferSink(),
+                                    input_source=BytesSource(input_data))
+    grid.set_grid("s", source)
+    return grid
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_restored_run_is_same_as_full_run(self):
+        reference = make_grid(COUNTDOWN)
+        reference.run()
+        grid = make_grid(COUNTDOWN)
+        grid.run(max_steps=500)
+        restored = befunge_grid.BefungeGrid(output=BufferSink())
+        restored.restore(grid.snapshot())
+        self.assertTrue(restored.run())
+        self.assertEqual((restored.stack, restored.steps),
+                         (reference.stack, reference.steps))
+
+    def test_snapshot_keeps_state(self):
+        grid = make_grid(['"a"v', "  ~<"], "xyz")
+        grid.stack = [-300, 2 ** 70]
+        grid.run(max_steps=7)
+        restored = befunge_grid.BefungeGrid(input_source=BytesSource("xyz"))
+        restored.restore(grid.snapshot())
+        self.assertEqual(restored.grid, grid.grid)
+        self.assertEqual(restored.stack, grid.stack)
+        self.assertEqual((restored.y, restored.x, restored.move_direction),
+                         (grid.y, grid.x, grid.move_direction))
+        self.assertEqual(restored.input_source.read_char(), ord("y"))
+
+    def test_snapshot_of_wide_cells(self):
+        grid = make_grid(["88*:*8*8*00p@"])
+        grid.legacy_put = False
+        grid.run()
+        restored = befunge_grid.BefungeGrid()
+        restored.restore(grid.snapshot())
+        self.assertEqual(restored.grid.cell(0, 0), 8 ** 6)
+
+    def test_zigzag(self):
+        for value in (0, -1, 1, -2 ** 40):
+            self.assertEqual(snapshot.unzigzag(snapshot.zigzag(value)),
+                             value)
+
+    def test_wrong_snapshot(self):
+        grid = befunge_grid.BefungeGrid()
+        with self.assertRaises(exceptions.WrongSnapshotError):
+            grid.restore(b"nothing")
+        with self.assertRaises(exceptions.WrongSnapshotError):
+            grid.restore(make_grid(["@"]).snapshot()[:-2])
+        data = bytearray(make_grid(["@"]).snapshot())
+        data[7] = 1
+        with self.assertRaises(exceptions.WrongSnapshotError):
+            grid.restore(bytes(data))
+
+    def test_funge98_grid_has_no_snapshot(self):
+        grid = befunge_grid.BefungeGrid(funge98=True)
+        grid.set_grid("s", ["@"])
+        with self.assertRaises(exceptions.WrongSnapshotError):
+            grid.snapshot()
+        with self.assertRaises(exceptions.WrongSnapshotError):
+            grid.restore(make_grid(["@"]).snapshot())
+
+    def test_batch_continues_from_checkpoint(self):
+        program = ['"(":*>1\\-:#v_@', "     ^     <. "]
+        job = batch.Job("countdown", program)
+        with tempfile.TemporaryDirectory() as directory:
+            grid = befunge_grid.BefungeGrid(output=BufferSink())
+            grid.set_grid("s", program)
+            grid.run(max_steps=3000)
+            grid.output.write("saved ")
+            batch.save_checkpoint(grid,
+                                  Path(directory) / "countdown.checkpoint")
+            result = batch.run_job(job, checkpoint_dir=directory)
+            self.assertEqual(result.reason, "halted")
+            self.assertTrue(result.output.startswith("saved "))
+            self.assertEqual(result.steps, batch.run_job(job).steps)
+            self.assertFalse(list(Path(directory).iterdir()))
@@ -0,0 +1,82 @@
+import unittest
+from io import BytesIO, StringIO
+from unittest.mock import patch
+from befunge import befunge_grid, exceptions, streams
+
+
+class TestStreams(unittest.TestCase):
+    def test_buffer_sink(self):
+        sink = streams.BufferSink()
+        grid = befunge_grid.BefungeGrid(output=sink)
+        grid.set_grid("s", ['"!iH">:#,_1.@'])
+        grid.run()
+        self.assertEqual(sink.getvalue(), "Hi!1 ")
+
+    def test_stream_sink_binary_flush_size(self):
+        stream = BytesIO()
+        sink = streams.StreamSink(stream, flush_size=2)
+        sink.write("a")
+        self.assertEqual(stream.getvalue(), b"")
+        sink.write("é")
+        self.assertEqual(stream.getvalue(), "aé".encode("utf-8"))
+
+    def test_flush_on_error(self):
+        sink = streams.BufferSink()
+        grid = befunge_grid.BefungeGrid(output=sink)
+        grid.set_grid("s", ["1.|"])
+        with self.assertRaises(exceptions.NotEnoughElementsInStackError):
+            grid.run()
+        self.assertEqual(sink.chunks, ["1 "])
+
+    def test_debug_output_interleaving(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ["1.@"])
+        with patch("sys.stdout", new_callable=StringIO) as out:
+            grid.run(True)
+        self.assertEqual(out.getvalue().split("\n")[2],
+                         "1 evaluate command [ @ ] at Y: 1 X: 3,"
+                         " string mode: False, stack: [  ]")
+
+    def test_cat_program_from_bytes_source(self):
+        sink = streams.BufferSink()
+        grid = befunge_grid.BefungeGrid(
+            output=sink, input_source=streams.BytesSource(b"abc\nde\n"))
+        grid.set_grid("f", "Scripts/cat.txt")
+        grid.run()
+        self.assertEqual(sink.getvalue(), "abc\nde\n")
+
+    def test_iterator_source_numbers(self):
+        source = streams.IteratorSource(["12 -", "3\n4"])
+        self.assertEqual([source.read_int() for _ in range(4)],
+                         [12, -3, 4, None])
+
+    @patch('sys.stdin', StringIO("ab\n"))
+    def test_console_source_reads_whole_line(self):
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ["~~~@"])
+        grid.run()
+        self.assertEqual(grid.stack, [97, 98, 10])
+
+    def test_end_of_input(self):
+        for eof, expected in [("push", [-1]), ("reflect", [])]:
+            with self.subTest(eof=eof):
+                grid = befunge_grid.BefungeGrid(
+                    input_source=streams.BytesSource(""), eof=eof)
+                grid.set_grid("s", ["&@@"])
+                grid.run()
+                self.assertEqual(grid.stack, expected)
+
+    def test_wrong_eof_mode_error(self):
+        with self.assertRaises(exceptions.WrongEofModeError):
+            befunge_grid.BefungeGrid(eof="z")
+
+    def test_read_int_skips_non_digits(self):
+        test_cases = [("abc", [None]),
+                      ("12abc", [12, None]),
+                      ("-", [None]),
+                      ("x-5 - 7", [-5, 7, None])]
+        for data, expected in test_cases:
+            with self.subTest(data=data):
+                source = streams.BytesSource(data)
+                self.assertEqual([source.read_int() for _ in expected],
+                                 expected)
@@ -0,0 +1,52 @@
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from befunge import befunge_grid, trace
+from befunge.streams import BufferSink
+
+PROGRAMS = [['"!olleH">:#,_@'],
+            ["+-*/%!`:\\$1:2\\1$@"],
+            ["67+5*11p@"],
+            ["21g@", "  A "],
+            ["1|", " @", " @"]]
+
+
+def make_grid(source):
+    grid = befunge_grid.BefungeGrid(output=BufferSink())
+    grid.set_grid("s", source)
+    return grid
+
+
+class TestTrace(unittest.TestCase):
+    def test_rendered_trace_is_same_as_debug(self):
+        for program in PROGRAMS:
+            with self.subTest(program=program):
+                out = io.StringIO()
+                with contextlib.redirect_stdout(out):
+                    make_grid(program).run(debug=True)
+                grid = make_grid(program)
+                grid.run(trace=True)
+                self.assertEqual(list(trace.render(grid.trace.dumps())),
+                                 out.getvalue().splitlines())
+
+    def test_ring_buffer_keeps_last_records(self):
+        grid = make_grid(["1>:v", " ^ <"])
+        grid.run(max_steps=100, trace=trace.TraceRecorder(capacity=8))
+        records = list(trace.read_records(grid.trace.dumps()))
+        self.assertEqual([record[0] for record in records],
+                         list(range(92, 100)))
+
+    def test_trace_file_and_decoder(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "hello.trace"
+            grid = make_grid(["2 3+.@"])
+            with open(path, "wb") as file:
+                grid.run(trace=trace.TraceRecorder(file=file))
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                self.assertEqual(trace.main([str(path)]), 0)
+        self.assertEqual(out.getvalue().splitlines()[4],
+                         "evaluate command [ . ] at Y: 1 X: 5,"
+                         " string mode: False, stack: [ 5 ]")
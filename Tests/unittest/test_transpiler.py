@@ -0,0 +1,74 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import befunge
+from befunge import befunge_grid, exceptions, transpiler
+from befunge.streams import BufferSink, BytesSource
+
+INPUT = "12 -5\nab\n"
+PROGRAMS = [["123...@"],
+            ['"!olleH">:#,_@'],
+            ["23-26/49%1!0!12`21`....@"],
+            ["0v ", "@_@"],
+            ["v          <", '>5. "@"42p ^'],
+            ["&&+.@"],
+            ["~:1+!#@_,"],
+            ["21g.@", "  A  "],
+            ["x"],
+            ['"(":*>1\\-:#v_@', "     ^     <  "]]
+
+
+def run_module(source):
+    grid = befunge_grid.BefungeGrid()
+    grid.set_grid("s", source)
+    namespace = {"__name__": "generated"}
+    exec(befunge.compile(grid), namespace)
+    out = io.StringIO()
+    with patch("sys.stdin", io.StringIO(INPUT)), \
+            contextlib.redirect_stdout(out):
+        namespace["main"]()
+    return out.getvalue(), namespace["stack"]
+
+
+class TestTranspiler(unittest.TestCase):
+    def test_module_is_same_as_grid(self):
+        for program in PROGRAMS:
+            with self.subTest(program=program):
+                grid = befunge_grid.BefungeGrid(
+                    output=BufferSink(), input_source=BytesSource(INPUT))
+                grid.set_grid("s", program)
+                grid.run()
+                self.assertEqual(run_module(program),
+                                 (grid.output.getvalue(), grid.stack))
+
+    def test_branch_on_empty_stack_raises(self):
+        error = exceptions.NotEnoughElementsInStackError
+        with self.assertRaises(error) as module_error:
+            run_module(["|@"])
+        grid = befunge_grid.BefungeGrid()
+        grid.set_grid("s", ["|@"])
+        with self.assertRaises(error) as grid_error:
+            grid.run()
+        self.assertEqual(str(module_error.exception),
+                         str(grid_error.exception))
+
+    def test_transpiler_cli(self):
+        with tempfile.TemporaryDirectory() as directory:
+            module = Path(directory) / "hello.py"
+            self.assertEqual(transpiler.main(["Scripts/hello_world.txt",
+                                              "-o", str(module)]), 0)
+            result = subprocess.run([sys.executable, str(module)],
+                                    capture_output=True, text=True,
+                                    timeout=60,
+                                    env={**os.environ,
+                                         "PYTHONPATH": os.getcwd()})
+        grid = befunge_grid.BefungeGrid(output=BufferSink())
+        grid.set_grid("f", "Scripts/hello_world.txt")
+        grid.run()
+        self.assertEqual(result.stdout, grid.output.getvalue())
@@ -0,0 +1,78 @@
+import unittest
+from befunge import befunge_grid, streams
+from befunge.exceptions import WrongStackModeError
+from befunge.typed_stack import TypedStack
+
+POWER = ["99*:*:*:*:*.@"]
+
+
+def run(source, engine="classic", **options):
+    grid = befunge_grid.BefungeGrid(output=streams.BufferSink(), **options)
+    grid.set_grid("s", source)
+    grid.run(engine=engine)
+    return grid
+
+
+class TestTypedStack(unittest.TestCase):
+    def test_wrap_around(self):
+        cases = [("list", "3433683820292512484657849089281 "),
+                 ("int32", "2038349057 "),
+                 ("int64", "8733086111712066817 ")]
+        for engine in ("classic", "table", "block"):
+            for mode, text in cases:
+                with self.subTest(engine=engine, mode=mode):
+                    self.assertEqual(run(POWER, engine, stack_mode=mode)
+                                     .output.getvalue(), text)
+
+    def test_implicit_zeros(self):
+        for engine in ("classic", "table", "block"):
+            with self.subTest(engine=engine):
+                self.assertEqual(run(["5+.@"], engine, stack_mode="int32")
+                                 .output.getvalue(), "5 ")
+                self.assertEqual(run(["5\\@"], engine,
+                                     stack_mode="int32").stack, [5, 0])
+                self.assertEqual(run([".@"], engine, stack_mode="int64")
+                                 .output.getvalue(), "0 ")
+                self.assertEqual(run(["|@", "@ "], engine,
+                                     stack_mode="int64").y, 1)
+
+    def test_capacity_grows(self):
+        stack = TypedStack(32, capacity=2)
+        stack.extend(range(10))
+        self.assertEqual(len(stack), 10)
+        self.assertEqual(stack.pop(), 9)
+        del stack[-3:]
+        self.assertEqual(stack, [0, 1, 2, 3, 4, 5])
+        self.assertEqual(stack[-1], 5)
+        stack.append(2 ** 31)
+        self.assertEqual(stack[-1], -2 ** 31)
+        stack.clear()
+        self.assertEqual(stack.pop(), 0)
+        with self.assertRaises(IndexError):
+            stack[-1]
+
+    def test_slices_are_same_as_list(self):
+        stack = TypedStack(64, capacity=16, values=range(10))
+        del stack[-4:]
+        values = list(range(6))
+        for index in (slice(None), slice(-3, None), slice(2, 20),
+                      slice(None, None, -1), slice(4, None, -2),
+                      slice(-1, 0)):
+            self.assertEqual(stack[index], values[index])
+        self.assertEqual(TypedStack(64)[::-1], [])
+
+    def test_snapshot_keeps_stack_mode(self):
+        grid = befunge_grid.BefungeGrid(output=streams.BufferSink(),
+                                        stack_mode="int32")
+        grid.set_grid("s", ["123@"])
+        grid.run(max_steps=2)
+        restored = befunge_grid.BefungeGrid(output=streams.BufferSink(),
+                                            stack_mode="int32")
+        restored.restore(grid.snapshot())
+        self.assertIsInstance(restored.stack, TypedStack)
+        self.assertTrue(restored.run())
+        self.assertEqual(restored.stack, [1, 2, 3])
+
+    def test_wrong_stack_mode(self):
+        with self.assertRaises(WrongStackModeError):
+            befunge_grid.BefungeGrid(stack_mode="int16")
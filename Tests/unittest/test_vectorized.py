@@ -0,0 +1,44 @@
+import importlib.util
+import unittest
+from befunge import befunge_grid
+from befunge.streams import BufferSink, BytesSource
+
+PROGRAMS = [(["&:*.@"], ["3", "-4", "99999999999", "x"]),
+            (["&>:1\\-:v", " ^   _$@"], ["5", "0", "-3"]),
+            (["&:v", "@,_"], ["65", "0", "1114112", "-1"]),
+            (["&&&p00g.10g.@"], ["66 1 1", "70 9 9", "2000000 1 1", "1"]),
+            (["~:1+!#@_,"], ["hello", "", "wörld"]),
+            (["&|", " ."], ["0", "1"])]
+
+
+def run_separately(source, input_data, max_steps):
+    grid = befunge_grid.BefungeGrid(output=BufferSink(),
+                                    input_source=BytesSource(input_data))
+    grid.set_grid("s", source)
+    error = None
+    try:
+        if grid.run(engine="table", max_steps=max_steps):
+            reason = "halted" if grid.grid.char(grid.y, grid.x) == "@" \
+                else "invalid_operand"
+        else:
+            reason = "step_limit"
+    except Exception as error_object:
+        reason = "error"
+        error = f"{type(error_object).__name__}: {error_object}"
+    return reason, grid.output.getvalue(), grid.stack, grid.steps, error
+
+
+@unittest.skipIf(importlib.util.find_spec("numpy") is None,
+                 "numpy is not installed")
+class TestVectorized(unittest.TestCase):
+    def test_lockstep_is_same_as_separate_runs(self):
+        from befunge import vectorized
+        for source, inputs in PROGRAMS:
+            for max_steps in (7, 1000):
+                with self.subTest(source=source, max_steps=max_steps):
+                    results = vectorized.run_many(source, inputs, max_steps)
+                    self.assertEqual(
+                        [(result.reason, result.output, result.stack,
+                          result.steps, result.error) for result in results],
+                        [run_separately(source, data, max_steps)
+                         for data in inputs])
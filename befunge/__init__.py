@@ -1 +1,21 @@
-from befunge.exceptions import *
+__version__ = "1.1.0"
+
+
+def __getattr__(name):
+    """Function for the exceptions of befunge.exceptions, which are
+    imported on the first use instead of the package import"""
+    from importlib import import_module
+    exceptions = import_module("befunge.exceptions")
+    try:
+        return getattr(exceptions, name)
+    except AttributeError:
+        raise AttributeError(f"module 'befunge' has no attribute "
+                             f"'{name}'") from None
+
+
+def compile(grid):
+    """Function for transpiling the grid loaded by set_grid
+    into the source of a Python module,
+    see befunge.transpiler"""
+    from befunge.transpiler import transpile
+    return transpile(grid)
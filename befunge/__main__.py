@@ -0,0 +1,142 @@
+"""Command line interpreter of befunge programs.
+Program is read from the file or from stdin for '-', input of '~'
+and '&' is read from --input file or from stdin.
+Only the modules needed by the chosen options are imported,
+so running a plain program doesn't load the profiler, compilers
+or NumPy, and the single file argument is taken without argparse,
+which imports more than the interpreter itself.
+Exit code is 0 for the program stopped at '@',
+1 for invalid operand or error and 2 for wrong arguments.
+
+Usage: python -m befunge [SOURCE] [--engine {classic,table,block}]
+                         [--seed SEED] [--zero-based-put]
+                         [--eof {push,reflect}] [--funge98]
+                         [--stack-mode {list,int32,int64}] [--input FILE]
+                         [--max-steps N] [--max-stack N] [--max-output N]
+                         [--max-int N] [--time-limit SECONDS]
+                         [--profile | --trace FILE] [--debug]"""
+
+import sys
+from befunge.befunge_grid import BefungeGrid, EOF_MODES, STACK_MODES
+
+ENGINES = ("classic", "table", "block")
+LIMITS = ("max_steps", "max_stack", "max_output", "max_int", "time_limit")
+
+
+class Options:
+    """Class for the options of the run, attributes are the defaults"""
+    source = "-"
+    engine = "classic"
+    seed = None
+    zero_based_put = False
+    eof = "push"
+    funge98 = False
+    stack_mode = "list"
+    input = None
+    max_steps = None
+    max_stack = None
+    max_output = None
+    max_int = None
+    time_limit = None
+    profile = False
+    trace = None
+    debug = False
+
+
+def _parser():
+    """Inner function for the argument parser"""
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m befunge",
+                                     description="Run befunge program")
+    parser.add_argument("source", nargs="?", default=Options.source,
+                        help="befunge code file, stdin for '-'")
+    parser.add_argument("--engine", choices=ENGINES)
+    parser.add_argument("--seed", type=int,
+                        help="seed of '?' directions, random by default")
+    parser.add_argument("--zero-based-put", action="store_true")
+    parser.add_argument("--eof", choices=EOF_MODES)
+    parser.add_argument("--funge98", action="store_true",
+                        help="unbounded Funge-Space of any code shape")
+    parser.add_argument("--stack-mode", choices=STACK_MODES)
+    parser.add_argument("--input", metavar="FILE",
+                        help="file for '~' and '&', stdin by default")
+    limits = parser.add_argument_group("limits")
+    limits.add_argument("--max-steps", type=int, metavar="N")
+    limits.add_argument("--max-stack", type=int, metavar="N")
+    limits.add_argument("--max-output", type=int, metavar="N",
+                        help="characters of output")
+    limits.add_argument("--max-int", type=int, metavar="N",
+                        help="magnitude of numbers on the stack")
+    limits.add_argument("--time-limit", type=float, metavar="SECONDS",
+                        help="wall-clock seconds")
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument("--profile", action="store_true",
+                           help="print the heat map to stderr")
+    recording.add_argument("--trace", metavar="FILE",
+                           help="binary trace file, see befunge.trace")
+    parser.add_argument("--debug", action="store_true")
+    return parser
+
+
+def _load(grid, source):
+    """Inner function for setting the grid from the file or stdin"""
+    if source != "-":
+        grid.set_grid("f", source)
+        return
+    rows = sys.stdin.read().splitlines()
+    grid.set_grid("s", rows or [""])
+
+
+def parse_args(argv=None):
+    """Function for the options of the command line"""
+    argv = sys.argv[1:] if argv is None else argv
+    options = Options()
+    if len(argv) == 1 and not argv[0].startswith("-"):
+        options.source = argv[0]
+        return options
+    return _parser().parse_args(argv, options)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    input_source = None
+    input_file = None
+    if args.input is not None:
+        from befunge.streams import FileSource
+        input_file = open(args.input, "rb")
+        input_source = FileSource(input_file)
+    grid = BefungeGrid(legacy_put=not args.zero_based_put,
+                       input_source=input_source, eof=args.eof,
+                       funge98=args.funge98, seed=args.seed,
+                       stack_mode=args.stack_mode)
+    quotas = None
+    if any(getattr(args, name) is not None for name in LIMITS):
+        from befunge.quotas import Quotas
+        quotas = Quotas(**{name: getattr(args, name) for name in LIMITS})
+    trace = None
+    trace_file = None
+    if args.trace is not None:
+        from befunge.trace import TraceRecorder
+        trace_file = open(args.trace, "wb")
+        trace = TraceRecorder(file=trace_file)
+    try:
+        _load(grid, args.source)
+        grid.run(debug=args.debug, engine=args.engine,
+                 profile=True if args.profile else None, trace=trace,
+                 quotas=quotas)
+    except Exception as error_object:
+        sys.stdout.flush()
+        message = getattr(error_object, "message", str(error_object))
+        sys.stderr.write(f"{type(error_object).__name__}: {message}\n")
+        return 1
+    finally:
+        for file in (input_file, trace_file):
+            if file is not None:
+                file.close()
+        if args.profile and grid.profile is not None:
+            sys.stderr.write(grid.profile.heat_map() + "\n")
+    return 0 if grid.grid.char(grid.y, grid.x) == "@" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Static analysis of befunge grid.
+Finds every (y, x, direction, string mode) state, which the program
+can reach from the start, whether 'p' can be executed and which cells
+it can write to. Program is static, when no reachable cell can be
+changed, so engines can skip checks for self-modifying code."""
+
+STEPS = {">": (0, 1), "v": (1, 0), "<": (0, -1), "^": (-1, 0)}
+REVERSE_DIRECTIONS = {">": "<", "<": ">", "^": "v", "v": "^"}
+DIGITS = "0123456789"
+
+
+class Analysis:
+    """Class for the summary of the analysis.
+    writable is the set of (y, x) cells, that 'p' can write to,
+    or None if it can write anywhere."""
+
+    def __init__(self, states, put_states, writable):
+        self.states = states
+        self.cells = {(y, x) for y, x, _, _ in states}
+        self.put_states = put_states
+        self.put_reachable = bool(put_states)
+        self.writable = writable
+        if not put_states:
+            self.is_static = True
+        elif writable is None:
+            self.is_static = False
+        else:
+            self.is_static = not writable & self.cells
+
+    def to_dict(self):
+        """Method for the summary as a JSON-compatible dict"""
+        return {"states": len(self.states), "cells": len(self.cells),
+                "put_reachable": self.put_reachable,
+                "writable": None if self.writable is None
+                else sorted(self.writable),
+                "is_static": self.is_static}
+
+
+def _successors(grid, y, x, direction, string_mode):
+    """Inner function for states, that can follow the state"""
+    height = grid.code_height
+    width = grid.code_width
+    command = grid.grid.char(y, x)
+    if string_mode:
+        if command == '"':
+            string_mode = False
+        directions = direction
+    elif command in STEPS:
+        directions = command
+    elif command == "?":
+        directions = ">v<^"
+    elif command == "|":
+        directions = "v^"
+    elif command == "_":
+        directions = "><"
+    elif command == "@" or not (command in DIGITS or
+                                command in ' "#+-*/%!`:\\$.,~&pg'):
+        return
+    elif command in "~&" and grid.eof == "reflect":
+        directions = direction + REVERSE_DIRECTIONS[direction]
+    else:
+        directions = direction
+        if command == '"':
+            string_mode = True
+    for direction in directions:
+        step_y, step_x = STEPS[direction]
+        distance = 2 if command == "#" and not string_mode else 1
+        yield ((y + step_y * distance) % height,
+               (x + step_x * distance) % width, direction, string_mode)
+
+
+def _pushes(grid, state, count, entries, predecessors):
+    """Inner function for the numbers pushed by the count cells
+    right before the state on every path into it.
+    Numbers are known only for the digits, which aren't entry states,
+    because the stack of an entry state can be anything.
+    Returns the set of tuples from the oldest number
+    or None if any path doesn't push known numbers."""
+    if not count:
+        return {()}
+    if state in entries or not predecessors.get(state):
+        return None
+    pushes = set()
+    for previous in predecessors[state]:
+        y, x, _, string_mode = previous
+        command = grid.grid.char(y, x)
+        if string_mode or command not in DIGITS:
+            return None
+        before = _pushes(grid, previous, count - 1, entries, predecessors)
+        if before is None:
+            return None
+        pushes |= {numbers + (int(command),) for numbers in before}
+    return pushes
+
+
+def _put_targets(grid, state, entries, predecessors):
+    """Inner function for cells written by 'p' of the state.
+    Coordinates are known, when every path into 'p' pushes two digits
+    right before it. Legacy 'p' writes the first cell on errors,
+    unless the value is a digit pushed before them too.
+    Returns the set of (y, x) or None if any cell can be written."""
+    pushes = _pushes(grid, state, 2, entries, predecessors)
+    if pushes is None:
+        return None
+    targets = set()
+    if grid.legacy_put and \
+            _pushes(grid, state, 3, entries, predecessors) is None:
+        targets.add((0, 0))
+    for target_x, target_y in pushes:
+        if grid.legacy_put:
+            target_y -= 1
+            target_x -= 1
+        if -grid.code_height <= target_y < grid.code_height and \
+                -grid.code_width <= target_x < grid.code_width:
+            targets.add((target_y % grid.code_height,
+                         target_x % grid.code_width))
+        elif grid.legacy_put:
+            targets.add((0, 0))
+    return targets
+
+
+def analyze(grid):
+    """Function for analysing the grid loaded by set_grid.
+    States are searched from the start of the program
+    and from the current position of the grid."""
+    entries = {(0, 0, ">", False),
+               (grid.y, grid.x, grid.move_direction, grid.string_mode)}
+    states = set(entries)
+    queue = list(states)
+    predecessors = {}
+    put_states = []
+    while queue:
+        state = queue.pop()
+        y, x, direction, string_mode = state
+        if not string_mode and grid.grid.char(y, x) == "p":
+            put_states.append(state)
+        for successor in _successors(grid, *state):
+            predecessors.setdefault(successor, set()).add(state)
+            if successor not in states:
+                states.add(successor)
+                queue.append(successor)
+    writable = set()
+    for state in put_states:
+        targets = _put_targets(grid, state, entries, predecessors)
+        if targets is None:
+            writable = None
+            break
+        writable |= targets
+    return Analysis(states, put_states, writable)
+
+
+def for_grid(grid):
+    """Function for the analysis kept by the grid until its code
+    is changed by set_grid or restore.
+    Incomplete interactive grid and Funge-Space aren't analysed
+    and None is returned."""
+    if not grid.grid_complete or grid.funge98:
+        return None
+    if grid.analysis is None or grid.analysis[0] is not grid.grid:
+        grid.analysis = (grid.grid, analyze(grid))
+    return grid.analysis[1]
@@ -0,0 +1,180 @@
+"""On-disk cache of preprocessed befunge programs.
+Artifact of a program is its validated code, the result of
+befunge.analysis and code objects of the blocks compiled by
+befunge.block_compiler. It is stored in one file named by sha256 of
+the code, the options of the grid, the interpreter version and
+the Python bytecode tag, so changing any of them makes a new entry.
+Warm load reads the file once and skips validation, analysis
+and block compilation.
+Files are written to a temporary name and moved with os.replace,
+so concurrent writers, e.g. batch workers, never leave a torn file.
+Least recently used entries are removed, when the directory holds more
+than max_entries files or max_bytes bytes, loads refresh the mtime.
+Artifacts are pickled, so the directory has to be as trusted
+as __pycache__."""
+
+import hashlib
+import marshal
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from befunge import __version__
+from befunge.block_compiler import BlockCache
+from befunge.exceptions import *
+from befunge.playfield import Playfield
+
+SUFFIX = ".bfc"
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ArtifactCache:
+    """Class for the cache directory of program artifacts"""
+
+    def __init__(self, directory, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(grid, text):
+        """Method for the hash of the code text for the grid options"""
+        digest = hashlib.sha256()
+        digest.update(f"{__version__}\0{sys.implementation.cache_tag}\0"
+                      f"{grid.legacy_put}\0{grid.eof}\0".encode("utf-8"))
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def path(self, key):
+        """Method for the file of the artifact"""
+        return self.directory / (key + SUFFIX)
+
+    def load(self, grid, mode="f", source=None):
+        """Method for setting the grid like set_grid does,
+        from the artifact if it is cached.
+        Without the artifact the code is validated and analysed
+        and the new artifact is stored.
+        Funge98 grids aren't cached.
+        Returns True if the artifact was found."""
+        if grid.funge98:
+            grid.set_grid(mode, source)
+            return False
+        text = _read_text(mode, source)
+        key = self.key(grid, text)
+        path = self.path(key)
+        try:
+            artifact = pickle.loads(path.read_bytes())
+            if artifact["version"] != __version__:
+                raise ValueError("artifact of another version")
+            blocks = marshal.loads(artifact["blocks"])
+        except Exception:
+            # missing, torn by a foreign writer or stale artifact
+            rows = source if mode == "s" else text.split("\n")
+            grid.set_grid("s", rows)
+            grid.artifact = (grid.grid, key, list(rows))
+            self.store(grid)
+            return False
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        rows = artifact["rows"]
+        grid.code_height = len(rows)
+        grid.code_width = len(rows[0])
+        grid.y = 0
+        grid.x = 0
+        grid.grid = Playfield(rows)
+        grid.stack = grid._new_stack()
+        grid._fit_moves()
+        grid.steps = 0
+        grid.analysis = (grid.grid, artifact["analysis"])
+        grid.artifact = (grid.grid, key, rows)
+        BlockCache.for_grid(grid, blocks)
+        return True
+
+    def store(self, grid):
+        """Method for saving the artifact of the grid loaded by load(),
+        with every block compiled from its unchanged code"""
+        if grid.artifact is None:
+            return
+        playfield, key, rows = grid.artifact
+        if playfield is not grid.grid:
+            return
+        blocks = {}
+        cache = grid.block_cache
+        if cache is not None and cache.playfield is playfield:
+            blocks = cache.compiled
+        analysis = grid.analysis[1] if grid.analysis is not None and \
+            grid.analysis[0] is playfield else None
+        if analysis is None:
+            from befunge.analysis import analyze
+            analysis = analyze(grid)
+            grid.analysis = (playfield, analysis)
+        data = pickle.dumps({"version": __version__, "rows": rows,
+                             "analysis": analysis,
+                             "blocks": marshal.dumps(blocks)},
+                            pickle.HIGHEST_PROTOCOL)
+        descriptor, temporary = tempfile.mkstemp(suffix=".tmp",
+                                                 dir=self.directory)
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary, self.path(key))
+        except BaseException:
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def evict(self):
+        """Method for removing the least recently used artifacts
+        over the limits"""
+        entries = []
+        for path in self.directory.glob("*" + SUFFIX):
+            try:
+                status = path.stat()
+            except OSError:
+                continue
+            entries.append((status.st_mtime, status.st_size, path))
+        entries.sort()
+        count = len(entries)
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in entries:
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            count -= 1
+            size -= entry_size
+
+    def clear(self):
+        """Method for removing every artifact"""
+        for path in self.directory.glob("*" + SUFFIX):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def _read_text(mode, source):
+    """Inner function for the code text, read the same way
+    as set_grid reads it"""
+    if mode == "f":
+        try:
+            with open(source, "r", encoding="utf-8") as file:
+                return file.read()
+        except FileNotFoundError:
+            raise CodeFileNotFoundError from None
+    if mode == "s":
+        if not isinstance(source, list):
+            raise CodeSourceIsNotStringListError from None
+        return "\n".join(source)
+    raise WrongSetGridModeError
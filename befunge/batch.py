@@ -0,0 +1,325 @@
+"""Batch runner for many befunge programs.
+Programs are executed in a process pool, every job with its own
+step and time limits, and results are given back as soon as
+each job finishes.
+
+Usage: python -m befunge.batch PATH [--workers N] [--max-steps N]
+                                    [--timeout SECONDS] [--engine ENGINE]
+                                    [--detect-loops]
+                                    [--checkpoint-dir DIR]
+                                    [--checkpoint-every N]
+                                    [--cache-dir DIR]
+PATH is either a directory of programs (*.bf, *.b93, *.txt),
+where input of the program is in the file with the same name
+and '.in' suffix, or a JSON manifest with a list of objects:
+{"name": ..., "program": path, "input": text, "input_file": path}.
+Every result is printed as one JSON line.
+With a checkpoint directory, every job saves its snapshot and output
+there every N steps and continues from it when it is started again,
+e.g. after the runner was killed.
+With a cache directory, programs are loaded through
+befunge.artifact_cache, so workers share preprocessed programs."""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from befunge.befunge_grid import BefungeGrid
+from befunge.exceptions import InfiniteLoopError
+from befunge.snapshot import read_varint, write_varint
+from befunge.streams import BufferSink, BytesSource
+
+CHECK_INTERVAL = 4096
+PROGRAM_SUFFIXES = (".bf", ".b93", ".txt")
+INPUT_SUFFIX = ".in"
+CHECKPOINT_SUFFIX = ".checkpoint"
+DEFAULT_CHECKPOINT_EVERY = 1000000
+HARD_TIMEOUT_GRACE = 1.0
+
+
+class Job:
+    """Class for one program of the batch.
+    Program is a path to the code file or a list of strings."""
+
+    def __init__(self, name, program, input_data=b""):
+        self.name = name
+        self.program = program
+        self.input_data = input_data
+
+
+class JobResult:
+    """Class for the result of one job.
+    Reason is 'halted', 'invalid_operand', 'step_limit',
+    'timeout', 'infinite_loop' or 'error'."""
+
+    def __init__(self, name, reason, output="", stack=(), steps=0,
+                 elapsed=0.0, error=None):
+        self.name = name
+        self.reason = reason
+        self.output = output
+        self.stack = list(stack)
+        self.steps = steps
+        self.elapsed = elapsed
+        self.error = error
+
+    def to_dict(self):
+        """Method for the result as a JSON-compatible dict"""
+        return {"name": self.name, "reason": self.reason,
+                "output": self.output, "stack": self.stack,
+                "steps": self.steps, "elapsed": self.elapsed,
+                "error": self.error}
+
+
+def run_job(job, max_steps=None, timeout=None, engine="block",
+            detect_loops=False, checkpoint_dir=None,
+            checkpoint_every=DEFAULT_CHECKPOINT_EVERY, cache_dir=None):
+    """Function for executing one job.
+    Limits are checked every CHECK_INTERVAL steps.
+    With detect_loops, the job is run by the loop detector
+    and stops as soon as it is found to loop forever.
+    With checkpoint_dir, the job is continued from its checkpoint,
+    saved every checkpoint_every steps and removed at the end.
+    With cache_dir, the program is loaded from its cached artifact
+    and blocks compiled by the run are stored back."""
+    start = time.perf_counter()
+    sink = BufferSink()
+    grid = BefungeGrid(output=sink,
+                       input_source=BytesSource(job.input_data))
+    checkpoint = None
+    cache = None
+    if cache_dir is not None:
+        from befunge.artifact_cache import ArtifactCache
+        cache = ArtifactCache(cache_dir)
+    if checkpoint_dir is not None:
+        checkpoint = Path(checkpoint_dir) / \
+            (re.sub(r"[^\w.-]", "_", job.name) + CHECKPOINT_SUFFIX)
+    try:
+        if checkpoint is not None and checkpoint.exists():
+            load_checkpoint(grid, checkpoint)
+        elif cache is not None:
+            cache.load(grid, "s" if isinstance(job.program, list) else "f",
+                       job.program)
+        elif isinstance(job.program, list):
+            grid.set_grid("s", job.program)
+        else:
+            grid.set_grid("f", job.program)
+        reason = _run_limited(grid, max_steps, timeout, engine, start,
+                              detect_loops, checkpoint, checkpoint_every)
+        if cache is not None:
+            cache.store(grid)
+        error = None
+    except InfiniteLoopError as error_object:
+        reason = "infinite_loop"
+        error = error_object.message
+    except Exception as error_object:
+        reason = "error"
+        error = f"{type(error_object).__name__}: {error_object}"
+    if checkpoint is not None and checkpoint.exists():
+        checkpoint.unlink()
+    return JobResult(job.name, reason, sink.getvalue(), grid.stack,
+                     grid.steps, time.perf_counter() - start, error)
+
+
+def save_checkpoint(grid, path):
+    """Function for saving the snapshot of the grid with its output.
+    File is replaced atomically, so the job killed while saving
+    keeps its previous checkpoint."""
+    data = bytearray()
+    snapshot = grid.snapshot()
+    write_varint(data, len(snapshot))
+    data += snapshot
+    data += grid.output.getvalue().encode("utf-8")
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temporary.write_bytes(data)
+    os.replace(temporary, path)
+
+
+def load_checkpoint(grid, path):
+    """Function for restoring the grid and its output
+    saved by save_checkpoint"""
+    data = path.read_bytes()
+    length, position = read_varint(data, 0)
+    grid.restore(data[position:position + length])
+    grid.output.write(data[position + length:].decode("utf-8"))
+
+
+def _run_limited(grid, max_steps, timeout, engine, start,
+                 detect_loops=False, checkpoint=None,
+                 checkpoint_every=DEFAULT_CHECKPOINT_EVERY):
+    """Inner function for running the grid in slices
+    until it stops or runs out of limits"""
+    deadline = None if timeout is None else start + timeout
+    next_checkpoint = grid.steps + checkpoint_every
+    while True:
+        budget = CHECK_INTERVAL
+        if max_steps is not None:
+            budget = min(budget, max_steps - grid.steps)
+            if budget <= 0:
+                return "step_limit"
+        if grid.run(engine=engine, max_steps=budget,
+                    detect_loops=detect_loops):
+            if grid.grid.cell(grid.y, grid.x) == ord("@"):
+                return "halted"
+            return "invalid_operand"
+        if checkpoint is not None and grid.steps >= next_checkpoint:
+            save_checkpoint(grid, checkpoint)
+            next_checkpoint = grid.steps + checkpoint_every
+        if deadline is not None and time.perf_counter() > deadline:
+            return "timeout"
+
+
+def load_jobs(path):
+    """Function for making jobs from a directory or a JSON manifest"""
+    path = Path(path)
+    jobs = []
+    if path.is_dir():
+        for program in sorted(path.iterdir()):
+            if program.suffix not in PROGRAM_SUFFIXES:
+                continue
+            input_file = program.with_suffix(INPUT_SUFFIX)
+            input_data = input_file.read_bytes() \
+                if input_file.exists() else b""
+            jobs.append(Job(program.name, str(program), input_data))
+        return jobs
+    with open(path, "r", encoding="utf-8") as file:
+        manifest = json.load(file)
+    for number, entry in enumerate(manifest):
+        program = path.parent / entry["program"]
+        if "input_file" in entry:
+            input_data = (path.parent / entry["input_file"]).read_bytes()
+        else:
+            input_data = entry.get("input", "").encode("utf-8")
+        jobs.append(Job(entry.get("name", f"{number}:{entry['program']}"),
+                        str(program), input_data))
+    return jobs
+
+
+def run_batch(jobs, workers=None, max_steps=None, timeout=None,
+              engine="block", detect_loops=False, checkpoint_dir=None,
+              checkpoint_every=DEFAULT_CHECKPOINT_EVERY, cache_dir=None):
+    """Generator of job results in the order of completion.
+    No more jobs than workers are submitted at once, so the parent knows
+    when every job started. Job still running HARD_TIMEOUT_GRACE seconds
+    after its timeout is reported as 'timeout' and the pool is recycled.
+    Crashed worker breaks the whole pool, so every job running in it
+    is submitted again alone, and the job breaking the pool alone
+    is reported as 'error'."""
+    workers = workers or os.cpu_count() or 1
+    pending = deque(jobs)
+    suspects = deque()
+    running = {}
+    alone = False
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    def submit(job):
+        future = executor.submit(run_job, job, max_steps, timeout, engine,
+                                 detect_loops, checkpoint_dir,
+                                 checkpoint_every, cache_dir)
+        running[future] = (job, time.monotonic())
+
+    try:
+        while pending or suspects or running:
+            if suspects:
+                if not running:
+                    submit(suspects.popleft())
+                    alone = True
+            else:
+                while pending and len(running) < workers:
+                    submit(pending.popleft())
+            wait_time = None
+            if timeout is not None:
+                first_start = min(start for _, start in running.values())
+                wait_time = max(0.0, first_start + timeout +
+                                HARD_TIMEOUT_GRACE - time.monotonic())
+            done, _ = wait(running, wait_time, FIRST_COMPLETED)
+            crashed = timed_out = False
+            for future in done:
+                job, start = running.pop(future)
+                try:
+                    yield future.result()
+                except BrokenProcessPool:
+                    crashed = True
+                    if alone:
+                        yield JobResult(job.name, "error",
+                                        elapsed=time.monotonic() - start,
+                                        error="worker process crashed")
+                    else:
+                        suspects.append(job)
+                except Exception as error_object:
+                    yield JobResult(job.name, "error",
+                                    elapsed=time.monotonic() - start,
+                                    error=f"{type(error_object).__name__}:"
+                                          f" {error_object}")
+            if timeout is not None:
+                now = time.monotonic()
+                for future, (job, start) in list(running.items()):
+                    if now - start >= timeout + HARD_TIMEOUT_GRACE:
+                        del running[future]
+                        timed_out = True
+                        yield JobResult(job.name, "timeout",
+                                        elapsed=now - start,
+                                        error="worker stopped after "
+                                              "the time limit")
+            if not running:
+                alone = False
+            if crashed or timed_out:
+                if crashed:
+                    suspects.extend(job for job, _ in running.values())
+                else:
+                    pending.extendleft(job for job, _ in running.values())
+                running.clear()
+                alone = False
+                _terminate(executor)
+                executor = ProcessPoolExecutor(max_workers=workers)
+    finally:
+        _terminate(executor)
+
+
+def _terminate(executor):
+    """Inner function for stopping the pool with its busy workers.
+    ProcessPoolExecutor has no public way to kill running workers
+    before Python 3.14, so its process table is used."""
+    terminate_workers = getattr(executor, "terminate_workers", None)
+    if terminate_workers is not None:
+        terminate_workers()
+    else:
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m befunge.batch",
+        description="Run many befunge programs in a process pool")
+    parser.add_argument("path", help="directory of programs or manifest")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-steps", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=None)
+    parser.add_argument("--engine", default="block")
+    parser.add_argument("--detect-loops", action="store_true",
+                        help="stop programs found to loop forever")
+    parser.add_argument("--checkpoint-dir", default=None)
+    parser.add_argument("--checkpoint-every", type=int,
+                        default=DEFAULT_CHECKPOINT_EVERY)
+    parser.add_argument("--cache-dir", default=None,
+                        help="directory of cached program artifacts")
+    args = parser.parse_args(argv)
+    jobs = load_jobs(args.path)
+    for result in run_batch(jobs, args.workers, args.max_steps,
+                            args.timeout, args.engine, args.detect_loops,
+                            args.checkpoint_dir, args.checkpoint_every,
+                            args.cache_dir):
+        sys.stdout.write(json.dumps(result.to_dict()) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
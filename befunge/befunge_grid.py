@@ -1,24 +1,136 @@
 """Interpreter for esoteric stack language befunge.
 Stack contains only int numbers"""
 
-from random import choice
-from typing import List
+from functools import lru_cache
+from itertools import count
 from befunge.exceptions import *
+from befunge.playfield import Playfield
+from befunge.rng import DirectionRandom
+from befunge.streams import StdoutSink, ConsoleSource
+
+EOF_MODES = ("push", "reflect")
+STACK_MODES = ("list", "int32", "int64")
+DEFAULT_YIELD_EVERY = 4096
+DIRECTIONS = ">v<^"
+RIGHT, DOWN, LEFT, UP = range(4)
+DIRECTION_CODES = {">": RIGHT, "v": DOWN, "<": LEFT, "^": UP}
+REVERSED = (LEFT, UP, RIGHT, DOWN)
+STEPS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+
+@lru_cache(maxsize=32)
+def next_cell_tables(height, width):
+    """Function for the tables of the next cell in every direction
+    of the torus. Table of the direction is indexed by y * width + x
+    of the cell and keeps (y, x) of the next cell."""
+    cells = [(y, x) for y in range(height) for x in range(width)]
+    return tuple(tuple(cells[(y + step_y) % height * width +
+                             (x + step_x) % width] for y, x in cells)
+                 for step_y, step_x in STEPS)
+
+
+def step_range(max_steps):
+    """Function for the numbers of the steps of one run, endless
+    for max_steps=None. Engines count steps by iterating over it,
+    so the unbounded run has no limit check of its own."""
+    return count() if max_steps is None else range(max_steps)
+
+
+class RunStatus:
+    """Class for the result of run_for.
+    Status is 'halted' at '@', 'needs_input', when the non-blocking
+    input source has no data, 'budget_exhausted', when max_steps ran
+    out, or 'error' for invalid operand or raised exception,
+    which message is kept in error. Steps are the commands executed
+    by this call. Grid can be run again after every status
+    but 'error'."""
+    HALTED = "halted"
+    NEEDS_INPUT = "needs_input"
+    BUDGET_EXHAUSTED = "budget_exhausted"
+    ERROR = "error"
+
+    def __init__(self, status, steps, error=None):
+        self.status = status
+        self.steps = steps
+        self.error = error
+
+    def __eq__(self, other):
+        if isinstance(other, RunStatus):
+            return (self.status, self.steps, self.error) == \
+                (other.status, other.steps, other.error)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"RunStatus({self.status!r}, {self.steps!r}, {self.error!r})"
 
 
 class BefungeGrid:
     """Class for befunge grid"""
-    stack: List[int]
+    stack: list[int]
+    grid_complete = True
 
-    def __init__(self):
+    def __init__(self, legacy_put=True, output=None, input_source=None,
+                 eof="push", funge98=False, seed=None, stack_mode="list",
+                 stack_capacity=None):
+        """If legacy_put=True, 'p' takes coordinates starting on 1,
+        otherwise on 0, the same way as 'g' does.
+        If funge98=True, code of any size and shape is placed into
+        unbounded Funge-Space of befunge.funge_space, otherwise it is
+        a Befunge-93 torus of up to 25×80 cells.
+        Output is a sink from befunge.streams, sys.stdout by default.
+        Input source is a source from befunge.streams, input() by default.
+        At the end of input '~' and '&' push -1 for eof='push'
+        or reverse move direction for eof='reflect'.
+        Stack is the list of unbounded numbers for stack_mode='list',
+        or befunge.typed_stack.TypedStack of wrapping 32-bit or 64-bit
+        numbers with implicit zeros for 'int32' or 'int64',
+        preallocated for stack_capacity numbers."""
+        if eof not in EOF_MODES:
+            raise WrongEofModeError(eof)
+        if stack_mode not in STACK_MODES:
+            raise WrongStackModeError(stack_mode)
+        self.stack_mode = stack_mode
+        self.stack_capacity = stack_capacity
         self.code_height = 0
         self.code_width = 0
         self.y = 0
         self.x = 0
         self.grid = None
-        self.stack = []
-        self.move_direction = ">"
+        self.stack = self._new_stack()
+        self.direction = RIGHT
+        self.next_cells = None
         self.string_mode = False
+        self.steps = 0
+        self.block_cache = None
+        self.analysis = None
+        self.artifact = None
+        self.profile = None
+        self.loop_detector = None
+        self.trace = None
+        self.paused = False
+        self.write_hooks = []
+        self.legacy_put = legacy_put
+        self.output = StdoutSink() if output is None else output
+        self.input_source = ConsoleSource() if input_source is None \
+            else input_source
+        self.eof = eof
+        self.funge98 = funge98
+        self.seed = seed
+        self.rng = DirectionRandom(seed)
+        if funge98:
+            from befunge.funge_space import move
+            self._move = lambda: move(self)
+
+    def _new_stack(self, values=()):
+        """Inner method for the empty stack of the stack mode
+        or the stack of the values"""
+        if self.stack_mode == "list":
+            return list(values)
+        from befunge.typed_stack import TypedStack, STACK_BITS, \
+            DEFAULT_CAPACITY
+        capacity = DEFAULT_CAPACITY if self.stack_capacity is None \
+            else self.stack_capacity
+        return TypedStack(STACK_BITS[self.stack_mode], capacity, values)
 
     @staticmethod
     def _read_source(mode="f", source=None):
@@ -46,8 +158,12 @@ class BefungeGrid:
         Mode 'f' is for reading file. Mode 's' is for list of strings.
         Method also resets y and x variables to zero.
         Code is any rectangular less or equal to 25×80 text block,
-        looped in the shape of a torus."""
+        looped in the shape of a torus.
+        In funge98 mode code is any text placed into Funge-Space."""
         rows, height, width = self._read_source(mode, source)
+        if self.funge98:
+            self._set_space(rows)
+            return
         if not width:
             raise CodeSourceIsEmptyError
         if height > 25 or width > 80:
@@ -59,24 +175,48 @@ class BefungeGrid:
         self.code_width = width
         self.y = 0
         self.x = 0
-        self.grid = rows
-        self.stack = []
+        self.grid = Playfield(rows)
+        self.stack = self._new_stack()
+        self.steps = 0
+        self._fit_moves()
+
+    def _fit_moves(self):
+        """Inner method for the next cell tables of the grid size"""
+        self.next_cells = next_cell_tables(self.code_height, self.code_width)
+
+    @property
+    def move_direction(self):
+        """Direction as one of '>v<^' characters,
+        the grid keeps its index in self.direction"""
+        return DIRECTIONS[self.direction]
+
+    @move_direction.setter
+    def move_direction(self, direction):
+        self.direction = DIRECTION_CODES[direction]
+
+    def _set_space(self, rows):
+        """Inner method for placing the code into Funge-Space"""
+        from befunge.funge_space import FungeSpace
+        if not any(rows):
+            raise CodeSourceIsEmptyError
+        space = FungeSpace(rows)
+        self.code_height = space.height
+        self.code_width = space.width
+        self.y = 0
+        self.x = 0
+        self.grid = space
+        self.stack = self._new_stack()
+        self.steps = 0
 
     def evaluate(self, command, debug):
         """Main method for evaluation code of befunge."""
         if debug:
-            print("evaluate command [ {} ] at Y: {} X: {},"
-                  " string mode: {}, stack: [ {} ]".format
-                  (command,
-                   str(self.y + 1),
-                   str(self.x + 1),
-                   str(self.string_mode),
-                   ",".join(str(int(e)) for e in self.stack)))
+            self._print_debug(command)
         if self.string_mode:
             if command == '"':
                 self.string_mode = False
             else:
-                self.stack.append(ord(self.grid[self.y][self.x]))
+                self.stack.append(self.grid.cell(self.y, self.x))
         elif command in ">^<v|?#_| ":
             self._change_direction(command)
         elif command in r"0123456789+-*/%!`:\$":
@@ -92,53 +232,288 @@ class BefungeGrid:
         elif command == "@":
             return False
         else:
-            print(f"Invalid operand [ {command} ] "
-                  f"at {self.y + 1} row, {self.x + 1} column")
+            self._print_invalid(command)
             return False
         self._move()
         return True
 
-    def run(self, debug=False):
+    def run(self, debug=False, engine="classic", max_steps=None,
+            profile=None, detect_loops=None, trace=None, quotas=None):
         """Endless loop of program interpretation
         If debug=True, every command prints:
          - current command,
          - coordinates,
          - string mode
-         - full stack"""
+         - full stack
+        Engine 'classic' evaluates command by command with evaluate(),
+        engine 'table' uses the dispatch table of befunge.dispatch_engine,
+        engine 'block' runs compiled blocks of befunge.block_compiler.
+        If max_steps is given, no more than max_steps commands are executed
+        and the next run continues from the same place.
+        If profile is True or befunge.profiler.Profile, the program is run
+        by the profiler, which keeps its counters in self.profile.
+        If detect_loops is True or befunge.loop_detector.LoopDetector,
+        the program is run by the loop detector, which raises
+        InfiniteLoopError on the repeated state.
+        If trace is True or befunge.trace.TraceRecorder, every command
+        is recorded into self.trace, see befunge.trace for the decoder.
+        If quotas is befunge.quotas.Quotas, the run raises
+        QuotaExceededError on the exceeded limit.
+        Returns True if the program stopped, False if max_steps ran out."""
         if self.grid is None:
             raise GridIsNotDefinedError
+        return self._execute(debug, engine, max_steps, profile, detect_loops,
+                             trace, quotas)
+
+    def _execute(self, debug, engine, max_steps=None, profile=None,
+                 detect_loops=None, trace=None, quotas=None):
+        """Inner method for running the program with the chosen engine.
+        Output is flushed when the program stops, even on errors.
+        Funge-Space is run by the classic engine or its own table engine,
+        profiler, loop detector and trace need the Befunge-93 playfield.
+        self.paused tells, whether the run ended on max_steps
+        and can be continued. Seen states of the loop detector
+        are kept only for the continued run.
+        Run stopped by InputIsNotReadyError is paused at the input
+        command too, run stopped by QuotaExceededError between commands,
+        unless the error isn't resumable."""
+        if self.funge98:
+            for tool, used in (("profiler", profile is not None),
+                               ("loop detector", detect_loops),
+                               ("trace", trace is not None)):
+                if used:
+                    raise FungeSpaceIsNotSupportedError(tool)
+        if not self.paused:
+            self.loop_detector = None
+        self.paused = False
+        try:
+            if quotas is None:
+                stopped = self._run_engine(debug, engine, max_steps, profile,
+                                           detect_loops, trace)
+            else:
+                from befunge.quotas import execute
+                stopped = execute(self, quotas, debug, engine, max_steps,
+                                  profile, detect_loops, trace)
+            self.paused = not stopped
+            return stopped
+        except (InputIsNotReadyError, QuotaExceededError) as error_object:
+            self.paused = getattr(error_object, "resumable", True)
+            raise
+        finally:
+            self.output.flush()
+
+    def _run_engine(self, debug, engine, max_steps, profile,
+                    detect_loops=None, trace=None):
+        """Inner method for choosing the engine.
+        Every engine adds executed commands to self.steps."""
+        if detect_loops:
+            from befunge.loop_detector import LoopDetector, execute
+            if detect_loops is True:
+                if self.loop_detector is None:
+                    self.loop_detector = LoopDetector()
+            else:
+                self.loop_detector = detect_loops
+            return execute(self, self.loop_detector, debug, max_steps)
+        if trace is not None:
+            from befunge.trace import TraceRecorder, execute
+            if trace is True:
+                trace = TraceRecorder()
+            self.trace = trace
+            return execute(self, trace, debug, max_steps)
+        if profile is not None:
+            from befunge.profiler import Profile, execute
+            if profile is True:
+                profile = Profile()
+            self.profile = profile
+            return execute(self, profile, debug, max_steps)
+        if self.funge98 and engine != "classic":
+            if engine not in ("table", "block"):
+                raise UnknownEngineError(engine)
+            from befunge.funge_space import execute
+            return execute(self, debug, max_steps)
+        if engine == "classic":
+            return self._run_classic(debug, max_steps)
+        elif engine == "table":
+            from befunge.dispatch_engine import execute
+            return execute(self, debug, max_steps)
+        elif engine == "block":
+            from befunge.block_compiler import execute
+            return execute(self, debug, max_steps)
+        else:
+            raise UnknownEngineError(engine)
+
+    def _run_classic(self, debug, max_steps):
+        """Inner method for the loop of the classic engine.
+        Cell of the playfield is read from its array without a call,
+        Funge-Space is read by its char method."""
+        evaluate = self.evaluate
+        steps = 0
+        try:
+            if self.funge98:
+                char = self.grid.char
+                for steps in step_range(max_steps):
+                    if not evaluate(char(self.y, self.x), debug):
+                        return True
+            else:
+                cells = self.grid.cells
+                offsets = self.grid.offsets
+                for steps in step_range(max_steps):
+                    if not evaluate(chr(cells[offsets[self.y] + self.x]),
+                                    debug):
+                        return True
+            steps = max_steps
+            return False
+        finally:
+            self.steps += steps
+
+    def run_for(self, max_steps, engine="classic", debug=False):
+        """Method for executing at most max_steps commands.
+        Returns RunStatus, the next call continues from the same place.
+        Input command without data of befunge.streams.AsyncSource
+        is evaluated again after the next call."""
+        if self.grid is None:
+            raise GridIsNotDefinedError
+        start = self.steps
+        try:
+            stopped = self._execute(debug, engine, max_steps)
+        except InputIsNotReadyError:
+            return RunStatus(RunStatus.NEEDS_INPUT, self.steps - start)
+        except Exception as error_object:
+            return RunStatus(RunStatus.ERROR, self.steps - start,
+                             f"{type(error_object).__name__}: "
+                             f"{error_object}")
+        if not stopped:
+            return RunStatus(RunStatus.BUDGET_EXHAUSTED, self.steps - start)
+        command = self.grid.char(self.y, self.x)
+        if command == "@":
+            return RunStatus(RunStatus.HALTED, self.steps - start)
+        return RunStatus(RunStatus.ERROR, self.steps - start,
+                         f"Invalid operand [ {command} ] "
+                         f"at {self.y + 1} row, {self.x + 1} column")
+
+    def step(self, count=1, engine="classic", debug=False):
+        """Method for executing count commands, see run_for"""
+        return self.run_for(count, engine, debug)
+
+    async def run_async(self, debug=False, engine="classic",
+                        yield_every=DEFAULT_YIELD_EVERY, max_steps=None):
+        """Coroutine of program interpretation for asyncio code.
+        Program is run in slices of yield_every commands, control is
+        given back to the event loop after each of them.
+        Input source befunge.streams.AsyncSource is awaited, when
+        it has no data, and befunge.streams.AsyncSink is drained
+        after every slice. Other sources and sinks are blocking.
+        Returns True if the program stopped, False if max_steps ran out."""
+        if self.grid is None:
+            raise GridIsNotDefinedError
+        import asyncio
+        drain = getattr(self.output, "drain", None)
+        limit = None if max_steps is None else self.steps + max_steps
         while True:
-            if self.evaluate(self.grid[self.y][self.x], debug):
+            budget = yield_every
+            if limit is not None:
+                budget = min(budget, limit - self.steps)
+            try:
+                stopped = self._execute(debug, engine, budget)
+            except InputIsNotReadyError:
+                if drain is not None:
+                    await drain()
+                await self._wait_input()
                 continue
-            break
+            if drain is not None:
+                await drain()
+            if stopped:
+                return True
+            if limit is not None and self.steps >= limit:
+                return False
+            await asyncio.sleep(0)
+
+    async def _wait_input(self):
+        """Inner coroutine awaiting the data for the paused command"""
+        await self.input_source.wait()
+
+    def snapshot(self):
+        """Method for saving the state of the grid as compact bytes.
+        See befunge.snapshot for the format."""
+        if self.grid is None:
+            raise GridIsNotDefinedError
+        from befunge.snapshot import dumps
+        return dumps(self)
+
+    def restore(self, data):
+        """Method for restoring the state saved by snapshot().
+        Run, paused by max_steps, continues after restore."""
+        from befunge.snapshot import loads
+        loads(self, data)
+
+    def _print_debug(self, command):
+        """Inner method for printing the state before command evaluation"""
+        self.output.flush()
+        print("evaluate command [ {} ] at Y: {} X: {},"
+              " string mode: {}, stack: [ {} ]".format
+              (command,
+               str(self.y + 1),
+               str(self.x + 1),
+               str(self.string_mode),
+               ",".join(str(int(e)) for e in self.stack)))
+
+    def _print_invalid(self, command):
+        """Inner method for writing the invalid operand message"""
+        self.output.write(f"Invalid operand [ {command} ] "
+                          f"at {self.y + 1} row, {self.x + 1} column\n")
+        self.output.flush()
 
     def _input_output(self, command):
         """Inner method for I/O operations"""
         if command == ".":
-            print(str(self.stack.pop()) + " ", end='')
+            self.output.write(str(self.stack.pop()) + " ")
         elif command == ",":
-            print(chr(self.stack.pop()), end='')
-        elif command == "&":
-            self.stack.append(int(input()))
+            self.output.write(chr(self.stack.pop()))
         else:
-            input_string = ""
-            while not input_string:
-                input_string = input()
-            self.stack.append(ord(input_string[0]))
+            if self.input_source.interactive:
+                self.output.flush()
+            if command == "&":
+                value = self.input_source.read_int()
+            else:
+                value = self.input_source.read_char()
+            if value is not None:
+                self.stack.append(value)
+            elif self.eof == "push":
+                self.stack.append(-1)
+            else:
+                self.direction = REVERSED[self.direction]
 
     def _put(self):
         """Inner method for stack 'put' command.
         Popping y, x and value from stack, changing the character at y, x
-        to the character with ASCII value v, taking numeration start on 1."""
+        to the character with ASCII value v.
+        In legacy mode numeration starts on 1 and any error writes '0'
+        to the first cell, otherwise numeration starts on 0
+        and nothing is written on errors."""
         try:
             get_y = int(self.stack.pop())
             get_x = int(self.stack.pop())
             value = int(self.stack.pop())
-            left_part = self.grid[get_y - 1][:get_x - 1]
-            right_part = self.grid[get_y - 1][get_x:]
-            self.grid[get_y - 1] = left_part + chr(value) + right_part
+            if self.legacy_put:
+                get_y -= 1
+                get_x -= 1
+            index = self.grid.put(get_y, get_x, value)
         except IndexError:
-            self.grid[0] = "0" + self.grid[0][1:]
+            if not self.legacy_put:
+                return
+            index = self.grid.put(0, 0, ord("0"))
+        if index is None:
+            # Funge-Space has no flat index and no write hooks,
+            # but its bounding box can grow
+            self.code_height = self.grid.height
+            self.code_width = self.grid.width
+            return
+        self._notify_write(*divmod(index, self.code_width))
+
+    def _notify_write(self, y, x):
+        """Inner method for calling write hooks after changing the cell"""
+        for hook in self.write_hooks:
+            hook(y, x)
 
     def _get(self):
         """Inner method for stack 'get' command.
@@ -146,7 +521,7 @@ class BefungeGrid:
         try:
             get_y = self.stack.pop()
             get_x = self.stack.pop()
-            self.stack.append(ord(self.grid[get_y][get_x]))
+            self.stack.append(self.grid.get(get_y, get_x))
         except IndexError:
             self.stack.append(0)
 
@@ -230,35 +605,31 @@ class BefungeGrid:
     def _change_direction(self, command):
         """Inner method for changing move direction"""
         if command in ">v<^":
-            self.move_direction = command
+            self.direction = DIRECTION_CODES[command]
         elif command == "?":
-            self.move_direction = choice(">v<^")
+            self.direction = self.rng.index()
         elif command == "|":
             try:
                 value = self.stack.pop()
-                self.move_direction = "^" if value else "v"
+                self.direction = UP if value else DOWN
             except IndexError:
                 raise NotEnoughElementsInStackError(self) from None
         elif command == "_":
             try:
                 value = self.stack.pop()
-                self.move_direction = "<" if value else ">"
+                self.direction = LEFT if value else RIGHT
             except IndexError:
                 raise NotEnoughElementsInStackError(self) from None
         elif command == "#":
-            self._move()
+            self._bridge()
         else:
             pass
 
+    def _bridge(self):
+        """Inner method for '#', moving over the next cell"""
+        self._move()
+
     def _move(self):
-        """Inner method for moving over grid"""
-        if self.move_direction == "v":
-            self.y = (self.y + 1) % self.code_height
-        elif self.move_direction == ">":
-            self.x = (self.x + 1) % self.code_width
-        elif self.move_direction == "^":
-            self.y = self.code_height - 1 if self.y == 0 else self.y - 1
-        elif self.move_direction == "<":
-            self.x = self.code_width - 1 if self.x == 0 else self.x - 1
-        else:
-            pass
+        """Inner method for moving over grid by the next cell table"""
+        self.y, self.x = self.next_cells[self.direction][
+            self.y * self.code_width + self.x]
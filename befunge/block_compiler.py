@@ -0,0 +1,351 @@
+"""Basic-block compiler for befunge grid.
+Straight-line run of cells starting at (y, x, direction, string mode)
+is compiled into one Python function and cached.
+Block ends before '|', '_', '?', '#', '~', '&', '@' and invalid operands,
+which are evaluated one by one with the dispatch table,
+and right after 'p', because it can change the code.
+Writing into a cell covered by a cached block invalidates that block.
+Op, that raises, leaves the grid at its cell, direction and steps
+the same way as the classic engine does.
+If befunge.analysis proves the program static, blocks go on after 'p'
+and writes aren't checked at all.
+Ops of every block are rewritten by befunge.peephole before
+the code generation.
+Code objects of blocks compiled from the unchanged code are kept
+for befunge.artifact_cache, which can preload them into a new cache."""
+
+from befunge.analysis import for_grid as analyze
+from befunge.befunge_grid import DIRECTIONS, DIRECTION_CODES
+from befunge.dispatch_engine import build_table, TABLE_SIZE
+from befunge.dispatch_engine import execute as execute_table
+from befunge.peephole import optimize
+
+STEPS = {">": (0, 1), "v": (1, 0), "<": (0, -1), "^": (-1, 0)}
+TERMINATORS = "|_?#~&@"
+MAX_BLOCK_LENGTH = 512
+
+BINARY = {"+": "a + b", "-": "a - b", "*": "a * b", "/": "a // b",
+          "%": "a % b", "`": "1 if b > a else 0"}
+
+SNIPPETS = {
+    "!": ["try:",
+          "    push(0 if pop() else 1)",
+          "except IndexError:",
+          "    push(0)"],
+    ":": ["try:",
+          "    push(stack[-1])",
+          "except IndexError:",
+          "    push(0)",
+          "    push(0)"],
+    "\\": ["try:",
+           "    a = pop()",
+           "    b = pop()",
+           "    push(a)",
+           "    push(b)",
+           "except IndexError:",
+           "    push(0)",
+           "    push(0)"],
+    "$": ["if stack:",
+          "    pop()"],
+    ".": ["write(str(pop()) + ' ')"],
+    ",": ["write(chr(pop()))"],
+    "g": ["grid._get()"],
+    "p": ["grid._put()"],
+}
+for _command, _expression in BINARY.items():
+    SNIPPETS[_command] = ["try:",
+                          "    a = pop()",
+                          "    b = pop()",
+                          f"    push({_expression})",
+                          "except (IndexError, ZeroDivisionError):",
+                          "    push(0)"]
+
+SYNC_COMMANDS = ".,gp"
+
+
+class Block:
+    """Compiled straight-line run of the grid.
+    ops is a list of (kind, argument, index) tuples, where index
+    is the number of the cell of the op in cells:
+    ('push', value) for digits and string mode characters,
+    ('op', command) for any other command compiled into the block.
+    states keep (direction, string mode) of every cell, direction
+    of the pointer leaving the cell and string mode, in which the cell
+    is evaluated."""
+
+    def __init__(self, key, ops, cells, end, states):
+        self.key = key
+        self.ops = ops
+        self.cells = cells
+        self.end = end
+        self.states = states
+        self.length = len(cells)
+        self.function = None
+
+
+def discover(grid, y, x, direction, string_mode, static=False):
+    """Function for finding the straight-line run starting at y, x.
+    Returns Block without function or None, if the first cell
+    has to be evaluated by the dispatch table.
+    Block of the static program doesn't end after 'p'."""
+    key = (y, x, direction, string_mode)
+    height = grid.code_height
+    width = grid.code_width
+    playfield = grid.grid
+    ops = []
+    cells = []
+    states = []
+    seen = set()
+    while len(cells) < MAX_BLOCK_LENGTH:
+        state = (y, x, direction, string_mode)
+        if state in seen:
+            break
+        evaluated_in = string_mode
+        code = playfield.cell(y, x)
+        command = chr(code)
+        if string_mode:
+            if command == '"':
+                string_mode = False
+            else:
+                ops.append(("push", code, len(cells)))
+        elif command in TERMINATORS or code >= TABLE_SIZE:
+            break
+        elif command in STEPS:
+            direction = command
+        elif command == '"':
+            string_mode = True
+        elif command in "0123456789":
+            ops.append(("push", int(command), len(cells)))
+        elif command in SNIPPETS:
+            ops.append(("op", command, len(cells)))
+        elif command != " ":
+            break
+        seen.add(state)
+        cells.append((y, x))
+        states.append((direction, evaluated_in))
+        step_y, step_x = STEPS[direction]
+        y = (y + step_y) % height
+        x = (x + step_x) % width
+        if command == "p" and not string_mode and not static:
+            break
+    if not cells:
+        return None
+    return Block(key, ops, cells, (y, x, direction, string_mode), states)
+
+
+def generate(block, guarded=False):
+    """Function for generating Python source of the block function.
+    Before every op, that can raise, the grid gets the position,
+    direction and string mode of the op, and done gets the number
+    of cells executed before it, which are added to grid.steps on errors.
+    Guarded block is made for the stack, that can raise on any push,
+    every op of it is synchronized and ops aren't optimized, so that
+    each push is made by its own cell."""
+    body = []
+    synced = (DIRECTION_CODES[block.key[2]], block.key[3])
+    ops = block.ops if guarded else optimize(block.ops)
+    synchronized = False
+    for kind, argument, index in ops:
+        if guarded or kind == "op" and argument in SYNC_COMMANDS:
+            y, x = block.cells[index]
+            direction, string_mode = block.states[index]
+            state = (DIRECTION_CODES[direction], string_mode)
+            body.append(f"done = {index}")
+            body.append(f"grid.y = {y}")
+            body.append(f"grid.x = {x}")
+            if state != synced:
+                body.append(f"grid.direction = {state[0]}")
+                body.append(f"grid.string_mode = {state[1]!r}")
+                synced = state
+            synchronized = True
+        if kind == "push":
+            body.append(f"push({argument!r})")
+        elif kind == "extend":
+            body.append(f"stack.extend({argument!r})")
+        elif kind == "write":
+            body.append(f"write({argument!r})")
+        elif kind == "drop":
+            body.append(f"del stack[-{argument}:]")
+        else:
+            body.extend(SNIPPETS[argument])
+    lines = ["def make(grid, stack, push, pop, write):",
+             "    def block():"]
+    if not synchronized:
+        lines.extend("        " + line for line in body)
+    else:
+        lines.append("        try:")
+        lines.extend("            " + line for line in body)
+        lines.append("        except BaseException:")
+        lines.append("            grid.steps += done")
+        lines.append("            raise")
+    end_y, end_x, direction, string_mode = block.end
+    lines.append(f"        grid.y = {end_y}")
+    lines.append(f"        grid.x = {end_x}")
+    lines.append(f"        grid.direction = {DIRECTION_CODES[direction]}")
+    lines.append(f"        grid.string_mode = {string_mode!r}")
+    lines.append("    return block")
+    return "\n".join(lines) + "\n"
+
+
+def build(grid, block):
+    """Function for compiling the block into a function bound to the grid"""
+    block.function = bind(grid, compile_block(block))
+    return block.function
+
+
+def compile_block(block, guarded=False):
+    """Function for the code object of the block module"""
+    return compile(generate(block, guarded), f"<befunge block {block.key}>",
+                   "exec")
+
+
+def bind(grid, code):
+    """Function for the block function of the compiled code
+    bound to the grid"""
+    namespace = {}
+    exec(code, namespace)
+    stack = grid.stack
+    return namespace["make"](grid, stack, stack.append, stack.pop,
+                             grid.output.write)
+
+
+class BlockCache:
+    """Cache of compiled blocks of the grid, keyed by
+    (y, x, direction, string mode) of the first cell.
+    Cells map to keys of blocks covering them for invalidation.
+    compiled maps keys to (code, length, cells) of blocks compiled
+    before the first write, preloaded keeps such blocks, which weren't
+    looked up yet.
+    Stack, that can raise on push, e.g. befunge.quotas.QuotaStack,
+    gets guarded blocks, which aren't kept in compiled."""
+
+    def __init__(self, grid, static=False, preloaded=None):
+        self.grid = grid
+        self.static = static
+        self.playfield = grid.grid
+        self.stack = grid.stack
+        self.guarded = getattr(grid.stack, "raises_on_push", False)
+        self.output = grid.output
+        self.blocks = {}
+        self.cells = {}
+        self.compiled = {}
+        self.preloaded = {}
+        self.written = False
+        if preloaded and not self.guarded:
+            self.preload(preloaded)
+
+    @classmethod
+    def for_grid(cls, grid, preloaded=None):
+        """Method for getting the cache kept by the grid between runs.
+        New cache is made, when the grid got new code, stack or output,
+        or when preloaded blocks are given.
+        Cache of the static program doesn't listen to writes."""
+        cache = grid.block_cache
+        if cache is not None and cache.playfield is grid.grid and \
+                cache.stack is grid.stack and cache.output is grid.output \
+                and preloaded is None:
+            return cache
+        if cache is not None and not cache.static:
+            grid.write_hooks.remove(cache.invalidate)
+        analysis = analyze(grid)
+        cache = cls(grid, analysis is not None and analysis.is_static,
+                    preloaded)
+        grid.block_cache = cache
+        if not cache.static:
+            grid.write_hooks.append(cache.invalidate)
+        return cache
+
+    def lookup(self, key):
+        """Method for getting (function, length) of the block
+        or None for the key.
+        Block is discovered and compiled at the first lookup."""
+        try:
+            return self.blocks[key]
+        except KeyError:
+            pass
+        compiled = self.preloaded.pop(key, None)
+        if compiled is None:
+            block = discover(self.grid, *key, self.static)
+            if block is None:
+                self.blocks[key] = None
+                self.cells.setdefault(key[:2], set()).add(key)
+                return None
+            compiled = (compile_block(block, self.guarded), block.length,
+                        tuple(block.cells))
+            if not (self.written or self.guarded):
+                self.compiled[key] = compiled
+        code, length, cells = compiled
+        entry = (bind(self.grid, code), length)
+        self.blocks[key] = entry
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(key)
+        return entry
+
+    def preload(self, compiled):
+        """Method for adding blocks compiled from the same code before,
+        compiled maps keys to (code, length, cells)"""
+        for key, entry in compiled.items():
+            self.compiled[key] = entry
+            self.preloaded[key] = entry
+            for cell in entry[2]:
+                self.cells.setdefault(cell, set()).add(key)
+
+    def invalidate(self, y, x):
+        """Method for dropping every block covering the cell"""
+        self.written = True
+        for key in self.cells.pop((y, x), ()):
+            self.blocks.pop(key, None)
+            self.preloaded.pop(key, None)
+
+
+def execute(grid, debug=False, max_steps=None):
+    """Function for running the grid with compiled blocks
+    until '@' or invalid operand.
+    If max_steps is given, no more than max_steps commands are executed.
+    Returns True if the program stopped, False if max_steps ran out.
+    Debug mode and incomplete interactive grids are evaluated
+    by the dispatch table engine."""
+    if debug or not grid.grid_complete:
+        return execute_table(grid, debug, max_steps)
+    return _loop(grid, BlockCache.for_grid(grid), max_steps)
+
+
+def _loop(grid, cache, max_steps):
+    """Inner loop of block execution.
+    Block longer than the rest of max_steps is evaluated
+    command by command."""
+    table, invalid = build_table(grid)
+    get_block = cache.blocks.get
+    lookup = cache.lookup
+    missing = object()
+    push = grid.stack.append
+    move = grid._move
+    cells = grid.grid.cells
+    offsets = grid.grid.offsets
+    quote = ord('"')
+    limit = float("inf") if max_steps is None else max_steps
+    steps = 0
+    try:
+        while steps < limit:
+            key = (grid.y, grid.x, DIRECTIONS[grid.direction],
+                   grid.string_mode)
+            entry = get_block(key, missing)
+            if entry is missing:
+                entry = lookup(key)
+            if entry is not None and steps + entry[1] <= limit:
+                entry[0]()
+                steps += entry[1]
+                continue
+            code = cells[offsets[grid.y] + grid.x]
+            if grid.string_mode:
+                if code == quote:
+                    grid.string_mode = False
+                else:
+                    push(code)
+            elif (table[code] if code < TABLE_SIZE else invalid)():
+                return True
+            move()
+            steps += 1
+        return False
+    finally:
+        grid.steps += steps
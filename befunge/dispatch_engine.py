@@ -0,0 +1,201 @@
+"""Table-driven execution engine for befunge grid.
+Every opcode is bound to its handler once before the run,
+so each step is a single list lookup instead of the if/elif chains
+of BefungeGrid.evaluate. Semantics are the same as in evaluate,
+including implicit zeros on stack underflow."""
+
+from operator import add, sub, mul, floordiv, mod
+from befunge.exceptions import NotEnoughElementsInStackError
+from befunge.befunge_grid import DIRECTION_CODES, RIGHT, DOWN, LEFT, UP, \
+    step_range
+
+TABLE_SIZE = 256
+
+
+def _binary(stack, operation):
+    """Handler for commands popping a, b and pushing operation(a, b)"""
+    pop = stack.pop
+    push = stack.append
+
+    def handler():
+        try:
+            a = pop()
+            b = pop()
+            push(operation(a, b))
+        except (IndexError, ZeroDivisionError):
+            push(0)
+    return handler
+
+
+def _greater(a, b):
+    return 1 if b > a else 0
+
+
+def build_table(grid):
+    """Function for building the dispatch table of the grid.
+    Index of the table is a cell code, value is a handler without arguments.
+    Handler returns True if the program has to stop."""
+    stack = grid.stack
+    pop = stack.pop
+    push = stack.append
+
+    def invalid():
+        grid._print_invalid(grid.grid.char(grid.y, grid.x))
+        return True
+
+    def stop():
+        return True
+
+    def nop():
+        pass
+
+    def direction(command):
+        code = DIRECTION_CODES[command]
+
+        def handler():
+            grid.direction = code
+        return handler
+
+    next_direction = grid.rng.index
+
+    def random_direction():
+        grid.direction = next_direction()
+
+    def vertical_if():
+        try:
+            grid.direction = UP if pop() else DOWN
+        except IndexError:
+            raise NotEnoughElementsInStackError(grid) from None
+
+    def horizontal_if():
+        try:
+            grid.direction = LEFT if pop() else RIGHT
+        except IndexError:
+            raise NotEnoughElementsInStackError(grid) from None
+
+    def digit(value):
+        def handler():
+            push(value)
+        return handler
+
+    def negate():
+        try:
+            push(0 if pop() else 1)
+        except IndexError:
+            push(0)
+
+    def duplicate():
+        try:
+            push(stack[-1])
+        except IndexError:
+            push(0)
+            push(0)
+
+    def swap():
+        try:
+            a = pop()
+            b = pop()
+            push(a)
+            push(b)
+        except IndexError:
+            push(0)
+            push(0)
+
+    def discard():
+        if stack:
+            pop()
+
+    def string_mode():
+        grid.string_mode = True
+
+    def input_output(command):
+        def handler():
+            grid._input_output(command)
+        return handler
+
+    def put():
+        grid._put()
+
+    def get():
+        grid._get()
+
+    table = [invalid] * TABLE_SIZE
+    for command in ">v<^":
+        table[ord(command)] = direction(command)
+    for value in range(10):
+        table[ord(str(value))] = digit(value)
+    for command in ".,~&":
+        table[ord(command)] = input_output(command)
+    table[ord("?")] = random_direction
+    table[ord("|")] = vertical_if
+    table[ord("_")] = horizontal_if
+    table[ord("#")] = grid._bridge
+    table[ord(" ")] = nop
+    table[ord("+")] = _binary(stack, add)
+    table[ord("-")] = _binary(stack, sub)
+    table[ord("*")] = _binary(stack, mul)
+    table[ord("/")] = _binary(stack, floordiv)
+    table[ord("%")] = _binary(stack, mod)
+    table[ord("`")] = _binary(stack, _greater)
+    table[ord("!")] = negate
+    table[ord(":")] = duplicate
+    table[ord("\\")] = swap
+    table[ord("$")] = discard
+    table[ord('"')] = string_mode
+    table[ord("p")] = put
+    table[ord("g")] = get
+    table[ord("@")] = stop
+    return table, invalid
+
+
+def execute(grid, debug=False, max_steps=None):
+    """Function for running the grid until '@' or invalid operand.
+    If max_steps is given, no more than max_steps commands are executed.
+    Returns True if the program stopped, False if max_steps ran out.
+    Complete grid is moved by its next cell tables right in the loop.
+    String mode is kept in a local variable and written to the grid,
+    when it changes."""
+    table, invalid = build_table(grid)
+    push = grid.stack.append
+    cells = grid.grid.cells
+    offsets = grid.grid.offsets
+    quote = ord('"')
+    string_mode = grid.string_mode
+    steps = 0
+    try:
+        if debug or not grid.grid_complete:
+            move = grid._move
+            for steps in step_range(max_steps):
+                code = cells[offsets[grid.y] + grid.x]
+                if debug:
+                    grid._print_debug(chr(code))
+                if string_mode:
+                    if code == quote:
+                        string_mode = grid.string_mode = False
+                    else:
+                        push(code)
+                elif code == quote:
+                    string_mode = grid.string_mode = True
+                elif (table[code] if code < TABLE_SIZE else invalid)():
+                    return True
+                move()
+        else:
+            next_cells = grid.next_cells
+            width = grid.code_width
+            for steps in step_range(max_steps):
+                code = cells[offsets[grid.y] + grid.x]
+                if string_mode:
+                    if code == quote:
+                        string_mode = grid.string_mode = False
+                    else:
+                        push(code)
+                elif code == quote:
+                    string_mode = grid.string_mode = True
+                elif (table[code] if code < TABLE_SIZE else invalid)():
+                    return True
+                grid.y, grid.x = next_cells[grid.direction][
+                    grid.y * width + grid.x]
+        steps = max_steps
+        return False
+    finally:
+        grid.steps += steps
@@ -82,11 +82,125 @@ class GridIsNotDefinedError(Exception):
         super().__init__(self.message)
 
 
+class UnknownEngineError(Exception):
+    """Exception raised for running the grid with nonexistent engine"""
+
+    def __init__(self, engine):
+        self.message = f"The execution engine '{engine}' doesn't exist"
+        super().__init__(self.message)
+
+
+class FungeSpaceIsNotSupportedError(Exception):
+    """Exception raised for running funge98 grid with playfield tools"""
+
+    def __init__(self, tool):
+        self.message = f"The {tool} doesn't support funge98 grid"
+        super().__init__(self.message)
+
+
+class WrongEofModeError(Exception):
+    """Exception raised for using wrong end of input mode"""
+
+    def __init__(self, mode):
+        self.message = f"The end of input mode '{mode}' is wrong, " \
+                       "should be 'push' or 'reflect'"
+        super().__init__(self.message)
+
+
+class WrongStackModeError(Exception):
+    """Exception raised for using wrong stack mode"""
+
+    def __init__(self, mode):
+        self.message = f"The stack mode '{mode}' is wrong, " \
+                       "should be 'list', 'int32' or 'int64'"
+        super().__init__(self.message)
+
+
+class InfiniteLoopError(Exception):
+    """Exception raised for the program found to never stop.
+    Cycle of cycle_length steps starts at the cell y, x"""
+
+    def __init__(self, cycle_length, y, x):
+        self.cycle_length = cycle_length
+        self.y = y
+        self.x = x
+        self.message = f"The program loops forever: cycle of " \
+                       f"{cycle_length} steps at Y: {y}, X: {x}"
+        super().__init__(self.message)
+
+
+class WrongSnapshotError(Exception):
+    """Exception raised for restoring the grid from broken snapshot"""
+
+    def __init__(self, reason):
+        self.message = f"The snapshot can't be restored: {reason}"
+        super().__init__(self.message)
+
+
+class InputIsNotReadyError(Exception):
+    """Exception raised by non-blocking input source, which has
+    no data for '~' or '&' yet. Command is evaluated again,
+    when the run is continued"""
+
+    def __init__(self):
+        self.message = "The input source has no data yet"
+        super().__init__(self.message)
+
+
+class QuotaExceededError(Exception):
+    """Parent exception for the run stopped by befunge.quotas.
+    Run stopped inside the command isn't resumable"""
+
+    def __init__(self, message, limit, resumable=True):
+        self.limit = limit
+        self.resumable = resumable
+        self.message = "The quota of the run is exceeded.\n" + message
+        super().__init__(self.message)
+
+
+class StepQuotaExceededError(QuotaExceededError):
+    """Exception raised for the run executing too many commands"""
+
+    def __init__(self, limit):
+        super().__init__(f"More than {limit} steps are executed", limit)
+
+
+class StackQuotaExceededError(QuotaExceededError):
+    """Exception raised for the stack growing too deep"""
+
+    def __init__(self, limit):
+        super().__init__(f"The stack is deeper than {limit} elements",
+                         limit)
+
+
+class OutputQuotaExceededError(QuotaExceededError):
+    """Exception raised for the run writing too much output"""
+
+    def __init__(self, limit):
+        super().__init__(f"More than {limit} characters are written", limit)
+
+
+class IntegerQuotaExceededError(QuotaExceededError):
+    """Exception raised for the number on the stack growing too large"""
+
+    def __init__(self, limit, resumable=True):
+        super().__init__(f"The number on the stack is out of "
+                         f"-{limit}..{limit}", limit, resumable)
+
+
+class TimeQuotaExceededError(QuotaExceededError):
+    """Exception raised for the run lasting too long"""
+
+    def __init__(self, limit, resumable=True):
+        super().__init__(f"The run lasted more than {limit} seconds", limit,
+                         resumable)
+
+
 class BefungeError(Exception):
     """Base Exception for any befunge errors"""
 
     def __init__(self, message, grid):
-        command = grid.grid[grid.y][grid.x]
+        command = grid.grid.char(grid.y, grid.x)
         super().__init__(f"{message} [ {command} ] at Y: {str(grid.y)},"
                          f"X:{str(grid.x)}")
 
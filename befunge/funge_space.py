@@ -0,0 +1,163 @@
+"""Unbounded sparse Funge-Space for funge98 mode of befunge grid.
+Cells are kept in square pages of PAGE_SIZE×PAGE_SIZE codes, stored
+in a dict by page coordinates and allocated at the first write,
+so memory grows with the part of the space, that is used.
+Code can be of any size and rows can have different length.
+Bounding box covers every written cell and coordinates can be negative.
+Moving over the edge of the box wraps around to its opposite edge,
+which is Lahey-space wrapping for the four cardinal directions."""
+
+from array import array
+from befunge.befunge_grid import RIGHT, DOWN, LEFT, UP, step_range
+from befunge.dispatch_engine import build_table, TABLE_SIZE
+from befunge.playfield import CELL_TYPE, MAX_CELL
+
+PAGE_SHIFT = 6
+PAGE_SIZE = 1 << PAGE_SHIFT
+PAGE_MASK = PAGE_SIZE - 1
+SPACE = ord(" ")
+
+
+class FungeSpace:
+    """Class for page-backed Funge-Space.
+    Interface follows befunge.playfield.Playfield where it can:
+    rows are indexed by y and cover the bounding box."""
+
+    def __init__(self, rows=()):
+        self.pages = {}
+        self.min_y = self.min_x = 0
+        self.max_y = self.max_x = 0
+        for y, row in enumerate(rows):
+            for x, char in enumerate(row):
+                if char != " ":
+                    self.put(y, x, ord(char))
+                else:
+                    self._include(y, x)
+
+    @property
+    def height(self):
+        return self.max_y - self.min_y + 1
+
+    @property
+    def width(self):
+        return self.max_x - self.min_x + 1
+
+    def _include(self, y, x):
+        """Inner method for growing the bounding box up to the cell"""
+        if y < self.min_y:
+            self.min_y = y
+        elif y > self.max_y:
+            self.max_y = y
+        if x < self.min_x:
+            self.min_x = x
+        elif x > self.max_x:
+            self.max_x = x
+
+    def cell(self, y, x):
+        """Method for the code of the cell, space for unused cells"""
+        page = self.pages.get((y >> PAGE_SHIFT, x >> PAGE_SHIFT))
+        if page is None:
+            return SPACE
+        return page[(y & PAGE_MASK) << PAGE_SHIFT | x & PAGE_MASK]
+
+    def char(self, y, x):
+        """Method for the character of the cell"""
+        return chr(self.cell(y, x))
+
+    def get(self, y, x):
+        """Method for the code of the cell for 'g'.
+        Every coordinate is valid in Funge-Space."""
+        return self.cell(y, x)
+
+    def put(self, y, x, value):
+        """Method for changing the cell, allocating its page if needed.
+        Value has to be a valid character code.
+        Funge-Space has no flat index, so None is returned."""
+        if not 0 <= value < MAX_CELL:
+            raise ValueError("chr() arg not in range(0x110000)")
+        key = (y >> PAGE_SHIFT, x >> PAGE_SHIFT)
+        page = self.pages.get(key)
+        if page is None:
+            if value == SPACE:
+                self._include(y, x)
+                return None
+            page = array(CELL_TYPE, [SPACE]) * (PAGE_SIZE * PAGE_SIZE)
+            self.pages[key] = page
+        page[(y & PAGE_MASK) << PAGE_SHIFT | x & PAGE_MASK] = value
+        self._include(y, x)
+        return None
+
+    def __getitem__(self, y):
+        return "".join(self.char(y, x)
+                       for x in range(self.min_x, self.max_x + 1))
+
+    def __len__(self):
+        return self.height
+
+    def __iter__(self):
+        for y in range(self.min_y, self.max_y + 1):
+            yield self[y]
+
+    def __eq__(self, other):
+        if isinstance(other, FungeSpace):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"FungeSpace({list(self)!r})"
+
+
+def move(grid):
+    """Function for moving over the bounding box of Funge-Space"""
+    space = grid.grid
+    direction = grid.direction
+    if direction == RIGHT:
+        grid.x = grid.x + 1 if grid.x < space.max_x else space.min_x
+    elif direction == DOWN:
+        grid.y = grid.y + 1 if grid.y < space.max_y else space.min_y
+    elif direction == LEFT:
+        grid.x = grid.x - 1 if grid.x > space.min_x else space.max_x
+    elif direction == UP:
+        grid.y = grid.y - 1 if grid.y > space.min_y else space.max_y
+
+
+def execute(grid, debug=False, max_steps=None):
+    """Function for running Funge-Space grid with the dispatch table.
+    The page of the current cell is looked up again only when
+    the cell is on the other page or the page wasn't allocated.
+    Returns True if the program stopped, False if max_steps ran out."""
+    table, invalid = build_table(grid)
+    push = grid.stack.append
+    move_grid = grid._move
+    pages = grid.grid.pages
+    quote = ord('"')
+    steps = 0
+    key = None
+    page = None
+    try:
+        for steps in step_range(max_steps):
+            y = grid.y
+            x = grid.x
+            if page is None or (y >> PAGE_SHIFT, x >> PAGE_SHIFT) != key:
+                key = (y >> PAGE_SHIFT, x >> PAGE_SHIFT)
+                page = pages.get(key)
+            if page is None:
+                code = SPACE
+            else:
+                code = page[(y & PAGE_MASK) << PAGE_SHIFT | x & PAGE_MASK]
+            if debug:
+                grid._print_debug(chr(code))
+            if grid.string_mode:
+                if code == quote:
+                    grid.string_mode = False
+                else:
+                    push(code)
+            elif (table[code] if code < TABLE_SIZE else invalid)():
+                return True
+            move_grid()
+        steps = max_steps
+        return False
+    finally:
+        grid.steps += steps
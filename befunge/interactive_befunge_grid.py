@@ -1,39 +1,125 @@
 """Subclass for interactive befunge interpreter.
-Stack contains only int numbers"""
+Stack contains only int numbers.
+Rows of the code are read from a row source of befunge.streams
+only when the instruction pointer moves to the row,
+that wasn't received yet. Next cell tables grow with the rows."""
 
-from typing import List
-from befunge.befunge_grid import BefungeGrid
+from befunge.befunge_grid import BefungeGrid, RunStatus, \
+    DEFAULT_YIELD_EVERY, DOWN, UP, next_cell_tables
+from befunge.playfield import Playfield
 from befunge.interactive_exceptions import *
-from befunge.exceptions import CodeFileIsNotRectangleError
+from befunge.exceptions import CodeFileIsNotRectangleError, \
+    InputIsNotReadyError
+from befunge.streams import AsyncRows, ConsoleRows, IteratorRows, \
+    DEFAULT_PREFETCH
 
 
 class IABefungeGrid(BefungeGrid):
     """Class for interactive Befunge grid"""
-    stack: List[int]
+    stack: list[int]
 
-    def __init__(self):
-        super().__init__()
-        self.grid = []
+    def __init__(self, legacy_put=True, output=None, input_source=None,
+                 eof="push", seed=None, rows=None,
+                 prefetch=DEFAULT_PREFETCH, stack_mode="list",
+                 stack_capacity=None):
+        """Rows are the code rows: input() by default, any iterator
+        of strings or bytes, which is prefetched in a background thread,
+        or async iterator, e.g. asyncio.StreamReader, for run_async.
+        Code ends at the empty row or at the end of rows."""
+        super().__init__(legacy_put, output, input_source, eof, seed=seed,
+                         stack_mode=stack_mode,
+                         stack_capacity=stack_capacity)
+        self.grid = Playfield()
         self.grid_complete = False
+        self.pending_moves = 0
+        self.bridging = False
+        if rows is None:
+            self.rows = ConsoleRows()
+        elif hasattr(rows, "read_row"):
+            self.rows = rows
+        elif hasattr(rows, "__aiter__"):
+            self.rows = AsyncRows(rows)
+        else:
+            self.rows = IteratorRows(rows, prefetch)
 
-    def run(self, debug=False):
+    def run(self, debug=False, engine="classic", max_steps=None,
+            profile=None, detect_loops=None, trace=None, quotas=None):
         """Endless loop of program interpretation
         If debug=True, every command prints:
          - current command,
          - coordinates,
          - string mode
-         - full stack"""
-        self.make_grid()
-        while True:
-            if self.evaluate(self.grid[self.y][self.x], debug):
-                continue
-            break
+         - full stack
+        Run, paused by max_steps, continues without asking for a row."""
+        if not self.paused:
+            self.make_grid()
+        return self._execute(debug, engine, max_steps, profile, detect_loops,
+                             trace, quotas)
+
+    def run_for(self, max_steps, engine="classic", debug=False):
+        """Method for executing at most max_steps commands,
+        see BefungeGrid.run_for.
+        Run, paused by max_steps, continues without asking for a row."""
+        if not self.paused:
+            try:
+                self.make_grid()
+            except InputIsNotReadyError:
+                return RunStatus(RunStatus.NEEDS_INPUT, 0)
+        return super().run_for(max_steps, engine, debug)
+
+    async def run_async(self, debug=False, engine="classic",
+                        yield_every=DEFAULT_YIELD_EVERY, max_steps=None):
+        """Coroutine of program interpretation for asyncio code,
+        see BefungeGrid.run_async. Async rows are prefetched
+        by a task of the event loop and awaited, when the instruction
+        pointer reaches the row, that wasn't received yet.
+        Run, paused by max_steps, continues without asking for a row."""
+        if isinstance(self.rows, AsyncRows):
+            self.rows.start()
+        while not self.paused:
+            try:
+                self.make_grid()
+                break
+            except InputIsNotReadyError:
+                await self.rows.wait()
+        return await super().run_async(debug, engine, yield_every,
+                                       max_steps)
+
+    async def _wait_input(self):
+        """Inner coroutine awaiting the row or the input
+        for the paused command"""
+        if self.pending_moves:
+            await self.rows.wait()
+        else:
+            await super()._wait_input()
+
+    def _execute(self, debug, engine, max_steps=None, profile=None,
+                 detect_loops=None, trace=None, quotas=None):
+        """Inner method for running the program with the chosen engine.
+        Command, which move waited for the row, is finished first."""
+        if self.pending_moves:
+            try:
+                while self.pending_moves:
+                    self._move()
+                    self.pending_moves -= 1
+            except InputIsNotReadyError:
+                self.paused = True
+                raise
+            self.steps += 1
+            if max_steps is not None:
+                max_steps -= 1
+                if max_steps <= 0:
+                    self.paused = True
+                    return False
+        return super()._execute(debug, engine, max_steps, profile,
+                                detect_loops, trace, quotas)
 
     def make_grid(self):
         """Method for creating and making the interactive grid.
-        Every string is provided by user.
+        Every string is provided by the row source, user by default.
         If empty string is provided, the grid is complete."""
-        row = input()
+        self.output.flush()
+        row = self.rows.read_row()
         if row:
             if not self.grid_complete:
                 if self.code_width:
@@ -46,6 +132,7 @@ class IABefungeGrid(BefungeGrid):
                     self.code_width = len(row)
                     self.grid.append(row)
                     self.code_height += 1
+                self._add_row_moves()
             else:
                 raise CompleteIAGridAlterationError
         else:
@@ -53,22 +140,62 @@ class IABefungeGrid(BefungeGrid):
             if not self.grid:
                 raise IAGridIsNotDefinedError
 
+    def _bridge(self):
+        """Inner method for '#', which move can wait for two rows"""
+        self.bridging = True
+        try:
+            self._move()
+        finally:
+            self.bridging = False
+
+    def _fit_moves(self):
+        """Inner method for the next cell tables of the grid size,
+        kept in lists to be changed by the next rows"""
+        self.next_cells = [list(table) for table in
+                           next_cell_tables(self.code_height,
+                                            self.code_width)]
+
+    def _add_row_moves(self):
+        """Inner method for adding the last received row to the next cell
+        tables. Moves down from the previous last row and up from
+        the first row lead to the new row now."""
+        height = self.code_height
+        width = self.code_width
+        if height == 1:
+            self._fit_moves()
+            return
+        y = height - 1
+        row = [(y, x) for x in range(width)]
+        right, down, left, up = self.next_cells
+        right.extend(row[(x + 1) % width] for x in range(width))
+        down.extend((0, x) for x in range(width))
+        left.extend(row[x - 1] for x in range(width))
+        up.extend((y - 1, x) for x in range(width))
+        above = (y - 1) * width
+        down[above:above + width] = row
+        up[:width] = row
+
     def _move(self):
-        """Inner method for moving over grid.
-        If grid is not complete and moving over the hedge is needed,
-        the program asks for user input"""
-        if self.move_direction == "v":
-            if not self.grid_complete:     # if grid is not complete
-                self.make_grid()           # one row of code is required
-            self.y = (self.y + 1) % self.code_height
-        elif self.move_direction == ">":
-            self.x = (self.x + 1) % self.code_width
-        elif self.move_direction == "^":
-            while not self.grid_complete:  # until grid is complete
-                self.make_grid()           # ask for another row of code
-            else:
-                self.y = self.code_height - 1 if self.y == 0 else self.y - 1
-        elif self.move_direction == "<":
-            self.x = self.code_width - 1 if self.x == 0 else self.x - 1
-        else:
-            pass
+        """Inner method for moving over grid by the next cell table.
+        If grid is not complete and the next cell is on the row,
+        that wasn't received yet, the row is read from the row source"""
+        if not self.grid_complete:
+            if self.direction == DOWN and self.y + 1 >= self.code_height:
+                self._wait_rows(self.y + 2)
+            elif self.direction == UP and self.y == 0:
+                self._wait_rows(None)      # the last row is needed
+        self.y, self.x = self.next_cells[self.direction][
+            self.y * self.code_width + self.x]
+
+    def _wait_rows(self, height):
+        """Inner method for reading rows until the grid has height rows
+        or is complete, for height None until it is complete.
+        Async row source without the row makes the move pending."""
+        try:
+            while not self.grid_complete and \
+                    (height is None or self.code_height < height):
+                self.make_grid()
+        except InputIsNotReadyError:
+            self.pending_moves = max(self.pending_moves,
+                                     2 if self.bridging else 1)
+            raise
@@ -0,0 +1,124 @@
+"""Infinite loop detector of befunge grid execution.
+While no I/O, 'p' or '?' is executed, the next state of the program
+depends only on (y, x, direction, string mode, stack), so the same
+state met twice proves that the program never stops.
+States are remembered only at checkpoints: direction commands, bridges
+and cells of the first row and column. Every cycle on the torus
+either changes direction or wraps around through one of them.
+Only bounded fingerprints of states are remembered, a fingerprint seen
+twice makes the state a candidate, and the loop is reported, when the
+exact candidate state is met again."""
+
+from befunge.befunge_grid import step_range
+from befunge.dispatch_engine import build_table, TABLE_SIZE
+from befunge.dispatch_engine import execute as execute_table
+from befunge.exceptions import InfiniteLoopError
+
+DEFAULT_CACHE_SIZE = 65536
+FINGERPRINT_DEPTH = 16
+CHECKPOINT_COMMANDS = "><^v|_#"
+RESET_COMMANDS = "?~&p.,"
+
+
+class LoopDetector:
+    """Class for the bounded cache of seen states.
+    Fingerprints of states map to the step, on which they were seen.
+    Fingerprint is the hash of the position, direction, string mode,
+    stack depth and FINGERPRINT_DEPTH top numbers, so a check doesn't
+    depend on the stack size. Only the candidate state is kept in full.
+    The cache is emptied, when it holds cache_size fingerprints
+    or the state stops being deterministic."""
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.states = {}
+        self.checks = 0
+        self.candidate = None
+        self.window = 0
+
+    def reset(self):
+        """Method for forgetting all seen states"""
+        self.states.clear()
+        self.candidate = None
+        self.window = 0
+
+    @staticmethod
+    def _state(grid):
+        """Inner method for the full state of the grid"""
+        return (grid.y, grid.x, grid.direction, grid.string_mode,
+                tuple(grid.stack))
+
+    def check(self, grid, step):
+        """Method for remembering the state of the grid at the step.
+        Raises InfiniteLoopError if the candidate state is met again.
+        Candidate is replaced only after twice the distance between
+        its fingerprints, and the distance only grows, so a cycle
+        of any length gets its candidate confirmed."""
+        self.checks += 1
+        stack = grid.stack
+        key = hash((grid.y, grid.x, grid.direction, grid.string_mode,
+                    len(stack), tuple(stack[-FINGERPRINT_DEPTH:])))
+        candidate = self.candidate
+        if candidate is not None and candidate[0] == key \
+                and candidate[1] == self._state(grid):
+            raise InfiniteLoopError(step - candidate[2], grid.y, grid.x)
+        seen = self.states.get(key)
+        if seen is not None and (candidate is None
+                                 or step > candidate[2] + self.window):
+            self.window = max(2 * (step - seen), 2 * self.window)
+            self.candidate = (key, self._state(grid), step)
+        if len(self.states) >= self.cache_size:
+            self.states.clear()
+        self.states[key] = step
+
+
+def execute(grid, detector, debug=False, max_steps=None):
+    """Function for running the grid with the dispatch table,
+    checking the state with the detector at every checkpoint.
+    Returns True if the program stopped, False if max_steps ran out.
+    Incomplete interactive grid can get new rows at any step,
+    so it is run by the dispatch table engine without checks."""
+    if not grid.grid_complete:
+        return execute_table(grid, debug, max_steps)
+    table, invalid = build_table(grid)
+    checkpoints = bytearray(TABLE_SIZE)
+    for command in CHECKPOINT_COMMANDS:
+        checkpoints[ord(command)] = 1
+    resets = bytearray(TABLE_SIZE)
+    for command in RESET_COMMANDS:
+        resets[ord(command)] = 1
+    push = grid.stack.append
+    move = grid._move
+    check = detector.check
+    cells = grid.grid.cells
+    offsets = grid.grid.offsets
+    quote = ord('"')
+    steps = 0
+    try:
+        for steps in step_range(max_steps):
+            y = grid.y
+            x = grid.x
+            code = cells[offsets[y] + x]
+            if debug:
+                grid._print_debug(chr(code))
+            if grid.string_mode:
+                if not (x and y):
+                    check(grid, grid.steps + steps)
+                if code == quote:
+                    grid.string_mode = False
+                else:
+                    push(code)
+            elif code >= TABLE_SIZE:
+                return invalid()
+            else:
+                if resets[code]:
+                    detector.reset()
+                elif checkpoints[code] or not (x and y):
+                    check(grid, grid.steps + steps)
+                if table[code]():
+                    return True
+            move()
+        steps = max_steps
+        return False
+    finally:
+        grid.steps += steps
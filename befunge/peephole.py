@@ -0,0 +1,89 @@
+"""Peephole optimizer of compiled blocks.
+Ops of a block are rewritten with the values, that are known
+at compile time: pushed digits and string mode characters.
+ - runs of pushes become one stack.extend,
+ - arithmetic, '!', ':', '\\' and '$' on known values are folded,
+   unless the result leaves the 32-bit range, where typed stacks
+   wrap numbers,
+ - '.' and ',' of known values become constant text, and adjacent
+   texts are merged into one write,
+ - runs of '$' on unknown values become one slice deletion.
+Known values are pushed right before the first op, that needs
+the real stack, so stack and output are the same as without
+the optimizer, even if that op raises."""
+
+from befunge.playfield import MAX_CELL
+
+FOLDED = {"+": lambda a, b: a + b, "-": lambda a, b: a - b,
+          "*": lambda a, b: a * b, "/": lambda a, b: a // b,
+          "%": lambda a, b: a % b, "`": lambda a, b: 1 if b > a else 0}
+FOLD_MIN = -2 ** 31
+FOLD_MAX = 2 ** 31 - 1
+
+
+def _fold(command, a, b):
+    """Inner function for the folded value of the command,
+    None if it is out of the 32-bit range"""
+    try:
+        value = FOLDED[command](a, b)
+    except ZeroDivisionError:
+        return 0
+    return value if FOLD_MIN <= value <= FOLD_MAX else None
+
+
+def optimize(ops):
+    """Function for the optimized list of block ops.
+    New kinds of ops are ('extend', values), ('write', text)
+    and ('drop', count)."""
+    result = []
+    known = []
+    first = 0
+
+    def emit(kind, argument, index):
+        if kind == "write" and result and result[-1][0] == "write":
+            last = result.pop()
+            argument = last[1] + argument
+            index = last[2]
+        elif kind == "drop" and result and result[-1][0] == "drop":
+            last = result.pop()
+            argument = last[1] + argument
+            index = last[2]
+        result.append((kind, argument, index))
+
+    def flush():
+        if len(known) == 1:
+            result.append(("push", known[0], first))
+        elif known:
+            result.append(("extend", tuple(known), first))
+        known.clear()
+
+    for kind, argument, index in ops:
+        if kind == "push":
+            if not known:
+                first = index
+            known.append(argument)
+            continue
+        folded = _fold(argument, known[-1], known[-2]) \
+            if argument in FOLDED and len(known) >= 2 else None
+        if folded is not None:
+            del known[-2:]
+            known.append(folded)
+        elif argument == "!" and known:
+            known.append(0 if known.pop() else 1)
+        elif argument == ":" and known:
+            known.append(known[-1])
+        elif argument == "\\" and len(known) >= 2:
+            known[-1], known[-2] = known[-2], known[-1]
+        elif argument == "$" and known:
+            known.pop()
+        elif argument == "$":
+            emit("drop", 1, index)
+        elif argument == "." and known:
+            emit("write", f"{known.pop()} ", index)
+        elif argument == "," and known and 0 <= known[-1] < MAX_CELL:
+            emit("write", chr(known.pop()), index)
+        else:
+            flush()
+            result.append((kind, argument, index))
+    flush()
+    return result
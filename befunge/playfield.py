@@ -0,0 +1,91 @@
+"""Mutable playfield of befunge grid.
+Cells are stored as codes in one flat array with precomputed row offsets,
+so 'p' and 'g' change and read a single cell without rebuilding rows.
+Indexing by row gives the row as a string, like the list of strings
+used before."""
+
+from array import array
+
+CELL_TYPE = "I"
+MAX_CELL = 0x110000
+
+
+class Playfield:
+    """Class for flat array-backed playfield"""
+
+    def __init__(self, rows=()):
+        self.cells = array(CELL_TYPE)
+        self.offsets = []
+        self.width = 0
+        self.height = 0
+        for row in rows:
+            self.append(row)
+
+    def append(self, row):
+        """Method for adding the row to the bottom of the playfield.
+        Width is taken from the first row, rows are expected to be
+        validated by the grid."""
+        if not self.height:
+            self.width = len(row)
+        self.offsets.append(len(self.cells))
+        self.cells.extend(ord(char) for char in row)
+        self.height += 1
+
+    def index(self, y, x):
+        """Method for the flat index of the cell.
+        Negative coordinates count from the end, like list indexing,
+        coordinates out of the playfield raise IndexError."""
+        if y < 0:
+            y += self.height
+        if x < 0:
+            x += self.width
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise IndexError("playfield index out of range")
+        return self.offsets[y] + x
+
+    def cell(self, y, x):
+        """Method for the code of the cell"""
+        return self.cells[self.offsets[y] + x]
+
+    def char(self, y, x):
+        """Method for the character of the cell"""
+        return chr(self.cells[self.offsets[y] + x])
+
+    def get(self, y, x):
+        """Method for the code of the cell with list-like indexing"""
+        return self.cells[self.index(y, x)]
+
+    def put(self, y, x, value):
+        """Method for changing the cell with list-like indexing.
+        Value has to be a valid character code.
+        Returns the flat index of the changed cell."""
+        if not 0 <= value < MAX_CELL:
+            raise ValueError("chr() arg not in range(0x110000)")
+        index = self.index(y, x)
+        self.cells[index] = value
+        return index
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("playfield index out of range")
+        start = self.offsets[y]
+        return "".join(map(chr, self.cells[start:start + self.width]))
+
+    def __len__(self):
+        return self.height
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield self[y]
+
+    def __eq__(self, other):
+        if isinstance(other, Playfield):
+            return self.width == other.width and self.cells == other.cells
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Playfield({list(self)!r})"
@@ -0,0 +1,142 @@
+"""Profiler of befunge grid execution.
+Counts executions of every cell and every opcode, direction changes
+and wrap-arounds of the torus in arrays sized by the grid.
+Profile can be exported to JSON or as a text heat map
+next to the source code."""
+
+import json
+from array import array
+from befunge.befunge_grid import RIGHT, DOWN, LEFT, UP, step_range
+from befunge.dispatch_engine import build_table, TABLE_SIZE
+
+SHADES = " .:-=+*#%@"
+
+
+class Profile:
+    """Class for execution counters of one program.
+    Cell counters are laid out by rows of the grid width and grow
+    with the rows of interactive grid."""
+
+    def __init__(self):
+        self.cells = array("Q")
+        self.width = 0
+        self.height = 0
+        self.opcodes = array("Q", bytes(8 * TABLE_SIZE))
+        self.string_pushes = 0
+        self.direction_changes = 0
+        self.wraps = 0
+        self.steps = 0
+        self.source = []
+
+    def fit(self, height, width):
+        """Method for making room for counters of the grid.
+        Profile collected for a grid of other width can't be reused."""
+        if self.height and width != self.width:
+            raise ValueError(f"profile of width {self.width} "
+                             f"can't count grid of width {width}")
+        self.width = width
+        if height > self.height:
+            self.cells.extend(bytes(8 * (height - self.height) * width))
+            self.height = height
+
+    def cell_count(self, y, x):
+        """Method for the number of executions of the cell"""
+        return self.cells[y * self.width + x]
+
+    def hot_cells(self, limit=10):
+        """Method for the list of (count, y, x) of the most executed cells"""
+        counts = [(count, *divmod(index, self.width))
+                  for index, count in enumerate(self.cells) if count]
+        counts.sort(key=lambda item: (-item[0], item[1], item[2]))
+        return counts[:limit]
+
+    def to_dict(self):
+        """Method for the profile as a JSON-compatible dict"""
+        return {"steps": self.steps,
+                "string_pushes": self.string_pushes,
+                "direction_changes": self.direction_changes,
+                "wraps": self.wraps,
+                "opcodes": {chr(code): count
+                            for code, count in enumerate(self.opcodes)
+                            if count},
+                "cells": [[count, y, x] for count, y, x
+                          in self.hot_cells(len(self.cells))]}
+
+    def to_json(self, **kwargs):
+        """Method for the profile as JSON text"""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def heat_map(self):
+        """Method for the text heat map.
+        Every source row is shown with its heat row on the right,
+        where shade of the cell grows from ' ' (never executed)
+        to '@' (the hottest)."""
+        hottest = max(self.cells, default=0) or 1
+        lines = []
+        for y, row in enumerate(self.source):
+            heat = []
+            for x in range(len(row)):
+                count = self.cells[y * self.width + x]
+                if count:
+                    level = 1 + (len(SHADES) - 2) * count // hottest
+                    heat.append(SHADES[level])
+                else:
+                    heat.append(SHADES[0])
+            lines.append(f"{row} | {''.join(heat)}")
+        return "\n".join(lines)
+
+
+def execute(grid, profile, debug=False, max_steps=None):
+    """Function for running the grid with the dispatch table,
+    collecting counters into the profile.
+    Returns True if the program stopped, False if max_steps ran out."""
+    table, invalid = build_table(grid)
+    push = grid.stack.append
+    move = grid._move
+    cells = grid.grid.cells
+    offsets = grid.grid.offsets
+    profile.fit(grid.code_height, grid.code_width)
+    counters = profile.cells
+    width = profile.width
+    opcodes = profile.opcodes
+    quote = ord('"')
+    steps = 0
+    try:
+        for steps in step_range(max_steps):
+            y = grid.y
+            x = grid.x
+            code = cells[offsets[y] + x]
+            index = y * width + x
+            if index >= len(counters):
+                profile.fit(grid.code_height, grid.code_width)
+            counters[index] += 1
+            if debug:
+                grid._print_debug(chr(code))
+            direction = grid.direction
+            if grid.string_mode:
+                if code == quote:
+                    opcodes[code] += 1
+                    grid.string_mode = False
+                else:
+                    profile.string_pushes += 1
+                    push(code)
+            else:
+                if code < TABLE_SIZE:
+                    opcodes[code] += 1
+                if (table[code] if code < TABLE_SIZE else invalid)():
+                    return True
+                if grid.direction != direction:
+                    profile.direction_changes += 1
+                    direction = grid.direction
+            move()
+            if direction == RIGHT and grid.x < x or \
+                    direction == LEFT and grid.x > x or \
+                    direction == DOWN and grid.y < y or \
+                    direction == UP and grid.y > y:
+                profile.wraps += 1
+        steps = max_steps
+        return False
+    finally:
+        grid.steps += steps
+        profile.steps += steps
+        profile.source = list(grid.grid)
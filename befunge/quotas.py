@@ -0,0 +1,153 @@
+"""Resource quotas for sandboxed runs of untrusted programs.
+Run with quotas is executed by the chosen engine in slices of
+check_every steps, and the limits are checked between the slices,
+so the hot loop of the engine stays the same.
+Checked limits are:
+ - max_steps: commands executed by the run,
+ - max_stack: depth of the stack,
+ - max_output: characters written by the run, the output has to be
+   befunge.streams.OutputSink,
+ - max_int: magnitude of every number on the stack,
+ - time_limit: wall-clock seconds of the run.
+Each violation raises its own QuotaExceededError. Limits are exact for
+steps, others can be overrun within one slice, smaller check_every
+makes the overrun smaller.
+Numbers of the list stack can grow without bound within one slice,
+e.g. by repeated ':*', and each step gets slower with them, so the list
+stack is replaced by QuotaStack for the run. It checks max_int
+at every push and time_limit at every push of a large number,
+then only a single command with large numbers can overrun the time.
+Error of QuotaStack stops the run inside the command, which operands
+are popped already, so such run isn't paused. Run stopped by a quota
+between slices is paused and can be continued, e.g. with larger quotas.
+"""
+
+import time
+from befunge.exceptions import *
+
+DEFAULT_CHECK_EVERY = 4096
+LARGE_NUMBER = 2 ** 64
+
+
+class Quotas:
+    """Class for the limits of one run, None is no limit"""
+
+    def __init__(self, max_steps=None, max_stack=None, max_output=None,
+                 max_int=None, time_limit=None,
+                 check_every=DEFAULT_CHECK_EVERY):
+        if check_every < 1:
+            raise ValueError("check_every must be positive")
+        self.max_steps = max_steps
+        self.max_stack = max_stack
+        self.max_output = max_output
+        self.max_int = max_int
+        self.time_limit = time_limit
+        self.check_every = check_every
+
+    def __repr__(self):
+        limits = ", ".join(f"{name}={value!r}" for name, value in (
+            ("max_steps", self.max_steps), ("max_stack", self.max_stack),
+            ("max_output", self.max_output), ("max_int", self.max_int),
+            ("time_limit", self.time_limit)) if value is not None)
+        return f"Quotas({limits})"
+
+    def check(self, grid, written, deadline):
+        """Method for raising the error of the first exceeded limit
+        except steps"""
+        stack = grid.stack
+        if self.max_stack is not None and len(stack) > self.max_stack:
+            raise StackQuotaExceededError(self.max_stack)
+        if self.max_output is not None and written > self.max_output:
+            raise OutputQuotaExceededError(self.max_output)
+        if self.max_int is not None and stack and \
+                (max(stack) > self.max_int or min(stack) < -self.max_int):
+            raise IntegerQuotaExceededError(self.max_int)
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeQuotaExceededError(self.time_limit)
+
+
+class QuotaStack(list):
+    """Class for the list stack checking the pushed numbers.
+    Number out of -limit..limit raises IntegerQuotaExceededError,
+    number out of -LARGE_NUMBER..LARGE_NUMBER after the deadline
+    raises TimeQuotaExceededError"""
+    raises_on_push = True
+
+    def __init__(self, values, quotas, deadline):
+        super().__init__(values)
+        self.quotas = quotas
+        self.deadline = deadline
+        self.bound = LARGE_NUMBER if quotas.max_int is None else \
+            min(quotas.max_int, LARGE_NUMBER)
+
+    def append(self, value):
+        """Method for pushing the checked number"""
+        if not -self.bound <= value <= self.bound:
+            self._check(value)
+        super().append(value)
+
+    def extend(self, values):
+        """Method for pushing every checked number"""
+        for value in values:
+            self.append(value)
+
+    def _check(self, value):
+        """Inner method for raising the error of the number
+        out of the bound"""
+        limit = self.quotas.max_int
+        if limit is not None and not -limit <= value <= limit:
+            raise IntegerQuotaExceededError(limit, resumable=False)
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise TimeQuotaExceededError(self.quotas.time_limit,
+                                         resumable=False)
+
+
+def execute(grid, quotas, debug=False, engine="classic", max_steps=None,
+            profile=None, detect_loops=None, trace=None):
+    """Function for running the grid under the quotas.
+    Returns True if the program stopped, False if max_steps ran out."""
+    deadline = None if quotas.time_limit is None else \
+        time.monotonic() + quotas.time_limit
+    if quotas.max_output is not None and \
+            not hasattr(grid.output, "written"):
+        raise TypeError("output quota needs befunge.streams.OutputSink")
+    checked = type(grid.stack) is list and \
+        (quotas.max_int is not None or deadline is not None)
+    if checked:
+        grid.stack = QuotaStack(grid.stack, quotas, deadline)
+    try:
+        return _run_slices(grid, quotas, deadline, debug, engine, max_steps,
+                           profile, detect_loops, trace)
+    finally:
+        if checked:
+            grid.stack = list(grid.stack)
+
+
+def _run_slices(grid, quotas, deadline, debug, engine, max_steps, profile,
+                detect_loops, trace):
+    """Inner function for running the grid in slices
+    and checking the quotas between them"""
+    written = getattr(grid.output, "written", 0)
+    start = grid.steps
+    while True:
+        done = grid.steps - start
+        budget = quotas.check_every
+        if max_steps is not None:
+            if done >= max_steps:
+                return False
+            budget = min(budget, max_steps - done)
+        if quotas.max_steps is not None:
+            if done >= quotas.max_steps:
+                raise StepQuotaExceededError(quotas.max_steps)
+            budget = min(budget, quotas.max_steps - done)
+        stopped = grid._run_engine(debug, engine, budget, profile,
+                                   detect_loops, trace)
+        # the next slice continues with the same profile and trace
+        if profile is True:
+            profile = grid.profile
+        if trace is True:
+            trace = grid.trace
+        quotas.check(grid, getattr(grid.output, "written", 0) - written,
+                     deadline)
+        if stopped:
+            return True
@@ -0,0 +1,65 @@
+"""Seedable random directions for '?' command.
+Every grid has its own generator instead of the global random module.
+Directions are taken from a buffer, which is filled from
+BATCH_BYTES random bytes at once, every byte gives four directions
+by its 2-bit pieces, kept as indexes in '>v<^'.
+Seed and the number of draws define the state,
+so the generator can be restored after any draw."""
+
+import os
+from random import Random
+
+DIRECTIONS = ">v<^"
+BATCH_BYTES = 256
+BATCH_DRAWS = BATCH_BYTES * 4
+BYTE_DIRECTIONS = [bytes(byte >> shift & 3 for shift in (0, 2, 4, 6))
+                   for byte in range(256)]
+
+
+class DirectionRandom:
+    """Class for the generator of directions.
+    Without seed, a random one is taken from os.urandom,
+    so the run can be repeated with the seed anyway."""
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self.seed = seed
+        self.random = Random(seed)
+        self.buffer = b""
+        self.position = BATCH_DRAWS
+        self.draws = 0
+
+    @classmethod
+    def restore(cls, seed, draws):
+        """Method for the generator after draws directions
+        taken from the seed"""
+        rng = cls(seed)
+        batches, rest = divmod(draws, BATCH_DRAWS)
+        for _ in range(batches):
+            rng.random.getrandbits(BATCH_BYTES * 8)
+        if rest:
+            rng._fill()
+            rng.position = rest
+        rng.draws = draws
+        return rng
+
+    def _fill(self):
+        """Inner method for the next batch of directions"""
+        data = self.random.getrandbits(BATCH_BYTES * 8).to_bytes(
+            BATCH_BYTES, "little")
+        self.buffer = b"".join([BYTE_DIRECTIONS[byte] for byte in data])
+        self.position = 0
+
+    def index(self):
+        """Method for the next direction as its index in '>v<^'"""
+        if self.position >= BATCH_DRAWS:
+            self._fill()
+        index = self.buffer[self.position]
+        self.position += 1
+        self.draws += 1
+        return index
+
+    def direction(self):
+        """Method for the next direction character"""
+        return DIRECTIONS[self.index()]
@@ -0,0 +1,158 @@
+"""Compact binary snapshots of befunge grid state.
+Snapshot keeps the code, the stack, position, direction, string mode,
+executed steps, the number of consumed input characters
+and the seed with the number of draws of the '?' generator,
+so a long run can be continued in another process.
+Layout: magic, format version, then unsigned varints for the sizes,
+position and counters, the cells as raw bytes (1 or 4 bytes per cell)
+and the stack as zigzag varints, bottom first.
+Output isn't a part of the snapshot, the sink is flushed instead.
+Funge-Space of funge98 grid has no snapshot format."""
+
+import sys
+from array import array
+from befunge.exceptions import WrongSnapshotError
+from befunge.playfield import Playfield, CELL_TYPE
+from befunge.rng import DirectionRandom
+
+MAGIC = b"BFSN"
+VERSION = 2
+VERSIONS = (1, 2)
+DIRECTIONS = ">v<^"
+STRING_MODE = 1
+GRID_COMPLETE = 2
+PAUSED = 4
+
+
+def write_varint(out, value):
+    """Function for appending unsigned varint to bytearray"""
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, position):
+    """Function for reading unsigned varint.
+    Returns the value and the position after it."""
+    value = 0
+    shift = 0
+    while True:
+        try:
+            byte = data[position]
+        except IndexError:
+            raise WrongSnapshotError("data is cut off") from None
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def zigzag(value):
+    """Function for mapping signed int to unsigned, small near zero"""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    """Function for mapping zigzag value back to signed int"""
+    return value // 2 if not value & 1 else -(value + 1) // 2
+
+
+def dumps(grid):
+    """Function for the snapshot of the grid as bytes"""
+    if grid.funge98:
+        raise WrongSnapshotError("funge98 grid has no snapshot format")
+    grid.output.flush()
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    flags = (STRING_MODE if grid.string_mode else 0) | \
+        (GRID_COMPLETE if grid.grid_complete else 0) | \
+        (PAUSED if grid.paused else 0)
+    for value in (grid.code_height, grid.code_width, grid.y, grid.x,
+                  grid.direction, flags,
+                  grid.steps, grid.input_source.consumed,
+                  zigzag(grid.rng.seed), grid.rng.draws):
+        write_varint(out, value)
+    cells = grid.grid.cells
+    if max(cells, default=0) < 0x100:
+        out.append(1)
+        out += array("B", cells).tobytes()
+    else:
+        out.append(4)
+        wide = array(CELL_TYPE, cells)
+        if sys.byteorder == "big":
+            wide.byteswap()
+        out += wide.tobytes()
+    write_varint(out, len(grid.stack))
+    for value in grid.stack:
+        write_varint(out, zigzag(int(value)))
+    return bytes(out)
+
+
+def loads(grid, data):
+    """Function for restoring the grid from the snapshot.
+    Input source of the grid skips characters, that were consumed
+    before the snapshot and aren't consumed by the source yet.
+    Snapshot of version 1 has no generator state,
+    the generator of the grid is kept."""
+    if grid.funge98:
+        raise WrongSnapshotError("funge98 grid has no snapshot format")
+    if data[:len(MAGIC)] != MAGIC:
+        raise WrongSnapshotError("no snapshot header")
+    if len(data) <= len(MAGIC) or data[len(MAGIC)] not in VERSIONS:
+        raise WrongSnapshotError("unsupported snapshot version")
+    version = data[len(MAGIC)]
+    position = len(MAGIC) + 1
+    values = []
+    for _ in range(8 if version == 1 else 10):
+        value, position = read_varint(data, position)
+        values.append(value)
+    height, width, y, x, direction, flags, steps, consumed = values[:8]
+    if direction >= len(DIRECTIONS):
+        raise WrongSnapshotError("wrong direction")
+    if y >= height or x >= width:
+        raise WrongSnapshotError("position is out of the grid")
+    try:
+        cell_size = data[position]
+    except IndexError:
+        raise WrongSnapshotError("data is cut off") from None
+    position += 1
+    end = position + cell_size * height * width
+    if end > len(data) or cell_size not in (1, 4):
+        raise WrongSnapshotError("data is cut off")
+    if cell_size == 1:
+        cells = array(CELL_TYPE, array("B", data[position:end]))
+    else:
+        cells = array(CELL_TYPE)
+        cells.frombytes(data[position:end])
+        if sys.byteorder == "big":
+            cells.byteswap()
+    position = end
+    length, position = read_varint(data, position)
+    stack = []
+    for _ in range(length):
+        value, position = read_varint(data, position)
+        stack.append(unzigzag(value))
+    playfield = Playfield()
+    playfield.width = width
+    playfield.height = height
+    playfield.offsets = list(range(0, height * width, width))
+    playfield.cells = cells
+    grid.grid = playfield
+    grid.code_height = height
+    grid.code_width = width
+    grid.y = y
+    grid.x = x
+    grid.direction = direction
+    grid._fit_moves()
+    grid.string_mode = bool(flags & STRING_MODE)
+    grid.grid_complete = bool(flags & GRID_COMPLETE)
+    grid.paused = bool(flags & PAUSED)
+    grid.steps = steps
+    grid.stack = grid._new_stack(stack)
+    grid.loop_detector = None
+    if version > 1:
+        grid.rng = DirectionRandom.restore(unzigzag(values[8]), values[9])
+    grid.input_source.skip(consumed - grid.input_source.consumed)
+    return grid
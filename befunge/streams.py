@@ -0,0 +1,464 @@
+"""Output sinks and input sources for befunge grid.
+Commands '.' and ',' write into the sink, which keeps the text in memory
+and passes it on in large pieces instead of one print() per character.
+Grid flushes its sink at '@', on errors, before debug output
+and before waiting for user input.
+Commands '~' and '&' read from the source, which reads text in large
+chunks and gives it out one character or one number at a time.
+AsyncSink and AsyncSource connect the grid to asyncio streams
+and queues for BefungeGrid.run_async.
+Row sources give code rows to IABefungeGrid."""
+
+import codecs
+import io
+import sys
+from collections import deque
+from befunge.exceptions import InputIsNotReadyError
+
+DEFAULT_FLUSH_SIZE = 8192
+DEFAULT_CHUNK_SIZE = 65536
+DEFAULT_PREFETCH = 64
+
+
+class OutputSink:
+    """Parent class for buffered output sinks.
+    Text is emitted when flush_size characters are collected
+    or flush() is called. written counts all characters ever written."""
+
+    def __init__(self, flush_size=DEFAULT_FLUSH_SIZE):
+        self.flush_size = flush_size
+        self.parts = []
+        self.size = 0
+        self.written = 0
+
+    def write(self, text):
+        """Method for adding text to the buffer"""
+        self.parts.append(text)
+        self.size += len(text)
+        self.written += len(text)
+        if self.size >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        """Method for emitting all buffered text"""
+        if self.parts:
+            text = "".join(self.parts)
+            self.parts.clear()
+            self.size = 0
+            self._emit(text)
+
+    def _emit(self, text):
+        """Inner method for passing the text on"""
+        raise NotImplementedError
+
+
+class StdoutSink(OutputSink):
+    """Sink writing to the current sys.stdout"""
+
+    def _emit(self, text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+
+class BufferSink(OutputSink):
+    """Sink keeping all output in memory"""
+
+    def __init__(self):
+        super().__init__(float("inf"))
+        self.chunks = []
+
+    def _emit(self, text):
+        self.chunks.append(text)
+
+    def getvalue(self):
+        """Method for getting all output written so far"""
+        self.flush()
+        return "".join(self.chunks)
+
+
+class StreamSink(OutputSink):
+    """Sink writing to a text or binary file object, e.g. a pipe.
+    Text is encoded for binary streams."""
+
+    def __init__(self, stream, flush_size=DEFAULT_FLUSH_SIZE,
+                 encoding="utf-8"):
+        super().__init__(flush_size)
+        self.stream = stream
+        self.encoding = encoding
+        self.binary = not isinstance(stream, io.TextIOBase)
+
+    def _emit(self, text):
+        if self.binary:
+            self.stream.write(text.encode(self.encoding))
+        else:
+            self.stream.write(text)
+        self.stream.flush()
+
+
+class CallbackSink(OutputSink):
+    """Sink passing the text to the user callback"""
+
+    def __init__(self, callback, flush_size=DEFAULT_FLUSH_SIZE):
+        super().__init__(flush_size)
+        self.callback = callback
+
+    def _emit(self, text):
+        self.callback(text)
+
+
+class AsyncSink(OutputSink):
+    """Sink for asyncio code. Emitted text waits in the sink
+    until drain() passes it to the target, which is
+    an asyncio.StreamWriter, an asyncio.Queue or a callable,
+    that may return an awaitable."""
+
+    def __init__(self, target, flush_size=DEFAULT_FLUSH_SIZE,
+                 encoding="utf-8"):
+        super().__init__(flush_size)
+        self.target = target
+        self.encoding = encoding
+        self.pending = []
+
+    def _emit(self, text):
+        self.pending.append(text)
+
+    async def drain(self):
+        """Method for passing all emitted text to the target"""
+        if not self.pending:
+            return
+        text = "".join(self.pending)
+        self.pending.clear()
+        if hasattr(self.target, "drain"):
+            self.target.write(text.encode(self.encoding))
+            await self.target.drain()
+        elif hasattr(self.target, "put"):
+            await self.target.put(text)
+        else:
+            result = self.target(text)
+            if hasattr(result, "__await__"):
+                await result
+
+
+class InputSource:
+    """Parent class for buffered input sources.
+    Returns None from read methods at the end of input."""
+    interactive = False
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = 0
+        self.consumed = 0
+        self.eof = False
+
+    def _read_chunk(self):
+        """Inner method for reading the next chunk, '' at the end"""
+        raise NotImplementedError
+
+    def _fill(self):
+        """Inner method for making sure that buffer isn't consumed.
+        Returns False at the end of input."""
+        while self.position >= len(self.buffer):
+            if self.eof:
+                return False
+            chunk = self._read_chunk()
+            if chunk:
+                self.buffer = chunk
+                self.position = 0
+            else:
+                self.eof = True
+        return True
+
+    def read_char(self):
+        """Method for reading code of one character"""
+        if not self._fill():
+            return None
+        char = self.buffer[self.position]
+        self.position += 1
+        self.consumed += 1
+        return ord(char)
+
+    def skip(self, count):
+        """Method for dropping count characters of input"""
+        while count > 0 and self._fill():
+            taken = min(count, len(self.buffer) - self.position)
+            self.position += taken
+            self.consumed += taken
+            count -= taken
+
+    def read_int(self):
+        """Method for reading the next integer.
+        Characters before the number are skipped, '-' right before
+        the digits makes it negative. Line break right after the number
+        is consumed too. End of input without digits gives None."""
+        negative = False
+        while self._fill():
+            char = self.buffer[self.position]
+            if char.isdigit():
+                break
+            negative = char == "-"
+            self.position += 1
+            self.consumed += 1
+        else:
+            return None
+        value = 0
+        while self._fill() and self.buffer[self.position].isdigit():
+            value = value * 10 + int(self.buffer[self.position])
+            self.position += 1
+            self.consumed += 1
+        if self._fill() and self.buffer[self.position] == "\n":
+            self.position += 1
+            self.consumed += 1
+        return -value if negative else value
+
+
+class ConsoleSource(InputSource):
+    """Source reading lines from user with input().
+    Every line ends with line break."""
+    interactive = True
+
+    def _read_chunk(self):
+        try:
+            return str(input()) + "\n"
+        except EOFError:
+            return ""
+
+
+class BytesSource(InputSource):
+    """Source reading from bytes or string in memory"""
+
+    def __init__(self, data, encoding="utf-8"):
+        super().__init__()
+        if isinstance(data, (bytes, bytearray)):
+            data = bytes(data).decode(encoding)
+        self.data = data
+
+    def _read_chunk(self):
+        chunk, self.data = self.data, ""
+        return chunk
+
+
+class FileSource(InputSource):
+    """Source reading from a text or binary file object in chunks,
+    e.g. sys.stdin.buffer"""
+
+    def __init__(self, stream, chunk_size=DEFAULT_CHUNK_SIZE,
+                 encoding="utf-8"):
+        super().__init__()
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+
+    def _read_chunk(self):
+        while True:
+            chunk = self.stream.read(self.chunk_size)
+            if isinstance(chunk, str):
+                return chunk
+            final = not chunk
+            text = self.decoder.decode(chunk, final)
+            if text or final:
+                return text
+
+
+class IteratorSource(InputSource):
+    """Source reading from an iterator of strings or bytes"""
+
+    def __init__(self, iterable, encoding="utf-8"):
+        super().__init__()
+        self.iterator = iter(iterable)
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+
+    def _read_chunk(self):
+        for chunk in self.iterator:
+            if not isinstance(chunk, str):
+                chunk = self.decoder.decode(chunk)
+            if chunk:
+                return chunk
+        return self.decoder.decode(b"", True)
+
+
+class AsyncSource(InputSource):
+    """Non-blocking source for asyncio code.
+    Data is added by feed() or awaited by wait() from the reader,
+    which is an asyncio.StreamReader or an asyncio.Queue of strings
+    or bytes, where None or empty item is the end of input.
+    Reading without data raises InputIsNotReadyError and consumes
+    nothing, so the command can be evaluated again after wait()."""
+
+    def __init__(self, reader=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 encoding="utf-8"):
+        super().__init__()
+        self.reader = reader
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.pending = []
+        self.closed = False
+
+    def feed(self, data):
+        """Method for adding string or bytes to the input"""
+        if not isinstance(data, str):
+            data = self.decoder.decode(data)
+        if data:
+            self.pending.append(data)
+
+    def close(self):
+        """Method for marking the end of input"""
+        self.feed(self.decoder.decode(b"", True))
+        self.closed = True
+
+    async def wait(self):
+        """Method for awaiting the next piece of input from the reader"""
+        if hasattr(self.reader, "get"):
+            data = await self.reader.get()
+        else:
+            data = await self.reader.read(self.chunk_size)
+        if data:
+            self.feed(data)
+        else:
+            self.close()
+
+    def _read_chunk(self):
+        if self.pending:
+            chunk = "".join(self.pending)
+            self.pending.clear()
+            return chunk
+        if self.closed:
+            return ""
+        raise InputIsNotReadyError
+
+    def _number_is_ready(self):
+        """Inner method for checking, that the buffered input has
+        the whole next number with the character after it,
+        or the end of input"""
+        self.buffer = self.buffer[self.position:] + "".join(self.pending)
+        self.position = 0
+        self.pending.clear()
+        index = 0
+        length = len(self.buffer)
+        while index < length and not self.buffer[index].isdigit():
+            index += 1
+        while index < length and self.buffer[index].isdigit():
+            index += 1
+        return index < length or self.closed
+
+    def read_int(self):
+        if not self._number_is_ready():
+            raise InputIsNotReadyError
+        return super().read_int()
+
+
+def _clean_row(row, decoder):
+    """Inner function for the row without its line break"""
+    if not isinstance(row, str):
+        row = decoder.decode(row)
+    if row.endswith("\n"):
+        row = row[:-1]
+        if row.endswith("\r"):
+            row = row[:-1]
+    return row
+
+
+class ConsoleRows:
+    """Row source asking user for every row with input()"""
+
+    def read_row(self):
+        """Method for the next row, '' at the end of the code"""
+        return input()
+
+
+class IteratorRows:
+    """Row source reading an iterator of strings or bytes, e.g. a pipe,
+    in a background thread. Up to prefetch rows wait in the queue,
+    so reading a row blocks only if it wasn't received yet.
+    Iterator ends the code at its end or at the empty row."""
+
+    def __init__(self, iterable, prefetch=DEFAULT_PREFETCH,
+                 encoding="utf-8"):
+        import threading
+        from queue import Queue
+        self.queue = Queue(prefetch)
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.done = False
+        self.thread = threading.Thread(target=self._prefetch,
+                                       args=(iter(iterable),), daemon=True)
+        self.thread.start()
+
+    def _prefetch(self, iterator):
+        """Inner method of the thread putting rows into the queue.
+        None is put at the end, exception of the iterator is passed on."""
+        try:
+            for row in iterator:
+                row = _clean_row(row, self.decoder)
+                self.queue.put(row)
+                if not row:
+                    break
+        except Exception as error_object:
+            self.queue.put(error_object)
+        self.queue.put(None)
+
+    def read_row(self):
+        """Method for the next row, '' at the end of the code"""
+        if self.done:
+            return ""
+        row = self.queue.get()
+        if isinstance(row, Exception):
+            self.done = True
+            raise row
+        if not row:
+            self.done = True
+            return ""
+        return row
+
+
+class AsyncRows:
+    """Row source reading an async iterator of strings or bytes,
+    e.g. asyncio.StreamReader, in a task of the event loop.
+    Reading the row, that wasn't received yet, raises
+    InputIsNotReadyError, wait() awaits the next row."""
+
+    def __init__(self, iterable, encoding="utf-8"):
+        self.iterable = iterable
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.rows = deque()
+        self.done = False
+        self.error = None
+        self.task = None
+        self.ready = None
+
+    def start(self):
+        """Method for starting the prefetch task in the running loop"""
+        import asyncio
+        if self.task is None:
+            self.ready = asyncio.Event()
+            self.task = asyncio.ensure_future(self._prefetch())
+
+    async def _prefetch(self):
+        """Inner coroutine appending received rows"""
+        try:
+            async for row in self.iterable:
+                row = _clean_row(row, self.decoder)
+                if not row:
+                    break
+                self.rows.append(row)
+                self.ready.set()
+        except Exception as error_object:
+            self.error = error_object
+        self.done = True
+        self.ready.set()
+
+    async def wait(self):
+        """Method for awaiting the next row or the end of the code"""
+        self.start()
+        while not self.rows and not self.done:
+            self.ready.clear()
+            await self.ready.wait()
+
+    def read_row(self):
+        """Method for the next row, '' at the end of the code"""
+        if self.rows:
+            return self.rows.popleft()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        if self.done:
+            return ""
+        raise InputIsNotReadyError
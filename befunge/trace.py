@@ -0,0 +1,210 @@
+"""Binary execution trace of befunge grid.
+Every executed command is stored as a fixed-size record instead of
+the formatted line of debug mode: step, y, x, opcode, string mode,
+number of popped values and up to two pushed values.
+Records are kept in a ring buffer of bounded size or written to
+a binary file. Header has the seed of the '?' generator, record of '?'
+keeps the number of its draw and the index of the direction in '>v<^',
+so the run can be repeated with befunge.rng.DirectionRandom.restore.
+Decoder replays pops and pushes to render the records
+in the debug mode format with the full stack.
+
+Usage: python -m befunge.trace FILE"""
+
+import struct
+import sys
+from befunge.befunge_grid import step_range
+from befunge.dispatch_engine import build_table, TABLE_SIZE
+from befunge.snapshot import read_varint, write_varint, zigzag, unzigzag
+
+MAGIC = b"BFTR"
+VERSION = 2
+HEADER = struct.Struct("<4sB")
+RECORD = struct.Struct("<QIIIBBqq")
+DEFAULT_CAPACITY = 65536
+STRING_MODE = 1
+FIRST_UNKNOWN = 2
+SECOND_UNKNOWN = 4
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+PUSHES = bytearray(TABLE_SIZE)
+for _command in "0123456789+-*/%!`g&~":
+    PUSHES[ord(_command)] = 1
+for _command in ":\\":
+    PUSHES[ord(_command)] = 2
+
+
+class TraceRecorder:
+    """Class for the trace of one program.
+    Without file, the last capacity records are kept in memory,
+    otherwise all records are written to the binary file object.
+    Header is written, when the first run begins."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, file=None):
+        self.capacity = capacity
+        self.file = file
+        self.buffer = bytearray(0 if file else capacity * RECORD.size)
+        self.count = 0
+        self.seed = None
+
+    def begin(self, seed):
+        """Method for starting the trace of the grid
+        with the seed of its generator"""
+        if self.seed is not None:
+            return
+        self.seed = seed
+        if self.file is not None:
+            self.file.write(self._header())
+
+    def _header(self):
+        """Inner method for the header bytes"""
+        header = bytearray(HEADER.pack(MAGIC, VERSION))
+        write_varint(header, zigzag(self.seed or 0))
+        return bytes(header)
+
+    def record(self, step, y, x, opcode, string_mode, pops, pushed,
+               draw=(0, 0)):
+        """Method for adding the record of one command.
+        Pushed is the sequence of pushed values, at most two of them.
+        Draw is the number of the draw and the direction index of '?'."""
+        flags = STRING_MODE if string_mode else 0
+        first, second = draw
+        if pushed:
+            first = pushed[0]
+            if not INT64_MIN <= first <= INT64_MAX:
+                first = 0
+                flags |= FIRST_UNKNOWN
+            if len(pushed) > 1:
+                second = pushed[1]
+                if not INT64_MIN <= second <= INT64_MAX:
+                    second = 0
+                    flags |= SECOND_UNKNOWN
+        data = (step, y, x, opcode, flags, pops | len(pushed) << 4,
+                first, second)
+        if self.file is not None:
+            self.file.write(RECORD.pack(*data))
+        else:
+            RECORD.pack_into(self.buffer,
+                             self.count % self.capacity * RECORD.size, *data)
+        self.count += 1
+
+    def dumps(self):
+        """Method for the records of the ring buffer as trace file bytes,
+        the oldest record first"""
+        start = 0
+        if self.count > self.capacity:
+            start = self.count % self.capacity * RECORD.size
+        end = min(self.count, self.capacity) * RECORD.size
+        return self._header() + bytes(self.buffer[start:end]) + \
+            bytes(self.buffer[:start])
+
+
+def read_header(data):
+    """Function for the seed of the trace and the position
+    of its first record"""
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("data is not a befunge trace")
+    seed, position = read_varint(data, HEADER.size)
+    return unzigzag(seed), position
+
+
+def read_records(data):
+    """Generator of record tuples from trace file bytes"""
+    _, position = read_header(data)
+    for record in RECORD.iter_unpack(memoryview(data)[position:]):
+        yield record
+
+
+def render(data, stack=()):
+    """Generator of debug mode lines of the trace.
+    Stack is the stack before the first record. For the ring buffer,
+    which lost its oldest records, it is None and the unknown bottom
+    of the stack is shown as '...'.
+    Values out of 64-bit range are shown as '?'."""
+    known = stack is not None
+    stack = [str(value) for value in stack] if known else []
+    for step, y, x, opcode, flags, counts, first, second in \
+            read_records(data):
+        shown = ",".join(stack if known else ["..."] + stack)
+        yield "evaluate command [ {} ] at Y: {} X: {}," \
+              " string mode: {}, stack: [ {} ]".format(
+                  chr(opcode), y + 1, x + 1,
+                  bool(flags & STRING_MODE), shown)
+        pops = counts & 0x0F
+        pushes = counts >> 4
+        del stack[len(stack) - min(pops, len(stack)):]
+        values = (("?" if flags & FIRST_UNKNOWN else str(first)),
+                  ("?" if flags & SECOND_UNKNOWN else str(second)))
+        stack.extend(values[:pushes])
+
+
+def execute(grid, recorder, debug=False, max_steps=None):
+    """Function for running the grid with the dispatch table,
+    adding the record of every command to the recorder.
+    Returns True if the program stopped, False if max_steps ran out."""
+    table, invalid = build_table(grid)
+    stack = grid.stack
+    push = stack.append
+    move = grid._move
+    record = recorder.record
+    cells = grid.grid.cells
+    offsets = grid.grid.offsets
+    rng = grid.rng
+    quote = ord('"')
+    question = ord("?")
+    steps = 0
+    recorder.begin(rng.seed)
+    try:
+        for steps in step_range(max_steps):
+            y = grid.y
+            x = grid.x
+            code = cells[offsets[y] + x]
+            if debug:
+                grid._print_debug(chr(code))
+            string_mode = grid.string_mode
+            if string_mode:
+                if code == quote:
+                    grid.string_mode = False
+                    record(grid.steps + steps, y, x, code, True, 0, ())
+                else:
+                    push(code)
+                    record(grid.steps + steps, y, x, code, True, 0,
+                           (code,))
+            elif code == question:
+                table[code]()
+                record(grid.steps + steps, y, x, code, False, 0, (),
+                       (rng.draws - 1, grid.direction))
+            else:
+                before = len(stack)
+                stopped = (table[code] if code < TABLE_SIZE
+                           else invalid)()
+                pushes = min(PUSHES[code] if code < TABLE_SIZE else 0,
+                             len(stack))
+                record(grid.steps + steps, y, x, code, False,
+                       before - len(stack) + pushes,
+                       stack[len(stack) - pushes:] if pushes else ())
+                if stopped:
+                    return True
+            move()
+        steps = max_steps
+        return False
+    finally:
+        grid.steps += steps
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        sys.stderr.write("Usage: python -m befunge.trace FILE\n")
+        return 2
+    with open(argv[0], "rb") as file:
+        data = file.read()
+    for line in render(data):
+        sys.stdout.write(line + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+"""Ahead-of-time transpiler of befunge grid to a Python module.
+Every reachable straight-line run is compiled into a function, that
+returns the number of the next function, and the driver loop jumps
+between them. Branches, bridges, '?', input and '@' get functions
+of their own. Stack, underflow and I/O semantics are the same as in
+BefungeGrid with the sys.stdin and sys.stdout defaults.
+Program, that can change its own code with 'p', is compiled in hybrid
+mode: after such a write the module continues with its embedded
+cell-by-cell interpreter.
+Directions of '?' are drawn the same way as by befunge.rng, so the module
+with the seed of the grid repeats the run of the grid.
+Errors are raised as befunge.exceptions, so the module needs the package.
+
+Usage: python -m befunge.transpiler SOURCE [-o OUTPUT] [--zero-based-put]
+                                    [--eof {push,reflect}] [--seed SEED]"""
+
+import argparse
+import sys
+from befunge.analysis import analyze, STEPS, REVERSE_DIRECTIONS
+from befunge.block_compiler import discover, SNIPPETS
+from befunge.peephole import optimize
+from befunge.rng import BATCH_BYTES
+
+RUNTIME = '''
+import sys
+from random import Random
+from types import SimpleNamespace
+from befunge.exceptions import NotEnoughElementsInStackError
+
+STEPS = {">": (0, 1), "v": (1, 0), "<": (0, -1), "^": (-1, 0)}
+REVERSE_DIRECTIONS = {">": "<", "<": ">", "^": "v", "v": "^"}
+
+stack = []
+push = stack.append
+pop = stack.pop
+output = []
+modified = False
+
+
+def write(text):
+    output.append(text)
+
+
+def flush():
+    if output:
+        sys.stdout.write("".join(output))
+        output.clear()
+        sys.stdout.flush()
+
+
+class Input:
+    def __init__(self):
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self):
+        while self.position >= len(self.buffer):
+            if self.eof:
+                return False
+            flush()
+            line = sys.stdin.readline()
+            if line:
+                self.buffer = line if line.endswith("\\n") else line + "\\n"
+                self.position = 0
+            else:
+                self.eof = True
+        return True
+
+    def read_char(self):
+        if not self.fill():
+            return None
+        self.position += 1
+        return ord(self.buffer[self.position - 1])
+
+    def read_int(self):
+        negative = False
+        while self.fill():
+            char = self.buffer[self.position]
+            if char.isdigit():
+                break
+            negative = char == "-"
+            self.position += 1
+        else:
+            return None
+        value = 0
+        while self.fill() and self.buffer[self.position].isdigit():
+            value = value * 10 + int(self.buffer[self.position])
+            self.position += 1
+        if self.fill() and self.buffer[self.position] == "\\n":
+            self.position += 1
+        return -value if negative else value
+
+
+source = Input()
+
+
+def directions():
+    """Generator of direction indexes of '?', see befunge.rng"""
+    rng = Random(SEED)
+    table = [[byte >> shift & 3 for shift in (0, 2, 4, 6)]
+             for byte in range(256)]
+    while True:
+        data = rng.getrandbits(BATCH_BYTES * 8).to_bytes(BATCH_BYTES,
+                                                         "little")
+        for byte in data:
+            yield from table[byte]
+
+
+draw = directions().__next__
+
+
+def read(command, direction):
+    value = source.read_int() if command == "&" else source.read_char()
+    if value is not None:
+        push(value)
+    elif EOF_REFLECT:
+        return REVERSE_DIRECTIONS[direction]
+    else:
+        push(-1)
+    return direction
+
+
+def index(y, x):
+    if y < 0:
+        y += HEIGHT
+    if x < 0:
+        x += WIDTH
+    if not (0 <= y < HEIGHT and 0 <= x < WIDTH):
+        raise IndexError("playfield index out of range")
+    return y * WIDTH + x
+
+
+def get():
+    try:
+        y = pop()
+        x = pop()
+        push(cells[index(y, x)])
+    except IndexError:
+        push(0)
+
+
+def put():
+    global modified
+    try:
+        y = int(pop())
+        x = int(pop())
+        value = int(pop())
+        if LEGACY_PUT:
+            y -= 1
+            x -= 1
+        if not 0 <= value < 0x110000:
+            raise ValueError("chr() arg not in range(0x110000)")
+        cell = index(y, x)
+    except IndexError:
+        if not LEGACY_PUT:
+            return
+        cell = 0
+        value = ord("0")
+    cells[cell] = value
+    if cell in CODE_CELLS:
+        modified = True
+
+
+def not_enough(command, y, x):
+    playfield = SimpleNamespace(char=lambda y, x: command)
+    return NotEnoughElementsInStackError(
+        SimpleNamespace(grid=playfield, y=y, x=x))
+
+
+def invalid(command, y, x):
+    write(f"Invalid operand [ {command} ] at {y + 1} row, {x + 1} column\\n")
+
+
+def interpret(y, x, direction, string_mode):
+    """Cell-by-cell interpreter for the code changed by 'p'"""
+    while True:
+        code = cells[y * WIDTH + x]
+        command = chr(code)
+        if string_mode:
+            if command == '"':
+                string_mode = False
+            else:
+                push(code)
+        elif command in STEPS:
+            direction = command
+        elif command in "0123456789":
+            push(code - 48)
+        elif command in OPERATIONS:
+            OPERATIONS[command]()
+        elif command == " ":
+            pass
+        elif command == '"':
+            string_mode = True
+        elif command == "?":
+            direction = ">v<^"[draw()]
+        elif command in "|_":
+            try:
+                value = pop()
+            except IndexError:
+                raise not_enough(command, y, x) from None
+            if command == "|":
+                direction = "^" if value else "v"
+            else:
+                direction = "<" if value else ">"
+        elif command == "#":
+            y = (y + STEPS[direction][0]) % HEIGHT
+            x = (x + STEPS[direction][1]) % WIDTH
+        elif command in "~&":
+            direction = read(command, direction)
+        elif command == "@":
+            return None
+        else:
+            invalid(command, y, x)
+            return None
+        y = (y + STEPS[direction][0]) % HEIGHT
+        x = (x + STEPS[direction][1]) % WIDTH
+'''
+
+DRIVER = '''
+
+
+def main():
+    state = 0
+    try:
+        while state is not None:
+            state = FUNCTIONS[state]()
+    finally:
+        flush()
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+class Transpiler:
+    """Class for generating the module of one grid.
+    Functions are numbered by (y, x, direction, string mode) states
+    in the order of discovery, the start of the program is 0."""
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.analysis = analyze(grid)
+        self.static = self.analysis.is_static
+        self.states = {}
+        self.queue = []
+
+    def state(self, y, x, direction, string_mode):
+        """Method for the number of the function of the state"""
+        key = (y, x, direction, string_mode)
+        if key not in self.states:
+            self.states[key] = len(self.states)
+            self.queue.append(key)
+        return self.states[key]
+
+    def next_state(self, y, x, direction, distance=1):
+        """Method for the number of the state after moving from y, x"""
+        step_y, step_x = STEPS[direction]
+        return self.state((y + step_y * distance) % self.grid.code_height,
+                          (x + step_x * distance) % self.grid.code_width,
+                          direction, False)
+
+    def block_lines(self, block):
+        """Method for the body of the straight-line block function"""
+        lines = []
+        for kind, argument, _ in optimize(block.ops):
+            if kind == "push":
+                lines.append(f"push({argument!r})")
+            elif kind == "extend":
+                lines.append(f"stack.extend({argument!r})")
+            elif kind == "write":
+                lines.append(f"write({argument!r})")
+            elif kind == "drop":
+                lines.append(f"del stack[-{argument}:]")
+            elif argument == "g":
+                lines.append("get()")
+            elif argument == "p":
+                lines.append("put()")
+            else:
+                lines.extend(SNIPPETS[argument])
+        end = block.end
+        if not self.static and block.ops and block.ops[-1][1] == "p":
+            lines.append("if modified:")
+            lines.append(f"    return interpret{end!r}")
+        lines.append(f"return {self.state(*end)}")
+        return lines
+
+    def terminator_lines(self, y, x, direction):
+        """Method for the body of the function of a single command,
+        that can't be a part of the block"""
+        command = self.grid.grid.char(y, x)
+        if command in "|_":
+            first, second = ("^", "v") if command == "|" else ("<", ">")
+            return ["try:",
+                    "    value = pop()",
+                    "except IndexError:",
+                    f"    raise not_enough({command!r}, {y}, {x}) from None",
+                    "if value:",
+                    f"    return {self.next_state(y, x, first)}",
+                    f"return {self.next_state(y, x, second)}"]
+        if command == "?":
+            targets = ", ".join(str(self.next_state(y, x, each))
+                                for each in ">v<^")
+            return [f"return ({targets})[draw()]"]
+        if command == "#":
+            return [f"return {self.next_state(y, x, direction, 2)}"]
+        if command in "~&":
+            reverse = REVERSE_DIRECTIONS[direction]
+            return [f"if read({command!r}, {direction!r}) == {direction!r}:",
+                    f"    return {self.next_state(y, x, direction)}",
+                    f"return {self.next_state(y, x, reverse)}"]
+        if command == "@":
+            return ["return None"]
+        return [f"invalid({command!r}, {y}, {x})",
+                "return None"]
+
+    def generate(self):
+        """Method for the source of the module"""
+        self.state(0, 0, ">", False)
+        bodies = []
+        while self.queue:
+            key = self.queue.pop(0)
+            block = discover(self.grid, *key, self.static)
+            if block is None:
+                bodies.append(self.terminator_lines(*key[:3]))
+            else:
+                bodies.append(self.block_lines(block))
+        grid = self.grid
+        cells = list(grid.grid.cells)
+        code_cells = sorted(y * grid.code_width + x
+                            for y, x in self.analysis.cells)
+        lines = ['"""Befunge program transpiled by befunge.transpiler"""',
+                 RUNTIME,
+                 f"HEIGHT = {grid.code_height}",
+                 f"WIDTH = {grid.code_width}",
+                 f"LEGACY_PUT = {grid.legacy_put!r}",
+                 f"EOF_REFLECT = {grid.eof == 'reflect'!r}",
+                 f"SEED = {grid.seed!r}",
+                 f"BATCH_BYTES = {BATCH_BYTES}",
+                 f"cells = {cells!r}",
+                 f"CODE_CELLS = frozenset({code_cells!r})"]
+        operations = []
+        for number, command in enumerate(sorted(SNIPPETS)):
+            lines.append("")
+            lines.append("")
+            lines.append(f"def operation_{number}():")
+            snippet = {"g": ["get()"], "p": ["put()"]}.get(
+                command, SNIPPETS[command])
+            lines.extend("    " + line for line in snippet)
+            operations.append(f"{command!r}: operation_{number}")
+        lines.append("")
+        lines.append("")
+        lines.append(f"OPERATIONS = {{{', '.join(operations)}}}")
+        for number, body in enumerate(bodies):
+            lines.append("")
+            lines.append("")
+            lines.append(f"def function_{number}():")
+            lines.extend("    " + line for line in body)
+        lines.append("")
+        lines.append("")
+        lines.append("FUNCTIONS = [" + ", ".join(
+            f"function_{number}" for number in range(len(bodies))) + "]")
+        return "\n".join(lines) + DRIVER
+
+
+def transpile(grid):
+    """Function for the Python module source of the grid
+    loaded by set_grid"""
+    return Transpiler(grid).generate()
+
+
+def main(argv=None):
+    from befunge.befunge_grid import BefungeGrid
+    parser = argparse.ArgumentParser(
+        prog="python -m befunge.transpiler",
+        description="Transpile befunge program to Python module")
+    parser.add_argument("source", help="befunge code file")
+    parser.add_argument("-o", "--output", default=None,
+                        help="module file, stdout by default")
+    parser.add_argument("--zero-based-put", action="store_true")
+    parser.add_argument("--eof", choices=("push", "reflect"),
+                        default="push")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of '?' directions, random by default")
+    args = parser.parse_args(argv)
+    grid = BefungeGrid(legacy_put=not args.zero_based_put, eof=args.eof,
+                       seed=args.seed)
+    grid.set_grid("f", args.source)
+    source = transpile(grid)
+    if args.output is None:
+        sys.stdout.write(source)
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(source)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Compact stack of fixed-width numbers for befunge grid.
+Numbers are kept unboxed in an array of 32-bit or 64-bit cells,
+preallocated for capacity numbers and grown twice when it is full.
+Arithmetic wraps around like in common Befunge-93 interpreters:
+a pushed number out of the cell range is reduced modulo 2**bits,
+so repeated '*' never makes huge numbers.
+Pop from the empty stack gives 0 instead of raising IndexError,
+so every engine gets the standard implicit zeros: '+' of one number
+keeps it, '\\' of one number pushes it and 0, '.' prints 0 and '|', '_'
+go on as for 0. Indexing is the same as for list and still raises
+IndexError out of the stack.
+The list of unbounded numbers stays the reference stack of the grid."""
+
+from array import array
+
+STACK_BITS = {"int32": 32, "int64": 64}
+DEFAULT_CAPACITY = 1024
+
+
+def _typecode(bits):
+    """Inner function for the array typecode of the cell width"""
+    for code in "ilq":
+        if array(code).itemsize * 8 == bits:
+            return code
+    raise ValueError(f"no {bits}-bit array type")
+
+
+class TypedStack:
+    """Class for the stack of bits-wide numbers with list methods,
+    that are used by the engines"""
+
+    def __init__(self, bits=64, capacity=DEFAULT_CAPACITY, values=()):
+        self.bits = bits
+        self.half = 1 << (bits - 1)
+        self.mask = (1 << bits) - 1
+        self.typecode = _typecode(bits)
+        self.cells = array(self.typecode,
+                           bytes(max(capacity, 1) * (bits // 8)))
+        self.size = 0
+        self.extend(values)
+
+    def wrap(self, value):
+        """Method for the number reduced to the cell range"""
+        return ((int(value) + self.half) & self.mask) - self.half
+
+    def append(self, value):
+        """Method for pushing the number"""
+        size = self.size
+        if size == len(self.cells):
+            self.cells.extend(self.cells)
+        try:
+            self.cells[size] = value
+        except (OverflowError, TypeError):
+            self.cells[size] = self.wrap(value)
+        self.size = size + 1
+
+    def pop(self):
+        """Method for popping the number, 0 from the empty stack"""
+        if self.size:
+            self.size -= 1
+            return self.cells[self.size]
+        return 0
+
+    def extend(self, values):
+        """Method for pushing every number"""
+        for value in values:
+            self.append(value)
+
+    def clear(self):
+        """Method for removing every number"""
+        self.size = 0
+
+    def tolist(self):
+        """Method for the list of the numbers from the bottom"""
+        return self.cells[:self.size].tolist()
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.cells[:self.size])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.size)
+            if start < 0:
+                return []
+            if stop < 0:
+                stop = None
+            return self.cells[start:stop:step].tolist()
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("stack index out of range")
+        return self.cells[index]
+
+    def __setitem__(self, index, value):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("stack index out of range")
+        self.cells[index] = self.wrap(value)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.size)
+            if step == 1 and stop == self.size:
+                self.size = min(start, self.size)
+                return
+        values = self.tolist()
+        del values[index]
+        self.size = 0
+        self.extend(values)
+
+    def __eq__(self, other):
+        if isinstance(other, TypedStack):
+            other = other.tolist()
+        if isinstance(other, list):
+            return self.tolist() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TypedStack({self.bits}, {self.tolist()!r})"
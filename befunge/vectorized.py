@@ -0,0 +1,372 @@
+"""Lockstep execution of one befunge program over many inputs.
+States of all instances are kept in NumPy arrays: positions, directions,
+string modes, stack depths, stacks in a 2D int64 array and playfields
+in another one, as 'p' can make them different. Every step executes
+one command of every running instance: instances are grouped by the code
+of their current cell and each group is evaluated by one vectorized
+operation, so instances split into new groups, when their control flow
+diverges at '_', '|' or '?', and join again, when it meets.
+Input and 'p' are evaluated instance by instance.
+Instance, which would raise an error or leave the int64 range,
+is taken out of the lockstep before the command and finished
+by BefungeGrid with the dispatch table engine, so results are
+the same as the results of separate runs.
+NumPy is imported only when run_many is called."""
+
+import time
+from befunge.batch import JobResult
+from befunge.befunge_grid import BefungeGrid
+from befunge.playfield import MAX_CELL
+from befunge.rng import DirectionRandom
+from befunge.streams import BufferSink, BytesSource
+
+DIRECTIONS = ">v<^"
+STEP_Y = (0, 1, 0, -1)
+STEP_X = (1, 0, -1, 0)
+SUM_LIMIT = 2 ** 62
+PRODUCT_LIMIT = 2 ** 31
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+DEFAULT_CAPACITY = 64
+
+
+class Lockstep:
+    """Class for the states of all instances of the program"""
+
+    def __init__(self, grid, inputs, np, seeds=None):
+        self.np = np
+        self.grid = grid
+        self.height = grid.code_height
+        self.width = grid.code_width
+        count = len(inputs)
+        self.cells = np.tile(np.array(grid.grid.cells, dtype=np.int64),
+                             (count, 1))
+        self.y = np.zeros(count, np.int64)
+        self.x = np.zeros(count, np.int64)
+        self.direction = np.zeros(count, np.int64)
+        self.string_mode = np.zeros(count, bool)
+        self.depth = np.zeros(count, np.int64)
+        self.stack = np.zeros((count, DEFAULT_CAPACITY), np.int64)
+        self.active = np.ones(count, bool)
+        self.step_y = np.array(STEP_Y, np.int64)
+        self.step_x = np.array(STEP_X, np.int64)
+        self.sources = [BytesSource(data) for data in inputs]
+        if seeds is None:
+            seeds = [None] * count
+        self.rngs = [DirectionRandom(seed) for seed in seeds]
+        self.outputs = [[] for _ in inputs]
+        self.results = [None] * count
+        self.ejected = {}
+        self.steps = 0
+
+    def run(self, max_steps=None):
+        """Method for running all instances until every one stops,
+        leaves the lockstep or max_steps run out"""
+        np = self.np
+        limit = float("inf") if max_steps is None else max_steps
+        while self.steps < limit:
+            index = np.flatnonzero(self.active)
+            if not index.size:
+                break
+            codes = self.cells[index, self.y[index] * self.width +
+                               self.x[index]]
+            strings = self.string_mode[index]
+            if strings.any():
+                self._string(index[strings], codes[strings])
+            normal = ~strings
+            for code in np.unique(codes[normal]).tolist():
+                self._evaluate(chr(code), index[normal & (codes == code)])
+            self._move(index[self.active[index]])
+            self.steps += 1
+        for number in np.flatnonzero(self.active).tolist():
+            self._finish(number, "step_limit")
+        for number, grid in self.ejected.items():
+            self._run_ejected(number, grid, max_steps)
+        return self.results
+
+    def _move(self, index):
+        """Inner method for moving the instances one cell forward"""
+        direction = self.direction[index]
+        self.y[index] = (self.y[index] + self.step_y[direction]) % \
+            self.height
+        self.x[index] = (self.x[index] + self.step_x[direction]) % \
+            self.width
+
+    def _push(self, index, values):
+        """Inner method for pushing one value to every instance"""
+        np = self.np
+        needed = int(self.depth[index].max()) + 1 if index.size else 0
+        if needed > self.stack.shape[1]:
+            grown = np.zeros((self.stack.shape[0],
+                              max(needed, 2 * self.stack.shape[1])),
+                             np.int64)
+            grown[:, :self.stack.shape[1]] = self.stack
+            self.stack = grown
+        self.stack[index, self.depth[index]] = values
+        self.depth[index] += 1
+
+    def _pop(self, index):
+        """Inner method for popping the top of non-empty stacks"""
+        self.depth[index] -= 1
+        return self.stack[index, self.depth[index]]
+
+    def _zeros(self, index, count):
+        """Inner method for the stacks of count zeros,
+        which commands leave after underflow"""
+        self.depth[index] = 0
+        for _ in range(count):
+            self._push(index, 0)
+
+    def _string(self, index, codes):
+        """Inner method for the instances in string mode"""
+        quote = codes == ord('"')
+        self.string_mode[index[quote]] = False
+        self._push(index[~quote], codes[~quote])
+
+    def _eject(self, index):
+        """Inner method for taking instances out of the lockstep.
+        Every instance becomes BefungeGrid in the same state,
+        which is run after the lockstep."""
+        for number in index.tolist():
+            grid = BefungeGrid(self.grid.legacy_put, BufferSink(),
+                               self.sources[number], self.grid.eof)
+            grid.set_grid("s", ["".join(map(chr, row)) for row in
+                                self.cells[number].reshape(
+                                    self.height, self.width).tolist()])
+            grid.y = int(self.y[number])
+            grid.x = int(self.x[number])
+            grid.direction = int(self.direction[number])
+            grid.string_mode = bool(self.string_mode[number])
+            grid.stack = self.stack[number, :self.depth[number]].tolist()
+            grid.steps = self.steps
+            grid.rng = self.rngs[number]
+            grid.output.write("".join(self.outputs[number]))
+            self.active[number] = False
+            self.ejected[number] = grid
+        return index
+
+    def _finish(self, number, reason, error=None):
+        """Inner method for the result of the stopped instance"""
+        self.active[number] = False
+        self.results[number] = JobResult(
+            str(number), reason, "".join(self.outputs[number]),
+            self.stack[number, :self.depth[number]].tolist(),
+            self.steps, error=error)
+
+    def _run_ejected(self, number, grid, max_steps):
+        """Inner method for finishing the instance out of the lockstep"""
+        budget = None if max_steps is None else max_steps - grid.steps
+        error = None
+        try:
+            if grid.run(engine="table", max_steps=budget):
+                reason = "halted" if grid.grid.char(grid.y, grid.x) == "@" \
+                    else "invalid_operand"
+            else:
+                reason = "step_limit"
+        except Exception as error_object:
+            reason = "error"
+            error = f"{type(error_object).__name__}: {error_object}"
+        self.results[number] = JobResult(str(number), reason,
+                                         grid.output.getvalue(), grid.stack,
+                                         grid.steps, error=error)
+
+    def _evaluate(self, command, index):
+        """Inner method for evaluating the command
+        for every instance of the group"""
+        np = self.np
+        if command == " ":
+            return
+        if command in DIRECTIONS:
+            self.direction[index] = DIRECTIONS.index(command)
+        elif command in "0123456789":
+            self._push(index, int(command))
+        elif command in "+-*/%`":
+            self._binary(command, index)
+        elif command == "!":
+            empty = self.depth[index] == 0
+            self._zeros(index[empty], 1)
+            index = index[~empty]
+            top = self.depth[index] - 1
+            self.stack[index, top] = self.stack[index, top] == 0
+        elif command == ":":
+            empty = self.depth[index] == 0
+            self._zeros(index[empty], 2)
+            index = index[~empty]
+            self._push(index, self.stack[index, self.depth[index] - 1])
+        elif command == "\\":
+            short = self.depth[index] < 2
+            self._zeros(index[short], 2)
+            index = index[~short]
+            top = self.depth[index] - 1
+            first = self.stack[index, top]
+            self.stack[index, top] = self.stack[index, top - 1]
+            self.stack[index, top - 1] = first
+        elif command == "$":
+            self.depth[index] = np.maximum(self.depth[index] - 1, 0)
+        elif command in "|_":
+            empty = self.depth[index] == 0
+            self._eject(index[empty])
+            index = index[~empty]
+            value = self._pop(index) != 0
+            if command == "|":
+                self.direction[index] = np.where(value, 3, 1)
+            else:
+                self.direction[index] = np.where(value, 2, 0)
+        elif command == "?":
+            self.direction[index] = [self.rngs[number].index()
+                                     for number in index.tolist()]
+        elif command == "#":
+            self._move(index)
+        elif command == '"':
+            self.string_mode[index] = True
+        elif command == ".":
+            empty = self.depth[index] == 0
+            self._eject(index[empty])
+            index = index[~empty]
+            for number, value in zip(index.tolist(),
+                                     self._pop(index).tolist()):
+                self.outputs[number].append(f"{value} ")
+        elif command == ",":
+            empty = self.depth[index] == 0
+            self._eject(index[empty])
+            index = index[~empty]
+            top = self.stack[index, self.depth[index] - 1]
+            wrong = (top < 0) | (top >= MAX_CELL)
+            self._eject(index[wrong])
+            index = index[~wrong]
+            for number, value in zip(index.tolist(),
+                                     self._pop(index).tolist()):
+                self.outputs[number].append(chr(value))
+        elif command == "g":
+            self._get(index)
+        elif command == "p":
+            for number in index.tolist():
+                self._put(number)
+        elif command in "~&":
+            for number in index.tolist():
+                self._read(command, number)
+        elif command == "@":
+            for number in index.tolist():
+                self._finish(number, "halted")
+        else:
+            for number in index.tolist():
+                self.outputs[number].append(
+                    f"Invalid operand [ {command} ] at "
+                    f"{self.y[number] + 1} row, {self.x[number] + 1} column\n")
+                self._finish(number, "invalid_operand")
+
+    def _binary(self, command, index):
+        """Inner method for arithmetic and comparison.
+        Operands, which result can leave int64, are ejected."""
+        np = self.np
+        short = self.depth[index] < 2
+        self._zeros(index[short], 1)
+        index = index[~short]
+        top = self.depth[index] - 1
+        a = self.stack[index, top]
+        b = self.stack[index, top - 1]
+        if command != "`":
+            bound = PRODUCT_LIMIT if command == "*" else SUM_LIMIT
+            wide = (a >= bound) | (a <= -bound) | (b >= bound) | \
+                (b <= -bound)
+            if wide.any():
+                self._eject(index[wide])
+                index, top, a, b = index[~wide], top[~wide], a[~wide], \
+                    b[~wide]
+        if command == "+":
+            result = a + b
+        elif command == "-":
+            result = a - b
+        elif command == "*":
+            result = a * b
+        elif command == "`":
+            result = (b > a).astype(np.int64)
+        else:
+            zero = b == 0
+            divisor = np.where(zero, 1, b)
+            result = a // divisor if command == "/" else a % divisor
+            result[zero] = 0
+        self.stack[index, top - 1] = result
+        self.depth[index] = top
+
+    def _get(self, index):
+        """Inner method for 'g' with list-like indexing"""
+        np = self.np
+        short = self.depth[index] < 2
+        self._zeros(index[short], 1)
+        index = index[~short]
+        top = self.depth[index] - 1
+        y = self.stack[index, top]
+        x = self.stack[index, top - 1]
+        y = np.where(y < 0, y + self.height, y)
+        x = np.where(x < 0, x + self.width, x)
+        valid = (y >= 0) & (y < self.height) & (x >= 0) & (x < self.width)
+        cell = np.where(valid, y * self.width + x, 0)
+        self.stack[index, top - 1] = np.where(valid,
+                                              self.cells[index, cell], 0)
+        self.depth[index] = top
+
+    def _put(self, number):
+        """Inner method for 'p' of one instance, see BefungeGrid._put"""
+        depth = int(self.depth[number])
+        values = self.stack[number, max(depth - 3, 0):depth].tolist()[::-1]
+        if depth >= 3 and not 0 <= values[2] < MAX_CELL:
+            self._eject(self.np.array([number]))
+            return
+        self.depth[number] = max(depth - 3, 0)
+        legacy = self.grid.legacy_put
+        if depth >= 3:
+            y, x, value = values
+            if legacy:
+                y -= 1
+                x -= 1
+            if y < 0:
+                y += self.height
+            if x < 0:
+                x += self.width
+            if 0 <= y < self.height and 0 <= x < self.width:
+                self.cells[number, y * self.width + x] = value
+                return
+        if legacy:
+            self.cells[number, 0] = ord("0")
+
+    def _read(self, command, number):
+        """Inner method for '~' and '&' of one instance.
+        Number out of int64 is pushed by the ejected grid."""
+        source = self.sources[number]
+        if command == "&":
+            value = source.read_int()
+        else:
+            value = source.read_char()
+        if value is None:
+            if self.grid.eof == "push":
+                self._push(self.np.array([number]), -1)
+            else:
+                self.direction[number] = (self.direction[number] + 2) % 4
+        elif INT64_MIN <= value <= INT64_MAX:
+            self._push(self.np.array([number]), value)
+        else:
+            self._eject(self.np.array([number]))
+            grid = self.ejected[number]
+            grid.stack.append(value)
+            grid.steps += 1
+            grid._move()
+
+
+def run_many(source, inputs, max_steps=None, legacy_put=True, eof="push",
+             seeds=None):
+    """Function for running the program of the list of strings or the file
+    once for every input of the list of bytes or strings.
+    Seeds is the list of '?' generator seeds of every input.
+    Returns the list of befunge.batch.JobResult in the order of inputs,
+    named by the number of the input, with the same reason, output,
+    stack and steps as the separate run by the table engine would give."""
+    import numpy
+    start = time.perf_counter()
+    grid = BefungeGrid(legacy_put, BufferSink(), eof=eof)
+    grid.set_grid("s" if isinstance(source, list) else "f", source)
+    results = Lockstep(grid, list(inputs), numpy, seeds).run(max_steps)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        result.elapsed = elapsed
+    return results
@@ -0,0 +1,5 @@
+"""Benchmark suite of befunge interpreter engines.
+Usage:
+    python -m benchmarks run [--engines E ...] [--output FILE]
+    python -m benchmarks compare BASELINE CURRENT [--threshold T]
+    python -m benchmarks startup [--repeat N] [--limit SECONDS]"""
@@ -0,0 +1,81 @@
+import argparse
+import json
+import sys
+from benchmarks.compare import compare, DEFAULT_THRESHOLD
+from benchmarks.runner import run_suite, ENGINES, DEFAULT_STEPS
+from benchmarks.startup import measure_startup, DEFAULT_REPEAT, \
+    DEFAULT_LIMIT
+
+
+def _run(args):
+    report = run_suite(args.engines, args.max_steps, args.repeat)
+    classic = {result["workload"]: result["wall_time"]
+               for result in report["results"]
+               if result["engine"] == "classic"}
+    for result in report["results"]:
+        line = "{:<18} {:<8} {:>12,.0f} instr/s {:>8.3f}s {:>10,} B" \
+            .format(result["workload"], result["engine"],
+                    result["instructions_per_second"],
+                    result["wall_time"], result["peak_memory"])
+        if result["workload"] in classic:
+            line += " {:>6.2f}x".format(classic[result["workload"]]
+                                        / result["wall_time"])
+        print(line)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+
+def _compare(args):
+    with open(args.baseline, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, "r", encoding="utf-8") as file:
+        current = json.load(file)
+    rows, regressions = compare(baseline, current, args.threshold)
+    for workload, engine, old, new, ratio in rows:
+        mark = "REGRESSION" if ratio < 1 - args.threshold else ""
+        print("{:<18} {:<8} {:>12,.0f} -> {:>12,.0f} {:>6.2f}x {}".format(
+            workload, engine, old, new, ratio, mark))
+    return 1 if regressions else 0
+
+
+def _startup(args):
+    report = measure_startup(args.repeat)
+    if sys.flags.dont_write_bytecode:
+        print("bytecode cache is off, modules are compiled on every start")
+    print("python -c pass   {:>8.1f} ms".format(report["baseline"] * 1000))
+    print("python -m befunge {:>7.1f} ms".format(report["startup"] * 1000))
+    print("overhead         {:>8.1f} ms".format(report["overhead"] * 1000))
+    if report["heavy_imports"]:
+        print("heavy imports:   ", " ".join(report["heavy_imports"]))
+    return 1 if report["heavy_imports"] or \
+        report["overhead"] > args.limit else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="measure the corpus")
+    run.add_argument("--engines", nargs="+", default=list(ENGINES))
+    run.add_argument("--max-steps", type=int, default=DEFAULT_STEPS)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--output", help="JSON file for results")
+    run.set_defaults(handler=_run)
+    check = commands.add_parser("compare", help="compare with baseline")
+    check.add_argument("baseline")
+    check.add_argument("current")
+    check.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    check.set_defaults(handler=_compare)
+    startup = commands.add_parser("startup",
+                                  help="measure python -m befunge start")
+    startup.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    startup.add_argument("--limit", type=float, default=DEFAULT_LIMIT,
+                         help="allowed overhead in seconds")
+    startup.set_defaults(handler=_startup)
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""Comparison of benchmark results against a stored baseline.
+Workload and engine pair regresses, when its instructions per second
+drop by more than the threshold."""
+
+DEFAULT_THRESHOLD = 0.1
+
+
+def _by_key(report):
+    return {(result["workload"], result["engine"]): result
+            for result in report["results"]}
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Function for comparing two reports of benchmarks.runner.
+    Returns a list of (workload, engine, baseline ips, current ips, ratio)
+    rows and a list of regressed rows."""
+    baseline_results = _by_key(baseline)
+    rows = []
+    regressions = []
+    for key, result in _by_key(current).items():
+        if key not in baseline_results:
+            continue
+        old = baseline_results[key]["instructions_per_second"]
+        new = result["instructions_per_second"]
+        row = (key[0], key[1], old, new, new / old)
+        rows.append(row)
+        if new < old * (1 - threshold):
+            regressions.append(row)
+    return rows, regressions
@@ -0,0 +1,40 @@
+"""Corpus of representative befunge workloads.
+Every workload is bounded by the step limit of the runner,
+so endless programs are measured the same way as finite ones."""
+
+
+class Workload:
+    """Class for one benchmark program.
+    Interactive workloads feed rows to IABefungeGrid line by line."""
+
+    def __init__(self, name, rows, input_data=b"", interactive=False):
+        self.name = name
+        self.rows = rows
+        self.input_data = input_data
+        self.interactive = interactive
+
+
+ARITHMETIC_LOOP = ['"2"::**>1\\-:#v_@',
+                   "       ^     <  "]
+
+STRING_OUTPUT = [">               v",
+                 ' v"Hello World!"<',
+                 " >:v             ",
+                 " ^,_$           ^"]
+
+MEMORY = [">11g1+22pv",
+          " 0        ",
+          "^        <"]
+
+RANDOM_WALK = ["? ? ? ? ? ",
+               " ? ? ? ? ?",
+               "? ? ? ? ? ",
+               " ? ? ? ? ?"]
+
+WORKLOADS = [
+    Workload("arithmetic_loop", ARITHMETIC_LOOP),
+    Workload("string_output", STRING_OUTPUT),
+    Workload("memory_pg", MEMORY),
+    Workload("random_walk", RANDOM_WALK),
+    Workload("interactive_rows", ARITHMETIC_LOOP, interactive=True),
+]
@@ -0,0 +1,77 @@
+"""Runner of the benchmark corpus.
+Wall time and instructions per second are taken from untraced runs,
+peak memory from one extra run under tracemalloc."""
+
+import io
+import platform
+import sys
+import time
+import tracemalloc
+from befunge.befunge_grid import BefungeGrid
+from befunge.interactive_befunge_grid import IABefungeGrid
+from befunge.streams import BytesSource, CallbackSink
+from benchmarks.corpus import WORKLOADS
+
+ENGINES = ("classic", "table", "block")
+DEFAULT_STEPS = 200000
+
+
+def _discard(text):
+    pass
+
+
+def run_workload(workload, engine, max_steps):
+    """Function for running the workload once.
+    Returns the grid after the run."""
+    if workload.interactive:
+        grid = IABefungeGrid(output=CallbackSink(_discard),
+                             input_source=BytesSource(workload.input_data))
+        stdin = sys.stdin
+        sys.stdin = io.StringIO("\n".join(workload.rows) + "\n\n")
+        try:
+            grid.run(engine=engine, max_steps=max_steps)
+        finally:
+            sys.stdin = stdin
+        return grid
+    grid = BefungeGrid(output=CallbackSink(_discard),
+                       input_source=BytesSource(workload.input_data))
+    grid.set_grid("s", list(workload.rows))
+    grid.run(engine=engine, max_steps=max_steps)
+    return grid
+
+
+def measure(workload, engine, max_steps=DEFAULT_STEPS, repeat=3):
+    """Function for the result of the workload with the engine"""
+    wall_time = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        grid = run_workload(workload, engine, max_steps)
+        elapsed = time.perf_counter() - start
+        wall_time = elapsed if wall_time is None else min(wall_time, elapsed)
+    tracemalloc.start()
+    try:
+        run_workload(workload, engine, max_steps)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"workload": workload.name,
+            "engine": engine,
+            "steps": grid.steps,
+            "wall_time": wall_time,
+            "instructions_per_second": grid.steps / wall_time,
+            "peak_memory": peak_memory}
+
+
+def run_suite(engines=ENGINES, max_steps=DEFAULT_STEPS, repeat=3,
+              workloads=WORKLOADS):
+    """Function for measuring every workload with every engine"""
+    results = [measure(workload, engine, max_steps, repeat)
+               for workload in workloads
+               for engine in engines]
+    return {"meta": {"python": platform.python_version(),
+                     "implementation": platform.python_implementation(),
+                     "machine": platform.machine(),
+                     "max_steps": max_steps,
+                     "repeat": repeat,
+                     "timestamp": time.time()},
+            "results": results}
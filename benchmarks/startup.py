@@ -0,0 +1,57 @@
+"""Startup time of the command line interpreter.
+Every sample is a fresh Python process running python -m befunge
+on the hello world program, so the time covers the interpreter start,
+imports and the run. Overhead is the difference of the medians
+with the bare 'python -c pass'. Plain run mustn't import the modules
+of optional subsystems, they are listed from sys.modules
+of a fresh process."""
+
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PROGRAM = ROOT / "Scripts" / "hello_world.txt"
+DEFAULT_REPEAT = 10
+DEFAULT_LIMIT = 0.05
+HEAVY_MODULES = ("argparse", "typing", "numpy", "befunge.analysis",
+                 "befunge.block_compiler", "befunge.dispatch_engine",
+                 "befunge.profiler", "befunge.quotas", "befunge.trace",
+                 "befunge.transpiler", "befunge.vectorized")
+
+
+def _median_time(command, repeat):
+    """Inner function for the median wall time of the command"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL,
+                       check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def heavy_imports(program=PROGRAM):
+    """Function for the modules of HEAVY_MODULES imported
+    by the plain run of the program"""
+    code = ("import sys\n"
+            "from befunge.__main__ import main\n"
+            f"main([{str(program)!r}])\n"
+            "sys.stderr.write(' '.join(sys.modules))\n")
+    process = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                             stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE, text=True, check=True)
+    modules = set(process.stderr.split())
+    return [module for module in HEAVY_MODULES if module in modules]
+
+
+def measure_startup(repeat=DEFAULT_REPEAT, program=PROGRAM):
+    """Function for the report of startup times in seconds"""
+    baseline = _median_time([sys.executable, "-c", "pass"], repeat)
+    startup = _median_time([sys.executable, "-m", "befunge", str(program)],
+                           repeat)
+    return {"baseline": baseline, "startup": startup,
+            "overhead": startup - baseline,
+            "heavy_imports": heavy_imports(program)}